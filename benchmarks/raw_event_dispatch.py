@@ -0,0 +1,112 @@
+"""
+A replay benchmark for raw gateway event dispatch.
+
+This replays a made up stream of gateway events (sized by guild count) through
+:func:`voxelbotutils.MinimalBot.dispatch`, once with the old style of handlers (two
+:code:`on_socket_response` listeners that check the event type themselves), and once
+with the raw event registry (an :code:`INTERACTION_CREATE` handler and an inline counter),
+and prints the events per second for each.
+
+Usage:
+
+    python benchmarks/raw_event_dispatch.py --guilds 100000 --events-per-guild 5
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import time
+
+import voxelbotutils
+
+
+# The rough make-up of the events a big bot receives
+EVENT_WEIGHTS = {
+    "MESSAGE_CREATE": 40,
+    "PRESENCE_UPDATE": 25,
+    "GUILD_MEMBER_UPDATE": 12,
+    "TYPING_START": 10,
+    "MESSAGE_UPDATE": 5,
+    "MESSAGE_REACTION_ADD": 5,
+    "VOICE_STATE_UPDATE": 2,
+    "INTERACTION_CREATE": 1,
+}
+
+
+def make_replay(guild_count: int, events_per_guild: int) -> list:
+    """
+    Make a list of fake gateway payloads to replay.
+    """
+
+    rng = random.Random(0)
+    event_types = rng.choices(list(EVENT_WEIGHTS), weights=list(EVENT_WEIGHTS.values()), k=guild_count * events_per_guild)
+    replay = [{"op": 0, "t": "GUILD_CREATE", "s": None, "d": {"id": str(i)}} for i in range(guild_count)]
+    replay.extend({"op": 0, "t": t, "s": None, "d": {"guild_id": str(rng.randrange(guild_count))}} for t in event_types)
+    return replay
+
+
+async def run_replay(bot, replay: list, batch_size: int) -> float:
+    """
+    Dispatch every payload in the replay, yielding to the loop every batch (as the websocket
+    would), and wait for every scheduled handler to finish. Returns the time taken.
+    """
+
+    start = time.perf_counter()
+    for index, payload in enumerate(replay, start=1):
+        bot.dispatch('socket_response', payload)
+        if index % batch_size == 0:
+            await asyncio.sleep(0)
+    pending = [i for i in asyncio.all_tasks() if i is not asyncio.current_task()]
+    if pending:
+        await asyncio.wait(pending)
+    return time.perf_counter() - start
+
+
+async def benchmark(guild_count: int, events_per_guild: int, batch_size: int) -> None:
+    replay = make_replay(guild_count, events_per_guild)
+    counts = collections.Counter()
+
+    # The old way - every listener is scheduled for every event
+    async def interaction_listener(payload):
+        if payload['t'] != 'INTERACTION_CREATE':
+            return
+        counts['interaction'] += 1
+
+    async def analytics_listener(payload):
+        counts[payload['t']] += 1
+
+    bot = voxelbotutils.MinimalBot(command_prefix="!")
+    bot.add_listener(interaction_listener, 'on_socket_response')
+    bot.add_listener(analytics_listener, 'on_socket_response')
+    listener_time = await run_replay(bot, replay, batch_size)
+
+    # The new way - handlers only run for the events that they want
+    async def interaction_handler(payload):
+        counts['interaction'] += 1
+
+    def analytics_handler(payload):
+        counts[payload['t']] += 1
+
+    bot = voxelbotutils.MinimalBot(command_prefix="!")
+    bot.add_raw_event_handler("INTERACTION_CREATE", interaction_handler)
+    bot.add_raw_event_handler(None, analytics_handler)
+    raw_time = await run_replay(bot, replay, batch_size)
+
+    # And output
+    print(f"Replayed {len(replay):,} events for {guild_count:,} guilds")
+    print(f"on_socket_response listeners: {len(replay) / listener_time:,.0f} events/sec ({listener_time:.2f}s)")
+    print(f"Raw event registry:           {len(replay) / raw_time:,.0f} events/sec ({raw_time:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=100_000, help="The number of guilds to simulate.")
+    parser.add_argument("--events-per-guild", type=int, default=5, help="The number of events to replay per guild.")
+    parser.add_argument("--batch-size", type=int, default=100, help="How many events to dispatch before yielding to the loop.")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(benchmark(args.guilds, args.events_per_guild, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
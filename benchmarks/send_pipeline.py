@@ -0,0 +1,113 @@
+"""
+A benchmark for the CPU cost of building and serialising an outgoing message.
+
+This sends a typical interaction follow-up (some content, an embed, a row of buttons, and
+merged allowed mentions) through :func:`voxelbotutils.MinimalBot._send_button_message` to a
+fake HTTP client that only serialises the payload, once with the standard library's JSON
+encoder and once with orjson (if it's installed), and prints the CPU time per send for each.
+
+Usage:
+
+    python benchmarks/send_pipeline.py --sends 50000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import discord
+
+import voxelbotutils
+from voxelbotutils.cogs.utils import custom_bot
+
+
+class FakeHTTP(object):
+    """
+    An HTTP client that serialises the payload it's given (as the real one would) and does nothing else.
+    """
+
+    def __init__(self):
+        self.sent = 0
+
+    async def request(self, route, *, json=None, form=None, files=None):
+        discord.utils.to_json(json)
+        self.sent += 1
+        return {}
+
+
+class FakeState(object):
+
+    def __init__(self):
+        self.http = FakeHTTP()
+        self.allowed_mentions = discord.AllowedMentions(everyone=False, roles=False)
+
+
+class FakeInteraction(object):
+    """
+    An interaction that's already been responded to, so every send is a webhook follow-up.
+    """
+
+    ACK_IS_EDITABLE = True
+    CAN_SEND_EPHEMERAL = True
+
+    def __init__(self, state):
+        self._state = state
+        self._sent_ack_response = True
+        self._sent_message_response = True
+        self._send_interaction_response_lock = asyncio.Lock()
+
+    async def _get_channel(self):
+        return ("1", "2", "token",)
+
+
+async def run_sends(bot, send_count: int) -> float:
+    """
+    Send the message a number of times, returning the CPU time taken.
+    """
+
+    state = FakeState()
+    interaction = FakeInteraction(state)
+    allowed_mentions = discord.AllowedMentions(users=True)
+    components = voxelbotutils.MessageComponents.add_buttons_with_rows(
+        voxelbotutils.Button("Previous", custom_id="previous"),
+        voxelbotutils.Button("Next", custom_id="next"),
+    )
+    embed = discord.Embed(title="Page 1", description="Some text " * 20)
+    start = time.process_time()
+    for _ in range(send_count):
+        await bot._send_button_message(
+            interaction, "Hello", embed=embed, components=components,
+            allowed_mentions=allowed_mentions, wait=False,
+        )
+    return time.process_time() - start
+
+
+async def benchmark(send_count: int) -> None:
+    bot = voxelbotutils.MinimalBot(command_prefix="!")
+    results = []
+
+    # The standard library
+    discord.utils.to_json = lambda obj: json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
+    results.append(("json", await run_sends(bot, send_count)))
+
+    # And orjson, if we have it
+    if custom_bot.orjson is not None:
+        discord.utils.to_json = custom_bot._orjson_to_json
+        results.append(("orjson", await run_sends(bot, send_count)))
+
+    # And output
+    print(f"Sent {send_count:,} messages")
+    for name, taken in results:
+        print(f"{name + ':':<8} {taken / send_count * 1_000_000:,.1f}us CPU per send ({send_count / taken:,.0f} sends/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sends", type=int, default=50_000, help="The number of messages to send.")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(benchmark(args.sends))
+
+
+if __name__ == "__main__":
+    main()
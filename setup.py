@@ -36,7 +36,10 @@ extras = {
     "docs": [
         "sphinx",
         "sphinx_rtd_theme",
-    ]
+    ],
+    "speed": [
+        "orjson",
+    ],
 }
 
 
@@ -4,7 +4,7 @@ import pathlib
 
 import discord
 
-from .runner import run_bot, run_website, run_sharder
+from .runner import run_bot, run_website, run_sharder, run_vote_webhook, compile_commands
 
 
 def create_file(*path, content: str = None):
@@ -26,6 +26,8 @@ def get_default_program_arguments() -> argparse.ArgumentParser:
     "run bot config/config.toml"
     "run website config.toml"
     "run website config/config.toml"
+    "run-vote-webhook config/website.toml --port 8081"
+    "compile-commands . config/config.toml --output commands.json"
     "create-config bot"
     "create-config website"
 
@@ -44,6 +46,8 @@ def get_default_program_arguments() -> argparse.ArgumentParser:
     bot_subparser = runner_subparser.add_parser("run-bot")
     website_subparser = runner_subparser.add_parser("run-website")
     sharder_subparser = runner_subparser.add_parser("run-sharder")
+    vote_webhook_subparser = runner_subparser.add_parser("run-vote-webhook")
+    compile_commands_subparser = runner_subparser.add_parser("compile-commands")
     create_config_subparser = runner_subparser.add_parser("create-config")
     check_config_subparser = runner_subparser.add_parser("check-config")
     runner_subparser.add_parser("version")
@@ -68,9 +72,21 @@ def get_default_program_arguments() -> argparse.ArgumentParser:
     sharder_subparser.add_argument("config_file", nargs="?", default="config/config.toml", help="The configuration for the bot.")
     sharder_subparser.add_argument("--host", nargs="?", default="127.0.0.1", help="The host address to listen on.")
     sharder_subparser.add_argument("--port", nargs="?", default=8888, type=int, help="The host port to listen on.")
-    sharder_subparser.add_argument("--concurrency", nargs="?", default=1, type=int, help="The max concurrency of the connecting bot.")
+    sharder_subparser.add_argument("--concurrency", nargs="?", default=None, type=int, help="The max concurrency of the connecting bot. If not given, this is fetched from Discord using the token in the config file.")
     sharder_subparser.add_argument("--loglevel", nargs="?", default="INFO", help="Global logging level - probably most useful is INFO and DEBUG.", choices=LOGLEVEL_CHOICES)
 
+    # Set up the vote webhook arguments
+    vote_webhook_subparser.add_argument("config_file", nargs="?", default="config/website.toml", help="The website configuration to take the database, redis and webhook settings from.")
+    vote_webhook_subparser.add_argument("--host", nargs="?", default="0.0.0.0", help="The host IP to run the webhook on.")
+    vote_webhook_subparser.add_argument("--port", nargs="?", type=int, default="8080", help="The port to run the webhook with.")
+    vote_webhook_subparser.add_argument("--loglevel", nargs="?", default="INFO", help="Global logging level - probably most useful is INFO and DEBUG.", choices=LOGLEVEL_CHOICES)
+
+    # Set up the compile commands arguments
+    compile_commands_subparser.add_argument("bot_directory", nargs="?", default=".", help="The directory containing a config and a cogs folder for the bot.")
+    compile_commands_subparser.add_argument("config_file", nargs="?", default="config/config.toml", help="The configuration for the bot.")
+    compile_commands_subparser.add_argument("--output", nargs="?", default=None, help="The file to write the application command JSON to. If not given, it's printed.")
+    compile_commands_subparser.add_argument("--loglevel", nargs="?", default="WARNING", help="Global logging level - probably most useful is INFO and DEBUG.", choices=LOGLEVEL_CHOICES)
+
     # See what we want to make a config file for
     create_config_subparser.add_argument("config_type", nargs=1, help="The type of config file that we want to create.", choices=["bot", "website", "all"])
     check_config_subparser.add_argument("config_type", nargs=1, help="The type of config file that we want to create.", choices=["bot", "website"])
@@ -183,6 +199,10 @@ def main():
         run_website(args)
     elif args.subcommand == "run-sharder":
         run_sharder(args)
+    elif args.subcommand == "run-vote-webhook":
+        run_vote_webhook(args)
+    elif args.subcommand == "compile-commands":
+        compile_commands(args)
 
 
 if __name__ == '__main__':
@@ -69,7 +69,29 @@ class BotStats(utils.Cog):
         embed.set_footer(f"{self.bot.user} - VoxelBotUtils v{__version__}", icon_url=self.bot.user.avatar_url)
         embed.add_field("Creator", f"{creator!s}\n{creator_id}")
         embed.add_field("Library", f"Discord.py {discord.__version__}")
-        if self.bot.shard_count != len((self.bot.shard_ids or [0])):
+
+        # Get the stats from every cluster if we can
+        cluster_stats = []
+        if self.bot.rpc.enabled:
+            try:
+                cluster_stats = [i for i in await self.bot.rpc.call("stats") if i.error is None]
+            except asyncio.TimeoutError:
+                pass
+
+        # Add the guild count
+        if cluster_stats:
+            responding_shard_count = len(utils.RedisRPC.get_shard_ids(cluster_stats))
+            guild_count = sum(i.data['guild_count'] for i in cluster_stats)
+            member_count = sum(i.data['member_count'] for i in cluster_stats)
+            if responding_shard_count >= (self.bot.shard_count or 1):
+                embed.add_field("Guild Count", f"{guild_count:,}")
+                embed.add_field("Member Count", f"{member_count:,}")
+            else:
+                embed.add_field(
+                    "Approximate Guild Count",
+                    f"{int((guild_count / responding_shard_count) * self.bot.shard_count):,}",
+                )
+        elif self.bot.shard_count != len((self.bot.shard_ids or [0])):
             embed.add_field(
                 "Approximate Guild Count",
                 f"{int((len(self.bot.guilds) / len(self.bot.shard_ids or [0])) * self.bot.shard_count):,}",
@@ -77,7 +99,17 @@ class BotStats(utils.Cog):
         else:
             embed.add_field("Guild Count", f"{len(self.bot.guilds):,}")
         embed.add_field("Shard Count", f"{self.bot.shard_count or 1:,}")
-        embed.add_field("Average WS Latency", f"{(self.bot.latency * 1000):.2f}ms")
+
+        # Add the latency and memory usage
+        if cluster_stats:
+            latencies = [latency for i in cluster_stats for _, latency in i.data['latency']]
+            embed.add_field("Cluster Count", f"{len(cluster_stats):,}")
+            embed.add_field("Average WS Latency", f"{(sum(latencies) / len(latencies) * 1000):.2f}ms")
+            memory = sum(i.data['memory'] or 0 for i in cluster_stats)
+            if memory:
+                embed.add_field("Memory Usage", f"{memory / 1_048_576:,.2f}MB")
+        else:
+            embed.add_field("Average WS Latency", f"{(self.bot.latency * 1000):.2f}ms")
         try:
             all_tasks = asyncio.Task.all_tasks()
         except AttributeError:
@@ -27,29 +27,10 @@ class ConnectEvent(utils.Cog):
 
     async def send_webhook(self, event_name: str, text: str, username: str, logger: str) -> bool:
         """
-        Send a webhook to the bot specified event webhook url.
+        Queue a webhook to be sent to the bot specified event webhook url.
         """
 
-        event_webhook: discord.Webhook = self.bot.get_event_webhook(event_name)
-        if not event_webhook:
-            return False
-        try:
-            avatar_url = str(self.bot.user.avatar_url)
-        except Exception:
-            avatar_url = None
-        try:
-            await event_webhook.send(
-                text,
-                username=username,
-                avatar_url=avatar_url,
-                allowed_mentions=discord.AllowedMentions.none(),
-            )
-        except discord.HTTPException as e:
-            self.logger.error(f"Failed to send webhook for event {event_name} - {e}")
-            return False
-        except Exception as e:
-            self.logger.error(e)
-            raise e
+        if not self.bot.event_webhooks.queue(event_name, text, username=username):
             return False
         self.logger.info(logger)
         return True
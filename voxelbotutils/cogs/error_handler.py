@@ -298,24 +298,13 @@ class ErrorHandler(utils.Cog):
                 await owner.send(error_text, file=discord.File(file_handle, filename="error_log.py"))
 
         # Ping to the webook
-        event_webhook: discord.Webhook = self.bot.get_event_webhook("unhandled_error")
-        try:
-            avatar_url = str(self.bot.user.avatar_url)
-        except Exception:
-            avatar_url = None
-        if event_webhook:
-            file_handle.seek(0)
-            try:
-                file = discord.File(file_handle, filename="error_log.py")
-                await event_webhook.send(
-                    error_text,
-                    file=file,
-                    username=f"{self.bot.user.name} - Error",
-                    avatar_url=avatar_url,
-                    allowed_mentions=discord.AllowedMentions.none(),
-                )
-            except discord.HTTPException as e:
-                self.logger.error(f"Failed to send webhook for event unhandled_error - {e}")
+        file_handle.seek(0)
+        self.bot.event_webhooks.queue(
+            "unhandled_error",
+            error_text,
+            username=f"{self.bot.user.name} - Error",
+            file=discord.File(file_handle, filename="error_log.py"),
+        )
 
         # And throw it into the console
         logger = getattr(getattr(ctx, 'cog', self), 'logger', self.logger)
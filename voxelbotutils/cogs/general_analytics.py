@@ -1,4 +1,7 @@
+import asyncio
+import collections
 import json
+import typing
 
 import discord
 from discord.ext import tasks
@@ -32,11 +35,21 @@ class Analytics(utils.Cog):
 
     def __init__(self, bot: utils.Bot):
         super().__init__(bot)
+        self.gateway_receive_counts = collections.Counter()
+        self.post_statsd_gateway_receive_counts.start()
+        self.post_statsd_component_waiter_count.start()
+        self.sweep_cooldown_buckets.start()
         self.post_statsd_guild_count.start()
         self.post_topgg_guild_count.start()
         self.post_discordbotlist_guild_count.start()
 
     def cog_unload(self):
+        self.logger.info("Stopping Statsd gateway event count poster loop")
+        self.post_statsd_gateway_receive_counts.cancel()
+        self.logger.info("Stopping Statsd component waiter count poster loop")
+        self.post_statsd_component_waiter_count.cancel()
+        self.logger.info("Stopping cooldown bucket sweeper loop")
+        self.sweep_cooldown_buckets.cancel()
         self.logger.info("Stopping Statsd guild count poster loop")
         self.post_statsd_guild_count.cancel()
         self.logger.info("Stopping Top.gg guild count poster loop")
@@ -44,13 +57,28 @@ class Analytics(utils.Cog):
         self.logger.info("Stopping DiscordbotList.com guild count poster loop")
         self.post_discordbotlist_guild_count.cancel()
 
-    def get_effective_guild_count(self) -> int:
+    async def get_effective_guild_count(self) -> int:
+        """
+        Get the guild count for the whole bot - exact if we can ask every cluster over Redis,
+        otherwise extrapolated from the shards that this instance is running.
+        """
+
+        # Ask every cluster if we can
+        if self.bot.rpc.enabled:
+            try:
+                guild_count = await self.bot.rpc.sum("guild_count")
+            except asyncio.TimeoutError:
+                guild_count = None
+            if guild_count is not None:
+                return guild_count
+
+        # Guess based on our own shards
         return int((len(self.bot.guilds) / len(self.bot.shard_ids or [0])) * (self.bot.shard_count or 1))
 
     @tasks.loop(minutes=5)
     async def post_topgg_guild_count(self):
         """
-        Post the average guild count to Top.gg.
+        Post the guild count to Top.gg.
         """
 
         # Only shard 0 can post
@@ -65,9 +93,8 @@ class Analytics(utils.Cog):
 
         url = f'https://top.gg/api/bots/{self.bot.user.id}/stats'
         data = {
-            'server_count': self.get_effective_guild_count(),
+            'server_count': await self.get_effective_guild_count(),
             'shard_count': self.bot.shard_count or 1,
-            'shard_id': 0,
         }
         headers = {
             'Authorization': self.bot.config['bot_listing_api_keys']['topgg_token']
@@ -98,7 +125,7 @@ class Analytics(utils.Cog):
 
         url = f'https://discordbotlist.com/api/v1/bots/{self.bot.user.id}/stats'
         data = {
-            'guilds': self.get_effective_guild_count(),
+            'guilds': await self.get_effective_guild_count(),
         }
         headers = {
             'Authorization': self.bot.config['bot_listing_api_keys']['discordbotlist_token']
@@ -120,14 +147,72 @@ class Analytics(utils.Cog):
         # Only shard 0 can post
         if self.bot.shard_count and self.bot.shard_count > 1 and 0 not in self.bot.shard_ids:
             return
+        guild_count = await self.get_effective_guild_count()
         async with self.bot.stats() as stats:
-            stats.gauge("discord.stats.guild_count", value=self.get_effective_guild_count())
+            stats.gauge("discord.stats.guild_count", value=guild_count)
             stats.gauge("discord.stats.shard_count", value=self.bot.shard_count or 1)
 
     @post_statsd_guild_count.before_loop
     async def before_post_statsd_guild_count(self):
         await self.bot.wait_until_ready()
 
+    @tasks.loop(minutes=1)
+    async def post_statsd_component_waiter_count(self):
+        """
+        Post the number of pending component interaction waiters on this instance to Statsd.
+        """
+
+        shard_ids = self.bot.shard_ids or [0]
+        tags = {"cluster": f"{min(shard_ids)}-{max(shard_ids)}"}
+        async with self.bot.stats() as stats:
+            stats.gauge("discord.stats.component_waiters", value=self.bot.component_router.pending_count, tags=tags)
+            stats.gauge("discord.stats.component_waiter_messages", value=self.bot.component_router.pending_message_count, tags=tags)
+
+    def get_cooldown_storages(self) -> typing.Dict[str, utils.cooldown.CooldownStorage]:
+        """
+        Get the cooldown storage for every command with a cooldown, keyed by a name for the
+        storage (the command's name, or the group name for grouped cooldowns).
+        """
+
+        storages = {}
+        seen = set()
+        for command in self.bot.walk_commands():
+            mapping = command._buckets
+            storage = getattr(mapping, 'storage', None)
+            if not mapping.valid or storage is None or id(storage) in seen:
+                continue
+            seen.add(id(storage))
+            if isinstance(mapping, utils.cooldown.GroupedCooldownMapping):
+                storages[mapping.namespace] = storage
+            else:
+                storages[command.qualified_name] = storage
+        return storages
+
+    @tasks.loop(minutes=1)
+    async def sweep_cooldown_buckets(self):
+        """
+        Remove expired cooldown buckets from every command, and post the number of buckets
+        that are left (and roughly how much memory they're using) to Statsd.
+        """
+
+        # Sweep
+        storages = self.get_cooldown_storages()
+        removed = sum(i.sweep() for i in storages.values())
+        self.logger.debug(f"Swept {removed} expired cooldown buckets")
+
+        # And post
+        shard_ids = self.bot.shard_ids or [0]
+        cluster = f"{min(shard_ids)}-{max(shard_ids)}"
+        async with self.bot.stats() as stats:
+            for name, storage in storages.items():
+                tags = {"cluster": cluster, "cooldown": name}
+                stats.gauge("discord.stats.cooldown_buckets", value=len(storage), tags=tags)
+                stats.gauge("discord.stats.cooldown_bucket_bytes", value=storage.estimated_size(), tags=tags)
+
+    @sweep_cooldown_buckets.before_loop
+    async def before_sweep_cooldown_buckets(self):
+        await self.bot.wait_until_ready()
+
     @utils.Cog.listener()
     async def on_socket_raw_send(self, payload: dict):
         """
@@ -159,17 +244,27 @@ class Analytics(utils.Cog):
             except KeyError:
                 pass
 
-    @utils.Cog.listener()
-    async def on_socket_response(self, payload: dict):
+    @utils.Cog.raw_listener()
+    def count_gateway_event(self, payload: dict):
         """
-        A raw socket response message from Discord.
+        Count a gateway event from the raw event registry. This is called inline for every event
+        so it only counts them - the counts are sent to Statsd by :func:`post_statsd_gateway_receive_counts`.
         """
 
+        self.gateway_receive_counts[payload.get('t')] += 1
+
+    @tasks.loop(seconds=10)
+    async def post_statsd_gateway_receive_counts(self):
+        """
+        Post the counts of the gateway events we've received to Statsd.
+        """
+
+        if not self.gateway_receive_counts:
+            return
+        counts, self.gateway_receive_counts = self.gateway_receive_counts, collections.Counter()
         async with self.bot.stats() as stats:
-            try:
-                stats.increment("discord.gateway.receive", tags={"event_name": payload['t']})
-            except KeyError:
-                pass
+            for event_name, count in counts.items():
+                stats.increment("discord.gateway.receive", value=count, tags={"event_name": event_name})
 
     @utils.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
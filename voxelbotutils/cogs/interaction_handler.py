@@ -1,4 +1,5 @@
 import inspect
+import typing
 
 from discord.ext import commands
 
@@ -11,13 +12,25 @@ class SlashCommandContext(utils.interactions.interaction_messageable.Interaction
 
 class InteractionHandler(utils.Cog):
 
+    # The Python types that each option type already comes in as, so we don't need to convert them
+    NATIVE_OPTION_TYPES = {
+        utils.interactions.ApplicationCommandOptionType.STRING: str,
+        utils.interactions.ApplicationCommandOptionType.INTEGER: int,
+        utils.interactions.ApplicationCommandOptionType.BOOLEAN: bool,
+    }
+
+    # The option types whose objects Discord gives us in the interaction's resolved data
+    RESOLVED_OPTION_TYPES = (
+        utils.interactions.ApplicationCommandOptionType.USER,
+        utils.interactions.ApplicationCommandOptionType.CHANNEL,
+        utils.interactions.ApplicationCommandOptionType.ROLE,
+    )
+
     async def get_context_from_interaction(self, payload, *, cls=SlashCommandContext):
         """
         Make a context object from an interaction.
         """
 
-        # command_args = [f"﹃{i['value']}﹄" for i in payload['data'].get('options', list())]  # ﹃﹄ are valid quotes for Dpy
-
         # Get the arguments from the payload
         command_name = payload['data']['name']
         if 'options' in payload['data']:
@@ -34,51 +47,94 @@ class InteractionHandler(utils.Cog):
 
         # Put our options in a dict
         given_values = {}
+        given_value_types = {}
         for i in payload_data_options:
             given_values[i['name']] = i['value']
-
-        # Make a string view
-        command_args = [f"{i['value']}" for i in payload_data_options]
-        view = commands.view.StringView(f"/{command_name.rstrip()} {' '.join(command_args)}")
-        self.logger.debug(f"Made up fake string for interaction command: {view.buffer}")
+            given_value_types[i['name']] = i.get('type')
 
         # Get some objects we can use to make the interaction message
         state = self.bot._connection
         channel, _ = state._get_guild_channel(payload)
 
-        # Make our fake message
+        # Make our fake message - the content is only there for logging, nothing is parsed from it
         fake_message = utils.interactions.InteractionMessage(
             channel=channel,
             state=state,
             data=payload,
-            content=view.buffer,
+            content=f"/{command_name} {' '.join(str(i) for i in given_values.values())}".rstrip(),
         )
-        self.logger.debug("Made up fake message for interaction command")
-        ctx = cls(prefix="/", view=view, bot=self.bot, message=fake_message)
-        self.logger.debug("Made up fake context for interaction command")
+        ctx = cls(prefix="/", view=commands.view.StringView(""), bot=self.bot, message=fake_message)
         ctx.data = payload
         ctx.original_author_id = fake_message.author.id
-        view.skip_string(ctx.prefix)
-        invoker = view.get_word()
 
         # Make it work
-        ctx.invoked_with = invoker
+        ctx.invoked_with = payload['data']['name']
         ctx.command = self.bot.get_command(command_name)
         ctx.command_name = command_name
         ctx.given_values = given_values
+        ctx.given_value_types = given_value_types
+        ctx.resolved = utils.interactions.InteractionResolved(
+            state=state, guild=fake_message.guild, data=payload['data'].get('resolved', {}),
+        )
 
         # Return context
-        self.logger.debug("Returning context object")
+        self.logger.debug(f"Made context object for interaction command {command_name}")
         return ctx
 
-    @utils.Cog.listener()
-    async def on_socket_response(self, payload: dict):
+    async def bind_interaction_arguments(self, ctx) -> typing.Tuple[list, dict]:
+        """
+        Map the options given in an interaction onto the command's parameters by name, converting
+        only the ones that don't already come in as the right type. Users, members, roles, and channels
+        are taken from the interaction's resolved data where possible.
+
+        Returns:
+            typing.Tuple[list, dict]: The positional and keyword arguments to invoke the command with.
+
+        Raises:
+            discord.ext.commands.MissingRequiredArgument: A required parameter wasn't given.
+            discord.ext.commands.BadArgument: One of the given options couldn't be converted.
+        """
+
+        positional_converted = []
+        kwarg_converted = {}
+        for name, param in ctx.command.clean_params.items():
+
+            # Get the value for the parameter
+            if param.kind == param.VAR_KEYWORD:
+                continue
+            if name in ctx.given_values:
+                value = ctx.given_values[name]
+                converter = ctx.command._get_converter(param)
+                native_type = self.NATIVE_OPTION_TYPES.get(ctx.given_value_types.get(name))
+                resolved_value = None
+                if ctx.given_value_types.get(name) in self.RESOLVED_OPTION_TYPES:
+                    resolved_value = ctx.resolved.convert(converter, value)
+                if resolved_value is not None:
+                    value = resolved_value
+                elif native_type is None or converter is not native_type or not isinstance(value, native_type):
+                    if not isinstance(value, str):
+                        value = str(value)
+                    value = await ctx.command.do_conversion(ctx, converter, value, param)
+            elif param.kind == param.VAR_POSITIONAL:
+                continue
+            elif param.default is not param.empty:
+                value = param.default
+            else:
+                raise commands.MissingRequiredArgument(param)
+
+            # And put it in the right place
+            if param.kind in [inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.VAR_POSITIONAL]:
+                positional_converted.append(value)
+            else:
+                kwarg_converted[name] = value
+        return positional_converted, kwarg_converted
+
+    @utils.Cog.raw_listener("INTERACTION_CREATE")
+    async def on_interaction_create(self, payload: dict):
         """
         Process any interaction create payloads we may receive.
         """
 
-        if payload['t'] != 'INTERACTION_CREATE':
-            return
         self.logger.debug("Received interaction payload %s" % (str(payload)))
 
         # See if it's a ping - it should _never_ be a ping, but let's put it here anyway
@@ -96,25 +152,14 @@ class InteractionHandler(utils.Cog):
                     self.bot.dispatch('command_error', ctx, exc)
                 return
 
-            # Convert our given vales
+            # Bind our given values and invoke
             self.logger.debug("Invoking interaction context for command %s" % (ctx.command.name))
-            positional_converted = []
-            kwarg_converted = {}
-            for name, value in ctx.given_values.items():
-                sig = ctx.command.clean_params[name]
-                converter = ctx.command._get_converter(sig)
-                v = await ctx.command.do_conversion(ctx, converter, value, sig)
-                if sig.kind in [inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD]:
-                    positional_converted.append(v)
-                else:
-                    kwarg_converted[name] = v
-
-            # And invoke
             self.bot.dispatch('command', ctx)
             try:
                 if await self.bot.can_run(ctx):
                     if await ctx.command.can_run(ctx):
-                        await ctx.invoke(ctx.command, *positional_converted, **kwarg_converted)
+                        args, kwargs = await self.bind_interaction_arguments(ctx)
+                        await ctx.invoke(ctx.command, *args, **kwargs)
                 else:
                     raise commands.CheckFailure('The global check once functions failed.')
             except commands.CommandError as exc:
@@ -128,6 +173,7 @@ class InteractionHandler(utils.Cog):
                 payload['d'], self.bot._connection,
             )
             # clicked_button_payload._send_interaction_response_callback()
+            self.bot.component_router.dispatch(clicked_button_payload)
             self.bot.dispatch("button_click", clicked_button_payload)  # DEPRECATED PLEASE DO NOT USE
             self.bot.dispatch("component_interaction", clicked_button_payload)
             return
@@ -68,8 +68,8 @@ class BotSettings(utils.Cog):
             components=utils.MessageComponents.boolean_buttons(),
         )
         try:
-            check = lambda p: p.user.id == ctx.author.id and p.message.id == m.id
-            payload = await self.bot.wait_for("component_interaction", check=check, timeout=120)
+            check = lambda p: p.user.id == ctx.author.id
+            payload = await self.bot.wait_for_component_interaction(m, check=check, timeout=120)
             await payload.defer_update()
         except asyncio.TimeoutError:
             try:
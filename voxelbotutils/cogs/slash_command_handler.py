@@ -1,9 +1,13 @@
 import typing
 import enum
+import hashlib
 import io
 import json
 import inspect
 import asyncio
+import os
+import tempfile
+import weakref
 
 import discord
 from discord.ext import commands
@@ -44,10 +48,20 @@ class SlashCommandHandler(utils.Cog):
         inspect._empty: utils.interactions.ApplicationCommandOptionType.STRING,
     }
 
+    # arg type: option type
+    _arg_type_cache: typing.Dict[typing.Any, typing.Optional[utils.interactions.ApplicationCommandOptionType]] = {}
+
+    # command callback: (qualified name, argument options)
+    _argument_options_cache: typing.Dict[typing.Callable, tuple] = weakref.WeakKeyDictionary()
+
+    # Commands with these checks can't be run by normal users, so aren't synced on startup
+    SYNC_HIDDEN_CHECK_NAMES = frozenset({"is_owner", "meta_command", "is_bot_support", "is_not_slash_command"})
+
     def __init__(self, bot: utils.Bot):
         super().__init__(bot)
         self.commands: typing.List[utils.interactions.ApplicationCommand] = None
         self.application_id = None
+        self._synced_on_startup = False
 
     @staticmethod
     def is_typing_optional(annotation) -> bool:
@@ -121,69 +135,72 @@ class SlashCommandHandler(utils.Cog):
         self.commands = [utils.interactions.ApplicationCommand.from_data(i) for i in data]
         return self.commands
 
-    async def convert_into_application_command(
-            self, ctx, command: typing.Union[utils.Command, utils.Group], *,
-            is_option: bool = False) -> utils.interactions.ApplicationCommand:
+    @classmethod
+    def get_slash_arg_type(cls, arg_type: typing.Any) -> typing.Optional[utils.interactions.ApplicationCommandOptionType]:
         """
-        Convert a given Discord command into an application command.
+        Get the application command option type for a given annotation, caching the result per type.
         """
 
-        # Make command
-        kwargs = {
-            'name': command.name,
-            'description': command.short_doc or f"Allows you to run the {command.qualified_name} command",
-        }
-        if is_option:
-            if isinstance(command, utils.SubcommandGroup):
-                application_command_type = utils.interactions.ApplicationCommandOptionType.SUBCOMMAND_GROUP
-            else:
-                application_command_type = utils.interactions.ApplicationCommandOptionType.SUBCOMMAND
-            kwargs.update({'type': application_command_type})
-            application_command = utils.interactions.ApplicationCommandOption(**kwargs)
-        else:
-            application_command = utils.interactions.ApplicationCommand(**kwargs)
+        try:
+            return cls._arg_type_cache[arg_type]
+        except KeyError:
+            pass
+        except TypeError:
+            return cls._get_slash_arg_type_uncached(arg_type)  # Unhashable annotation
+        safe_arg_type = cls._get_slash_arg_type_uncached(arg_type)
+        cls._arg_type_cache[arg_type] = safe_arg_type
+        return safe_arg_type
+
+    @classmethod
+    def _get_slash_arg_type_uncached(cls, arg_type: typing.Any) -> typing.Optional[utils.interactions.ApplicationCommandOptionType]:
+
+        # See if it's one of our common types
+        if arg_type in cls.COMMAND_TYPE_MAPPER:
+            return cls.COMMAND_TYPE_MAPPER[arg_type]
+
+        # It isn't - let's see if it's a subclass
+        for i, o in cls.COMMAND_TYPE_MAPPER.items():
+            if i in arg_type.mro()[1:]:
+                return o
+
+        # It isn't - let's try and get an attr from the class
+        return getattr(arg_type, "SLASH_COMMAND_ARG_TYPE", None)
+
+    @classmethod
+    def get_argument_options(
+            cls, command: typing.Union[utils.Command, utils.Group]) -> typing.List[utils.interactions.ApplicationCommandOption]:
+        """
+        Get the application command options for a command's arguments. These are cached by the
+        command's callback, so each function is only converted once.
+
+        Raises:
+            Exception: One of the command's arguments couldn't be converted.
+        """
+
+        # See if we've done this one already
+        cached = cls._argument_options_cache.get(command.callback)
+        if cached is not None and cached[0] == command.qualified_name:
+            return cached[1]
 
         # Go through its args
+        options = []
         for index, arg in enumerate(command.clean_params.values()):
-            arg_type = None
-            safe_arg_type = None
             required = True
-            if self.is_typing_optional(arg.annotation):
-                arg_type = self.get_non_optional_type(arg.annotation)
+            if cls.is_typing_optional(arg.annotation):
+                arg_type = cls.get_non_optional_type(arg.annotation)
                 required = False
-            elif self.is_typing_union(arg.annotation):
-                arg_type = self.get_union_type(arg.annotation)
+            elif cls.is_typing_union(arg.annotation):
+                arg_type = cls.get_union_type(arg.annotation)
             else:
                 arg_type = arg.annotation
 
-            try:
-
-                # See if it's one of our common types
-                if arg_type in self.COMMAND_TYPE_MAPPER:
-                    safe_arg_type = self.COMMAND_TYPE_MAPPER[arg_type]
-
-                # It isn't - let's see if it's a subclass
-                if safe_arg_type is None:
-                    for i, o in self.COMMAND_TYPE_MAPPER.items():
-                        if i in arg_type.mro()[1:]:
-                            safe_arg_type = o
-                            break
-
-                # It isn't - let's try and get an attr from the class
-                if safe_arg_type is None:
-                    safe_arg_type = getattr(arg_type, "SLASH_COMMAND_ARG_TYPE", None)
-
-            except Exception:
-                await ctx.send(f"Hit an error converting `{command.qualified_name}` command.")
-                raise
-
             # Make sure the type exists
+            safe_arg_type = cls.get_slash_arg_type(arg_type)
             if safe_arg_type is None:
-                await ctx.send(f"Hit an error converting `{command.qualified_name}` command.")
                 raise Exception(f"Couldn't convert {arg_type} into a valid slash command argument type.")
 
             # Say if it's optional
-            if arg.default is not inspect._empty or self.is_typing_optional(arg.annotation):
+            if arg.default is not inspect._empty or cls.is_typing_optional(arg.annotation):
                 required = False
 
             # Get the description
@@ -194,20 +211,52 @@ class SlashCommandHandler(utils.Cog):
                 pass
 
             # Add option
-            application_command.add_option(utils.interactions.ApplicationCommandOption(
+            options.append(utils.interactions.ApplicationCommandOption(
                 name=arg.name,
                 description=description,
                 type=safe_arg_type,
                 required=required,
             ))
 
+        # Cache and return
+        cls._argument_options_cache[command.callback] = (command.qualified_name, options)
+        return options
+
+    async def convert_into_application_command(
+            self, ctx, command: typing.Union[utils.Command, utils.Group], *,
+            is_option: bool = False) -> utils.interactions.ApplicationCommand:
+        """
+        Convert a given Discord command into an application command.
+        """
+
+        # Make command
+        kwargs = {
+            'name': command.name,
+            'description': command.short_doc or f"Allows you to run the {command.qualified_name} command",
+        }
+        if is_option:
+            if isinstance(command, utils.SubcommandGroup):
+                application_command_type = utils.interactions.ApplicationCommandOptionType.SUBCOMMAND_GROUP
+            else:
+                application_command_type = utils.interactions.ApplicationCommandOptionType.SUBCOMMAND
+            kwargs.update({'type': application_command_type})
+            application_command = utils.interactions.ApplicationCommandOption(**kwargs)
+        else:
+            application_command = utils.interactions.ApplicationCommand(**kwargs)
+
+        # Add its args
+        try:
+            for option in self.get_argument_options(command):
+                application_command.add_option(option)
+        except Exception:
+            if ctx is not None:
+                await ctx.send(f"Hit an error converting `{command.qualified_name}` command.")
+            raise
+
         # Go through its subcommands
         if isinstance(command, utils.Group):
             subcommands = list(command.commands)
-            valid_subcommands = []
-            for i in (await utils.HelpCommand.filter_commands_classmethod(ctx, subcommands)):
-                if getattr(i, 'add_slash_command', True):
-                    valid_subcommands.append(i)
+            valid_subcommands = await self.filter_slash_commands(ctx, subcommands)
             for subcommand in valid_subcommands:
                 converted_option = await self.convert_into_application_command(ctx, subcommand, is_option=True)
                 application_command.add_option(converted_option)
@@ -215,21 +264,164 @@ class SlashCommandHandler(utils.Cog):
         # Return command
         return application_command
 
-    async def convert_all_into_application_command(self, ctx: utils.Context) -> typing.List[utils.interactions.ApplicationCommand]:
+    async def filter_slash_commands(
+            self, ctx: typing.Optional[utils.Context],
+            commands_to_filter: typing.List[commands.Command]) -> typing.List[commands.Command]:
+        """
+        Filter a list of commands down to the ones that should be added as application commands. If
+        no context is given (eg when syncing on startup), commands are filtered by their attributes and
+        by the checks that stop normal users from running them, rather than by running their checks.
+        """
+
+        if ctx is not None:
+            filtered = await utils.HelpCommand.filter_commands_classmethod(ctx, commands_to_filter)
+        else:
+            filtered = [
+                i for i in commands_to_filter
+                if i.hidden is False and i.enabled is True and i.name not in utils.HelpCommand.HELP_COMMAND_NAMES
+                and not any(
+                    getattr(check, '__qualname__', '').split('.')[0] in self.SYNC_HIDDEN_CHECK_NAMES
+                    for check in i.checks
+                )
+            ]
+        return [i for i in filtered if getattr(i, 'add_slash_command', True)]
+
+    async def convert_all_into_application_command(
+            self, ctx: typing.Optional[utils.Context]) -> typing.List[utils.interactions.ApplicationCommand]:
         """
         Convert all of the commands for the bot into application commands.
         """
 
         slash_commands = []
-        commands = list(ctx.bot.commands)
-        filtered_commands = []
-        for i in (await utils.HelpCommand.filter_commands_classmethod(ctx, commands)):
-            if getattr(i, 'add_slash_command', True):
-                filtered_commands.append(i)
-        for command in filtered_commands:
+        commands = list(self.bot.commands)
+        for command in await self.filter_slash_commands(ctx, commands):
             slash_commands.append(await self.convert_into_application_command(ctx, command))
         return slash_commands
 
+    @staticmethod
+    def get_command_tree_hash(application_commands: typing.List[utils.interactions.ApplicationCommand]) -> str:
+        """
+        Get a stable hash of a full set of application commands, independent of their order.
+        """
+
+        hashes = sorted(f"{i.name}:{i.get_hash()}" for i in application_commands)
+        return hashlib.sha256("\n".join(hashes).encode()).hexdigest()
+
+    async def _get_sync_snapshot_key(self, guild: typing.Optional[discord.Guild]) -> str:
+        application_id = await self.bot.get_application_id()
+        return f"VBUSlashCommands:{application_id}:{guild.id if guild else 'global'}"
+
+    async def _get_sync_snapshot(self, key: str) -> typing.Optional[str]:
+        """
+        Get the hash of the command tree that we last synced, from Redis if it's connected and
+        from the local disk otherwise.
+        """
+
+        try:
+            if utils.RedisConnection.pool is not None:
+                async with utils.RedisConnection() as re:
+                    return await re.get(key)
+            with open(os.path.join(tempfile.gettempdir(), f"{key.replace(':', '-').lower()}.txt")) as a:
+                return a.read().strip() or None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to read slash command snapshot - {e}")
+            return None
+
+    async def _set_sync_snapshot(self, key: str, tree_hash: typing.Optional[str]) -> None:
+        """
+        Store the hash of the command tree that we've just synced, or clear it if no hash is given.
+        """
+
+        try:
+            if utils.RedisConnection.pool is not None:
+                async with utils.RedisConnection() as re:
+                    if tree_hash is None:
+                        await re.conn.delete(key)
+                    else:
+                        await re.set(key, tree_hash)
+                return
+            path = os.path.join(tempfile.gettempdir(), f"{key.replace(':', '-').lower()}.txt")
+            with open(f"{path}.{os.getpid()}.tmp", "w") as a:
+                a.write(tree_hash or "")
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except Exception as e:
+            self.logger.warning(f"Failed to store slash command snapshot - {e}")
+
+    async def sync_application_commands(
+            self, commands_to_sync: typing.List[utils.interactions.ApplicationCommand], *,
+            guild: typing.Optional[discord.Guild] = None, force: bool = False) -> bool:
+        """
+        Make the bot's application commands (globally or in a guild) match the given commands. The hash
+        of the given commands is compared against a snapshot of what was last synced, so nothing is sent
+        to Discord if they haven't changed. If they have, they're compared against Discord's current
+        commands, and any changes are made in a single bulk overwrite.
+
+        Args:
+            commands_to_sync (typing.List[utils.interactions.ApplicationCommand]): The full set of commands.
+            guild (typing.Optional[discord.Guild], optional): The guild to sync the commands to. If not
+                given, they're synced globally.
+            force (bool, optional): Whether or not to ignore the snapshot and compare against Discord.
+
+        Returns:
+            bool: Whether or not any changes were sent to Discord.
+
+        Raises:
+            discord.HTTPException: Discord didn't accept the commands.
+        """
+
+        # See if anything's changed since we last synced
+        tree_hash = self.get_command_tree_hash(commands_to_sync)
+        snapshot_key = await self._get_sync_snapshot_key(guild)
+        if not force and await self._get_sync_snapshot(snapshot_key) == tree_hash:
+            self.logger.info("Slash commands are unchanged since the last sync")
+            return False
+
+        # Compare against the commands that Discord has
+        if guild:
+            commands_current = await self.bot.get_guild_application_commands(guild)
+        else:
+            commands_current = await self.bot.get_global_application_commands()
+        if self.get_command_tree_hash(commands_current) == tree_hash:
+            self.logger.info("Slash commands already match Discord's")
+            await self._set_sync_snapshot(snapshot_key, tree_hash)
+            return False
+
+        # Work out what's changed
+        current_hashes = {i.name: i.get_hash() for i in commands_current}
+        new_hashes = {i.name: i.get_hash() for i in commands_to_sync}
+        added = [i for i in new_hashes if i not in current_hashes]
+        removed = [i for i in current_hashes if i not in new_hashes]
+        changed = [i for i, o in new_hashes.items() if i in current_hashes and current_hashes[i] != o]
+        self.logger.info(f"Syncing slash commands - added {added}, changed {changed}, removed {removed}")
+
+        # And overwrite them - Discord leaves the unchanged commands as they are
+        if guild:
+            await self.bot.bulk_create_guild_application_commands(guild, commands_to_sync)
+        else:
+            await self.bot.bulk_create_global_application_commands(commands_to_sync)
+        await self._set_sync_snapshot(snapshot_key, tree_hash)
+        return True
+
+    @utils.Cog.listener()
+    async def on_ready(self):
+        """
+        Sync the global slash commands on startup if the bot's been configured to. This is only
+        done by the cluster with shard 0, as the snapshot means the others wouldn't change anything.
+        """
+
+        if self._synced_on_startup or not self.bot.config.get('sync_slash_commands', False):
+            return
+        if 0 not in (self.bot.shard_ids or [0]):
+            return
+        self._synced_on_startup = True
+        try:
+            commands_to_sync = await self.convert_all_into_application_command(None)
+            await self.sync_application_commands(commands_to_sync)
+        except Exception as e:
+            self.logger.error(f"Failed to sync slash commands on startup - {e}")
+
     @utils.command(aliases=['addslashcommands'])
     @commands.guild_only()
     @commands.is_owner()
@@ -245,35 +437,28 @@ class SlashCommandHandler(utils.Cog):
             commands_to_add = [await self.convert_into_application_command(ctx, self.bot.get_command(i)) for i in command_names]
         else:
             commands_to_add: typing.List[utils.interactions.ApplicationCommand] = await self.convert_all_into_application_command(ctx)
-        command_names_to_add = [i.name for i in commands_to_add]
 
         # Start typing because this takes a while
         async with ctx.typing():
+            try:
 
-            # Remove old slash commands if we're adding all of them as new
-            if not command_names:
+                # Add just the named commands, and clear the snapshot as it's not a full sync
+                if command_names:
+                    for command in commands_to_add:
+                        if guild:
+                            await self.bot.create_guild_application_command(ctx.guild, command)
+                        else:
+                            await self.bot.create_global_application_command(command)
+                    await self._set_sync_snapshot(await self._get_sync_snapshot_key(ctx.guild if guild else None), None)
 
-                # Get the commands that currently exist
-                if guild:
-                    commands_current: typing.List[utils.interactions.ApplicationCommand] = await self.bot.get_guild_application_commands(ctx.guild)
+                # Sync all of the commands
                 else:
-                    commands_current: typing.List[utils.interactions.ApplicationCommand] = await self.bot.get_global_application_commands()
-
-                # See which commands we need to delete
-                commands_to_remove = [i for i in commands_current if i.name not in command_names_to_add]
-                for command in commands_to_remove:
-                    if guild:
-                        await self.bot.delete_guild_application_command(ctx.guild, command)
-                    else:
-                        await self.bot.delete_global_application_command(command)
-                    self.logger.info(f"Removed slash command for {command.name}")
+                    changed = await self.sync_application_commands(
+                        commands_to_add, guild=ctx.guild if guild else None, force=True,
+                    )
+                    if not changed:
+                        return await ctx.reply("Done - no changes were needed.", embeddify=False)
 
-            # Add commands
-            try:
-                if guild:
-                    await self.bot.bulk_create_guild_application_commands(ctx.guild, commands_to_add)
-                else:
-                    await self.bot.bulk_create_global_application_commands(commands_to_add)
             except discord.HTTPException as e:
                 try:
                     file = discord.File(
@@ -316,6 +501,7 @@ class SlashCommandHandler(utils.Cog):
                 else:
                     await self.bot.delete_global_application_command(command)
                 self.logger.info(f"Removed slash command for {command.name}")
+            await self._set_sync_snapshot(await self._get_sync_snapshot_key(ctx.guild if guild else None), None)
 
         # And we done
         await ctx.reply("Done.", embeddify=False)
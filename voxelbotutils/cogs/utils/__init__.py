@@ -10,11 +10,20 @@ from .custom_command import Command, Group, SubcommandGroup  # noqa
 from .custom_context import Context  # noqa
 from .database import DatabaseConnection  # noqa
 from .redis import RedisConnection, RedisChannelHandler, redis_channel_handler  # noqa
+from .redis_rpc import RedisRPC, RedisRPCResponse  # noqa
 from .statsd import StatsdConnection  # noqa
 from .time_value import TimeValue  # noqa
 from .interactions import ApplicationCommand, ApplicationCommandOption, ApplicationCommandOptionChoice, ApplicationCommandOptionType  # noqa
 from .paginator import Paginator  # noqa
+from .delete_reaction_tracker import DeleteReactionTracker  # noqa
+from .vote_cache import TopggVoteCache  # noqa
+from .upgrade_chat_cache import UpgradeChatEntitlementCache  # noqa
+from .support_team_index import SupportTeamIndex  # noqa
+from .message_state_cache import MessageStateCache, QueuedEdit  # noqa
+from .event_webhook_sender import EventWebhookSender  # noqa
+from .sql_page_source import SQLPageSource  # noqa
 from .interactions.components import *  # noqa
+from .interactions.component_handlers import ComponentStateStore, make_custom_id, parse_custom_id  # noqa
 from .help_command import HelpCommand  # noqa
 from .models import ComponentMessage, ComponentWebhookMessage  # noqa
 from .time_formatter import TimeFormatter  # noqa
@@ -1,3 +1,4 @@
+from .static_check import static_check
 from .is_config_set import is_config_set
 from .meta_command import meta_command
 from .bot_is_ready import bot_is_ready
@@ -4,3 +4,4 @@ from .cooldown import (
 )
 from .cooldown_with_exemptions import CooldownWithChannelExemptions
 from .role_based_cooldown import RoleBasedCooldown
+from .cooldown_storage import CooldownStorage, MemoryCooldownStorage, RedisCooldownStorage
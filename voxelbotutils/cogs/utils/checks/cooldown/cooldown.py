@@ -1,25 +1,45 @@
-import collections
+import copy
 import time
 import typing
 
 import discord
 from discord.ext import commands
 
+from .cooldown_storage import CooldownStorage, MemoryCooldownStorage
+
 
 class CooldownMapping(commands.CooldownMapping):
     """
     A mapping of cooldowns and who's run them, so we can keep track of individuals' rate limits.
+    The buckets themselves are kept in a :class:`CooldownStorage` - by default, an instance of
+    :attr:`default_storage_class` is made for each mapping.
+
+    Attributes:
+        default_storage_class (typing.Type[CooldownStorage]): The storage class used for mappings that
+            aren't given a storage. Set this to :class:`RedisCooldownStorage` to share every cooldown
+            between your clusters.
+        namespace (str): A name for this mapping's buckets, so that they're kept apart from other
+            mappings' in shared storage. This is set to the command's name automatically.
     """
 
-    def __init__(self):
-        pass
+    default_storage_class: typing.Type[CooldownStorage] = MemoryCooldownStorage
+    namespace: str = None
+
+    def __init__(self, *, storage: CooldownStorage = None):
+        """
+        Args:
+            storage (CooldownStorage, optional): The storage for the mapping's buckets.
+        """
+
+        self.storage = storage
+        self.namespace = None
 
     def copy(self) -> commands.CooldownMapping:
         """
-        Retuns a copy of the mapping, including a copy of its current cache.
+        Retuns a copy of the mapping, sharing its storage.
         """
 
-        return super().copy()
+        return copy.copy(self)
 
     @property
     def valid(self) -> bool:
@@ -36,19 +56,50 @@ class CooldownMapping(commands.CooldownMapping):
 
         return super()._bucket_key(message)
 
+    def _storage_key(self, message: discord.Message) -> str:
+        """
+        Gets the key that a message's bucket is stored under.
+        """
+
+        key = self._bucket_key(message)
+        if isinstance(key, tuple):
+            key = ":".join(str(i) for i in key)
+        return f"{self.namespace}:{key}"
+
     def get_bucket(self, message: discord.Message, current: float = None) -> commands.Cooldown:
         """
         Gives you the applied cooldown for a message, which you can use to work out whether to run the command or not.
         """
 
-        return super().get_bucket(message, current)
+        current = current or time.time()
+        return self.storage.get_bucket(self._storage_key(message), self._cooldown, current)
 
-    def update_rate_limit(self, message: discord.Message, current: float = None) -> None:
+    def update_rate_limit(self, message: discord.Message, current: float = None) -> typing.Optional[float]:
         """
-        Updates the rate limit for a given message.
+        Updates the rate limit for a given message in this process only. Use :func:`acquire` to
+        go via the mapping's storage.
         """
 
-        return super().update_rate_limit(message, current)
+        bucket = self.get_bucket(message, current)
+        return bucket.update_rate_limit(current)
+
+    async def acquire(
+            self, message: discord.Message, bucket: commands.Cooldown,
+            current: float = None) -> typing.Optional[float]:
+        """
+        Uses a token from a message's bucket via the mapping's storage.
+
+        Args:
+            message (discord.Message): The message that the bucket is for.
+            bucket (commands.Cooldown): The bucket, as given by :func:`get_bucket`.
+            current (float, optional): The current time.
+
+        Returns:
+            typing.Optional[float]: How long until the bucket can be used again, if it's been rate limited.
+        """
+
+        current = current or time.time()
+        return await self.storage.update_rate_limit(self._storage_key(message), bucket, current)
 
     def __call__(self, original: commands.Cooldown):
         """
@@ -62,13 +113,11 @@ class CooldownMapping(commands.CooldownMapping):
 
         self._cooldown = original
         self._cooldown.mapping = self
-        self._cache = {}
+        if getattr(self, "storage", None) is None:
+            self.storage = self.default_storage_class()
         return self
 
 
-grouped_cooldown_mapping_cache = collections.defaultdict(dict)
-
-
 class GroupedCooldownMapping(CooldownMapping):
     """
     A grouped cooldown mapping class so that you can easily apply a single cooldown to multiple
@@ -93,22 +142,40 @@ class GroupedCooldownMapping(CooldownMapping):
                 '''These two commands will be subject to the same cooldown.'''
     """
 
-    grouped_cache = grouped_cooldown_mapping_cache
+    # group key: storage
+    grouped_storages: typing.Dict[str, CooldownStorage] = {}
 
-    def __init__(self, key: str):
+    def __init__(self, key: str, *, storage: CooldownStorage = None):
         """
         Args:
             key (str): The cooldown key that the commands will be grouped under.
+            storage (CooldownStorage, optional): The storage for the group's buckets. Only the first
+                storage given for a group is used.
         """
+
         self.group_cache_key = key
+        if storage is not None:
+            self.grouped_storages.setdefault(key, storage)
 
     @property
-    def _cache(self):
-        return grouped_cooldown_mapping_cache[self.group_cache_key]
+    def storage(self) -> CooldownStorage:
+        try:
+            return self.grouped_storages[self.group_cache_key]
+        except KeyError:
+            return self.grouped_storages.setdefault(self.group_cache_key, self.default_storage_class())
+
+    @storage.setter
+    def storage(self, value):
+        if value is not None:
+            self.grouped_storages.setdefault(self.group_cache_key, value)
 
-    @_cache.setter
-    def _cache(self, value):
-        grouped_cooldown_mapping_cache[self.group_cache_key] = value
+    @property
+    def namespace(self) -> str:
+        return f"group:{self.group_cache_key}"
+
+    @namespace.setter
+    def namespace(self, value):
+        pass
 
 
 class Cooldown(commands.Cooldown):
@@ -0,0 +1,279 @@
+import asyncio
+import heapq
+import logging
+import sys
+import time
+import typing
+
+from discord.ext import commands
+
+from ...redis import RedisConnection
+
+
+class CooldownStorage(object):
+    """
+    The base class for somewhere that cooldown buckets are stored. Buckets are always available
+    synchronously via :func:`get_bucket` (so that Discord.py's own cooldown handling keeps working),
+    but are updated through the asynchronous :func:`update_rate_limit`, so that storages are able
+    to share them between processes.
+    """
+
+    def get_bucket(self, key: str, original: commands.Cooldown, current: float) -> commands.Cooldown:
+        """
+        Get the bucket for a given key, making a copy of the original cooldown if there isn't one.
+
+        Args:
+            key (str): The key for the bucket.
+            original (commands.Cooldown): The cooldown that the bucket is copied from.
+            current (float): The current time.
+
+        Returns:
+            commands.Cooldown: The bucket.
+        """
+
+        raise NotImplementedError()
+
+    async def update_rate_limit(self, key: str, bucket: commands.Cooldown, current: float) -> typing.Optional[float]:
+        """
+        Use a token from a bucket.
+
+        Args:
+            key (str): The key for the bucket.
+            bucket (commands.Cooldown): The bucket, as given by :func:`get_bucket`.
+            current (float): The current time.
+
+        Returns:
+            typing.Optional[float]: How long until the bucket can be used again, if it's been rate limited.
+        """
+
+        raise NotImplementedError()
+
+    def sweep(self, current: float = None) -> int:
+        """
+        Remove any buckets from the storage whose cooldowns have expired.
+
+        Args:
+            current (float, optional): The current time.
+
+        Returns:
+            int: The number of buckets that were removed.
+        """
+
+        raise NotImplementedError()
+
+    def estimated_size(self) -> int:
+        """
+        Estimate the number of bytes of memory that the storage's buckets are using in this process.
+
+        Returns:
+            int: The estimated size, in bytes.
+        """
+
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+
+class MemoryCooldownStorage(CooldownStorage):
+    """
+    A cooldown storage that keeps buckets in memory for the current process. Buckets are evicted
+    once their cooldown has expired, using a heap of expiry times rather than scanning every bucket
+    on each command call.
+    """
+
+    def __init__(self):
+        self._buckets: typing.Dict[str, commands.Cooldown] = {}
+        self._expiry_heap: typing.List[typing.Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    @staticmethod
+    def _get_expiry(bucket: commands.Cooldown) -> float:
+        return bucket._last + bucket.per
+
+    def _evict(self, current: float) -> None:
+        """
+        Remove any buckets whose cooldowns have expired.
+        """
+
+        while self._expiry_heap and self._expiry_heap[0][0] < current:
+            _, key = heapq.heappop(self._expiry_heap)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+
+            # Buckets only have one entry in the heap, so if it's been used since it was pushed
+            # then we put it back in with its new expiry
+            expiry = self._get_expiry(bucket)
+            if expiry < current:
+                del self._buckets[key]
+            else:
+                heapq.heappush(self._expiry_heap, (expiry, key))
+
+    def sweep(self, current: float = None) -> int:
+        before = len(self._buckets)
+        self._evict(current or time.time())
+        return before - len(self._buckets)
+
+    def estimated_size(self) -> int:
+        size = sys.getsizeof(self._buckets) + sys.getsizeof(self._expiry_heap)
+        if not self._buckets:
+            return size
+
+        # Buckets are all alike, so we size one and multiply
+        key, bucket = next(iter(self._buckets.items()))
+        bucket_size = sys.getsizeof(bucket) + sys.getsizeof(key) + sys.getsizeof(bucket._window)
+        heap_entry_size = sys.getsizeof((0.0, key)) + sys.getsizeof(0.0)
+        return size + (len(self._buckets) * bucket_size) + (len(self._expiry_heap) * heap_entry_size)
+
+    def get_bucket(self, key: str, original: commands.Cooldown, current: float) -> commands.Cooldown:
+        self._evict(current)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = original.copy()
+            bucket._last = current
+            self._buckets[key] = bucket
+            heapq.heappush(self._expiry_heap, (self._get_expiry(bucket), key))
+        return bucket
+
+    async def update_rate_limit(self, key: str, bucket: commands.Cooldown, current: float) -> typing.Optional[float]:
+        return bucket.update_rate_limit(current)
+
+
+class RedisCooldownStorage(CooldownStorage):
+    """
+    A cooldown storage that keeps buckets in Redis, so that cooldowns are shared between every
+    cluster of your bot. Buckets are updated atomically via a Lua script (with the same semantics as
+    Discord.py's cooldowns), and the updates from the same event loop iteration are sent to Redis
+    together in a single pipeline. A copy of each bucket is kept in memory so that synchronous lookups
+    (eg :func:`voxelbotutils.Command.get_remaining_cooldown`) still work, and to fall back to if Redis
+    isn't available.
+
+    Examples:
+
+        ::
+
+            # For a single command
+            @voxelbotutils.cooldown.cooldown(
+                1, 60, commands.BucketType.user,
+                cls=voxelbotutils.cooldown.Cooldown(mapping=voxelbotutils.cooldown.CooldownMapping(
+                    storage=voxelbotutils.cooldown.RedisCooldownStorage(),
+                )),
+            )
+
+            # Or for every command
+            voxelbotutils.cooldown.CooldownMapping.default_storage_class = voxelbotutils.cooldown.RedisCooldownStorage
+    """
+
+    KEY_PREFIX: str = "VBUCooldown"
+    logger: logging.Logger = logging.getLogger("vbu.cooldown")
+
+    # KEYS: bucket key; ARGV: rate, per, current
+    # Returns: tokens, window, retry_after (empty if not rate limited)
+    UPDATE_RATE_LIMIT_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local per = tonumber(ARGV[2])
+    local current = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'window')
+    local tokens = tonumber(state[1]) or rate
+    local window = tonumber(state[2]) or 0
+    if current > window + per then
+        tokens = rate
+    end
+    if tokens == rate then
+        window = current
+    end
+    local retry_after = ''
+    if tokens == 0 then
+        retry_after = tostring(per - (current - window))
+    else
+        tokens = tokens - 1
+        if tokens == 0 then
+            window = current
+        end
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'window', tostring(window))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(per * 1000) + 1000)
+    return {tokens, tostring(window), retry_after}
+    """
+
+    def __init__(self):
+        self._local = MemoryCooldownStorage()
+        self._pending: typing.List[typing.Tuple[str, commands.Cooldown, float, asyncio.Future]] = []
+        self._flush_task: typing.Optional[asyncio.Task] = None
+        self._script_sha: typing.Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def sweep(self, current: float = None) -> int:
+        return self._local.sweep(current)
+
+    def estimated_size(self) -> int:
+        return self._local.estimated_size()
+
+    def get_bucket(self, key: str, original: commands.Cooldown, current: float) -> commands.Cooldown:
+        return self._local.get_bucket(key, original, current)
+
+    async def update_rate_limit(self, key: str, bucket: commands.Cooldown, current: float) -> typing.Optional[float]:
+        if RedisConnection.pool is None:
+            return bucket.update_rate_limit(current)
+
+        # Queue up the update and make sure that something's going to send it
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((key, bucket, current, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        """
+        Send all of the pending bucket updates to Redis in one pipeline.
+        """
+
+        # Let anything else from this loop iteration be added to the batch, and keep going
+        # until there's nothing left (as more may be added while we're waiting on Redis)
+        await asyncio.sleep(0)
+        while self._pending:
+            pending, self._pending = self._pending, []
+            await self._send_batch(pending)
+
+    async def _send_batch(self, pending: list) -> None:
+        """
+        Run the update script for a batch of buckets in one pipeline, and set their results.
+        """
+
+        # Run the scripts
+        try:
+            async with RedisConnection() as re:
+                if self._script_sha is None:
+                    self._script_sha = await re.conn.script_load(self.UPDATE_RATE_LIMIT_SCRIPT)
+                pipe = re.conn.pipeline()
+                for key, bucket, current, _ in pending:
+                    pipe.evalsha(
+                        self._script_sha,
+                        keys=[f"{self.KEY_PREFIX}:{key}"],
+                        args=[bucket.rate, bucket.per, current],
+                    )
+                results = await pipe.execute(return_exceptions=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to update cooldowns in Redis, using local cooldowns - {e}")
+            self._script_sha = None
+            results = [e] * len(pending)
+
+        # Give out the results, falling back to the local bucket for anything that failed
+        for (key, bucket, current, future), result in zip(pending, results):
+            if isinstance(result, Exception):
+                if "NOSCRIPT" in str(result):
+                    self._script_sha = None
+                retry_after = bucket.update_rate_limit(current)
+            else:
+                tokens, window, retry_after = result
+                bucket._tokens = int(tokens)
+                bucket._window = float(window)
+                bucket._last = current
+                retry_after = float(retry_after) if retry_after else None
+            if not future.done():
+                future.set_result(retry_after)
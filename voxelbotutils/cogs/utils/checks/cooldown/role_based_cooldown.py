@@ -1,11 +1,83 @@
+import collections
+import typing
+import weakref
+
 from discord.ext import commands
 
 from .cooldown import Cooldown
 
 
+class RoleTierResolver(object):
+    """
+    Works out the cooldown for a member given a set of role tiers, caching it per member until
+    the member's roles are updated. This is shared between every bucket of a :class:`RoleBasedCooldown`.
+
+    :meta private:
+    """
+
+    MAX_CACHE_SIZE: int = 10_000
+    _resolvers: typing.Set['RoleTierResolver'] = weakref.WeakSet()
+    _listening_bots: typing.Set[int] = set()
+
+    def __init__(self, tiers: typing.Dict[int, float]):
+        self.tiers = tiers
+        self.tier_role_ids = frozenset(tiers)
+
+        # (guild_id, user_id): the member's cooldown (or None if they have no tier role)
+        self._cache: typing.Dict[typing.Tuple[int, int], typing.Optional[float]] = collections.OrderedDict()
+        self._resolvers.add(self)
+
+    def resolve(self, member) -> typing.Optional[float]:
+        """
+        Get the cooldown for a given member - the lowest of their tier roles', or :code:`None`
+        if they have none.
+        """
+
+        key = (member.guild.id, member.id)
+        try:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        except KeyError:
+            pass
+        matching = self.tier_role_ids.intersection(member._roles)
+        per = min(self.tiers[i] for i in matching) if matching else None
+        self._cache[key] = per
+        if len(self._cache) > self.MAX_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return per
+
+    @classmethod
+    def invalidate(cls, guild_id: int, user_id: int) -> None:
+        """
+        Remove a member from every resolver's cache.
+        """
+
+        for resolver in list(cls._resolvers):
+            resolver._cache.pop((guild_id, user_id), None)
+
+    @classmethod
+    def listen(cls, bot) -> None:
+        """
+        Make sure that a bot is invalidating members' cached tiers when their roles change.
+        """
+
+        if id(bot) in cls._listening_bots or not hasattr(bot, 'add_raw_event_handler'):
+            return
+        cls._listening_bots.add(id(bot))
+        bot.add_raw_event_handler("GUILD_MEMBER_UPDATE", cls._handle_member_event)
+        bot.add_raw_event_handler("GUILD_MEMBER_REMOVE", cls._handle_member_event)
+
+    @classmethod
+    def _handle_member_event(cls, payload: dict) -> None:
+        data = payload['d']
+        cls.invalidate(int(data['guild_id']), int(data['user']['id']))
+
+
 class RoleBasedCooldown(Cooldown):
     """
     A cooldown that lets you set the cooldown for a command based on the user's roles.
+    As the cooldown depends on the member, tiers only apply to cooldowns whose bucket
+    type is per user or per member - other bucket types always use the default cooldown.
 
     Example:
 
@@ -19,6 +91,7 @@ class RoleBasedCooldown(Cooldown):
     """
 
     _copy_kwargs = ()
+    MEMBER_BUCKET_TYPES = (commands.BucketType.user, commands.BucketType.member)
 
     def __init__(self, tiers: dict, **kwargs):
         """
@@ -28,16 +101,40 @@ class RoleBasedCooldown(Cooldown):
         """
         super().__init__(**kwargs)
         self.tier_cooldowns = tiers  # RoleID: CooldownSeconds
+        self.resolver = RoleTierResolver(tiers)
+        self.default_per = None
+
+    def __call__(self, rate: float, per: int, type: commands.BucketType) -> 'RoleBasedCooldown':
+        """:meta private:"""
+
+        super().__call__(rate, per, type)
+        self.default_per = self.per
+        return self
+
+    def copy(self) -> 'RoleBasedCooldown':
+        """
+        Returns a copy of the cooldown, sharing its tier resolver.
+        """
+
+        cooldown = self.__class__(self.tier_cooldowns, error=self.error, mapping=self.mapping)
+        cooldown.resolver = self.resolver
+        cooldown = cooldown(rate=self.rate, per=self.default_per, type=self.type)
+        return cooldown
 
     def predicate(self, ctx: commands.Context):
         """
-        Update the cooldown based on the given guild member.
+        Update the cooldown for this bucket based on the given guild member.
         """
 
-        message = ctx.message
-        if message.guild is None:
-            return  # Go for the default
-        cooldown_seconds = [o for i, o in self.tier_cooldowns.items() if i in message.author._roles]  # Get valid cooldowns
-        if not cooldown_seconds:
+        # Tiers are only valid on buckets that belong to a single user
+        if self.type not in self.MEMBER_BUCKET_TYPES:
             return
-        self.per = min(cooldown_seconds)  # Set this rate as the minimum form the roles
+
+        # Work out their cooldown - we set this every time so that users who've lost a
+        # tier role go back to the default
+        message = ctx.message
+        per = None
+        if message.guild is not None and hasattr(message.author, '_roles'):
+            RoleTierResolver.listen(ctx.bot)
+            per = self.resolver.resolve(message.author)
+        self.per = self.default_per if per is None else per
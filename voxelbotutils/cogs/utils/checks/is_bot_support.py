@@ -1,5 +1,4 @@
 from discord.ext import commands
-import discord
 
 
 class NotBotSupport(commands.MissingRole):
@@ -15,8 +14,8 @@ class NotBotSupport(commands.MissingRole):
 def is_bot_support():
     """
     Checks whether or not the calling user has the bot support role, as defined in the bot's configuration
-    file (:attr:`config.bot_support_role_id`). As it checks a role ID, this will only work it the command in quesiton is called
-    in a guild where the calling user *has* the given role.
+    file (:attr:`config.bot_support_role_id`) in the bot's support guild (:attr:`config.support_guild_id`). Members of the
+    support team are looked up via :attr:`voxelbotutils.Bot.support_team`.
 
     Raises:
         NotBotSupport: If the given user isn't a member of the bot's support team.
@@ -25,16 +24,7 @@ def is_bot_support():
     async def predicate(ctx: commands.Context):
         if ctx.author.id in ctx.bot.owner_ids:
             return True
-        support_guild = await ctx.bot.fetch_support_guild()
-        if support_guild is None:
-            raise NotBotSupport()
-        try:
-            member = support_guild.get_member(ctx.author.id) or await support_guild.fetch_member(ctx.author.id)
-            if member is None:
-                raise AttributeError()
-        except (discord.HTTPException, AttributeError):
-            raise NotBotSupport()
-        if ctx.bot.config.get("bot_support_role_id", None) in [i.id for i in member.roles] or ctx.author.id in ctx.bot.owner_ids:
+        if await ctx.bot.support_team.is_support(ctx.author.id):
             return True
         raise NotBotSupport()
     return commands.check(predicate)
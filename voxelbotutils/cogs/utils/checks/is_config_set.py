@@ -1,5 +1,7 @@
 from discord.ext import commands
 
+from .static_check import static_check
+
 
 class ConfigNotSet(commands.DisabledCommand):
     """
@@ -19,6 +21,7 @@ def is_config_set(*config_keys):
         ConfigNotSet: If the config item hasn't been set for the bot.
     """
 
+    @static_check
     def predicate(ctx: commands.Context):
         working_config = ctx.bot.config
         try:
@@ -1,5 +1,4 @@
 import asyncio
-from datetime import datetime as dt
 
 from discord.ext import commands
 import upgradechat
@@ -31,7 +30,8 @@ def is_upgrade_chat_purchaser(*any_item_names):
     A check to see whether a given user is an UpgradeChat purchaser for *any* of the given item names,
     adding an `upgrade_chat_items` attribute to the context object with the given purchases. For example,
     if you wanted a command to only be runnable if someone purchased the an item called `command_access` via
-    UpgradeChat, your check would be `is_upgrade_chat_purchaser("command_access")`.
+    UpgradeChat, your check would be `is_upgrade_chat_purchaser("command_access")`. Purchases are cached in
+    :attr:`voxelbotutils.Bot.upgrade_chat_cache`.
 
     Raises:
         IsNotUpgradeChatPurchaser: If the user hasn't purchased the given item.
@@ -47,28 +47,20 @@ def is_upgrade_chat_purchaser(*any_item_names):
 
         # Grab all purchased roles by the user
         try:
-            purchases = await asyncio.wait_for(
-                ctx.bot.upgrade_chat.get_orders(discord_id=ctx.author.id, type=upgradechat.UpgradeChatItemType.SHOP),
-                timeout=3,
+            product_names = await ctx.bot.upgrade_chat_cache.get_product_names(
+                ctx.author.id, upgradechat.UpgradeChatItemType.SHOP, timeout=3,
             )
         except (asyncio.TimeoutError, upgradechat.UpgradeChatError):
             raise commands.CheckFailure("Upgrade.Chat is currently unable to process my request for purchasers - please try again later.")
 
         # See if they purchased anything that's correct
-        output_items = []
-        for purchase in purchases:
-            if purchase.type.name != "SHOP":
-                continue
-            for order_item in purchase.order_items:
-                product_name = order_item.product_name
-                if product_name in any_item_names:
-                    output_items.append(product_name)
+        output_items = [i for i in product_names if i in any_item_names]
         if output_items:
             ctx.upgrade_chat_items = output_items
             return True
 
         # They didn't purchase anything [valid]
-        raise IsNotUpgradeChatPurchaser()
+        raise IsNotUpgradeChatPurchaser(any_item_names)
 
     return commands.check(predicate)
 
@@ -78,7 +70,8 @@ def is_upgrade_chat_subscriber(*any_item_names):
     A check to see whether a given user is an UpgradeChat subscriber for *any* of the given item names,
     adding an `upgrade_chat_items` attribute to the context object with the given purchases. For example,
     if you wanted a command to only be runnable if someone is subscribed to an item called `command_access`
-    via UpgradeChat, your check would be `is_upgrade_chat_subscriber("command_access")`.
+    via UpgradeChat, your check would be `is_upgrade_chat_subscriber("command_access")`. Subscriptions are
+    cached in :attr:`voxelbotutils.Bot.upgrade_chat_cache`.
 
     Raises:
         IsNotUpgradeChatSubscriber: If the user isn't subscribing to the given item.
@@ -94,24 +87,14 @@ def is_upgrade_chat_subscriber(*any_item_names):
 
         # Grab all purchased roles by the user
         try:
-            purchases = await asyncio.wait_for(
-                ctx.bot.upgrade_chat.get_orders(discord_id=ctx.author.id, type=upgradechat.UpgradeChatItemType.UPGRADE),
-                timeout=3,
+            product_names = await ctx.bot.upgrade_chat_cache.get_product_names(
+                ctx.author.id, upgradechat.UpgradeChatItemType.UPGRADE, timeout=3,
             )
         except (asyncio.TimeoutError, upgradechat.UpgradeChatError):
             raise commands.CheckFailure("Upgrade.Chat is currently unable to process my request for subscribers - please try again later.")
 
         # See if they purchased anything that's correct
-        output_items = []
-        for purchase in purchases:
-            if purchase.type.name != "UPGRADE":
-                continue
-            if purchase.deleted is not None and purchase.deleted > dt.utcnow():
-                continue
-            for order_item in purchase.order_items:
-                product_name = order_item.product_name
-                if product_name in any_item_names:
-                    output_items.append(product_name)
+        output_items = [i for i in product_names if i in any_item_names]
         if output_items:
             ctx.upgrade_chat_items = output_items
             return True
@@ -14,8 +14,9 @@ def is_voter(timeout: float = 3.0):
     """
     A check to make sure the author of a given command is a voter on your bot's
     Top.gg page. This only works if a Top.gg token is provided in your config
-    (:attr:`BotConfig.bot_listing_api_keys.topgg_token`) and is valid. If one isn't provided,
-    the command will always raise :class:`voxelbotutils.errors.IsNotVoter`.
+    (:attr:`BotConfig.bot_listing_api_keys.topgg_token`) and is valid, or if votes are pushed
+    to your website's vote webhook (:attr:`BotConfig.bot_listing_api_keys.topgg_webhook_enabled`).
+    If neither is set up, the command will always raise :class:`voxelbotutils.errors.IsNotVoter`.
 
     Args:
         timeout (float, optional): The amount of time to wait before considering their API to be down.
@@ -29,14 +30,14 @@ def is_voter(timeout: float = 3.0):
 
     async def predicate(ctx: commands.Context):
 
-        # Get the API token
-        topgg_token = ctx.bot.config.get('bot_listing_api_keys', {}).get('topgg_token')
-        if not topgg_token:
+        # Get the API token, unless votes are being pushed to us
+        topgg_config = ctx.bot.config.get('bot_listing_api_keys', {})
+        if not topgg_config.get('topgg_token') and not topgg_config.get('topgg_webhook_enabled', False):
             raise error
 
         # Try and get the information
         try:
-            voted = asyncio.wait_for(ctx.bot.get_user_topgg_vote(ctx.author.id), timeout=3)
+            voted = await asyncio.wait_for(ctx.bot.get_user_topgg_vote(ctx.author.id), timeout=timeout)
         except asyncio.TimeoutError:
             raise commands.CheckFailure("Top.gg is currently unable to process my request for voters - please try again later.")
 
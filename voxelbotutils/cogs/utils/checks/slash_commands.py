@@ -1,5 +1,7 @@
 from discord.ext import commands
 
+from .static_check import static_check
+
 # from ..interactions import InteractionContext
 
 
@@ -53,6 +55,7 @@ def bot_in_guild():
         BotNotInGuild: If the bot isn't in the guild where the command is being called.
     """
 
+    @static_check
     async def predicate(ctx):
         if ctx.bot.get_guild(ctx.guild.id) is None:
             raise BotNotInGuild()
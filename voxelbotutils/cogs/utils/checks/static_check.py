@@ -0,0 +1,23 @@
+import typing
+
+
+def static_check(predicate: typing.Callable) -> typing.Callable:
+    """
+    Marks a check predicate as depending only on the guild, the channel permissions of the author and
+    the bot, and the author's roles. The results of static checks are cached when the help command
+    works out which commands a user can see, rather than being run for every help call. Discord.py's
+    permission, role, and guild/DM checks are already treated as static.
+
+    Examples:
+
+        ::
+
+            def is_premium_guild():
+                @voxelbotutils.checks.static_check
+                async def predicate(ctx):
+                    return ctx.guild is not None and ctx.guild.premium_tier > 0
+                return commands.check(predicate)
+    """
+
+    predicate.__vbu_static_check__ = True
+    return predicate
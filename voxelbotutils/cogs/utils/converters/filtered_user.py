@@ -13,7 +13,11 @@ class FilteredUser(commands.UserConverter):
         self.allow_bots = allow_bots
 
     async def convert(self, ctx: commands.Context, argument: str):
-        m = await super().convert(ctx, argument)
+        m = None
+        if getattr(ctx, "resolved", None) is not None:
+            m = ctx.resolved.get_user(argument)
+        if m is None:
+            m = await super().convert(ctx, argument)
         if self.allow_author is False and ctx.author.id == m.id:
             raise commands.BadArgument("You can't run this command on yourself.")
         if self.allow_bots is False and m.bot:
@@ -33,7 +37,11 @@ class FilteredMember(commands.MemberConverter):
         self.allow_bots = allow_bots
 
     async def convert(self, ctx: commands.Context, argument: str):
-        m = await super().convert(ctx, argument)
+        m = None
+        if getattr(ctx, "resolved", None) is not None:
+            m = ctx.resolved.get_member(argument)
+        if m is None:
+            m = await super().convert(ctx, argument)
         if self.allow_author is False and ctx.author.id == m.id:
             raise commands.BadArgument("You can't run this command on yourself.")
         if self.allow_bots is False and m.bot:
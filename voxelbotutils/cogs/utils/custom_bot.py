@@ -10,6 +10,7 @@ import platform
 import random
 import json
 import sys
+import time
 
 import aiohttp
 import toml
@@ -17,15 +18,28 @@ import discord
 from discord.ext import commands
 from discord.abc import Messageable
 import upgradechat
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .custom_context import Context
 from .database import DatabaseConnection
 from .redis import RedisConnection
+from .redis_rpc import RedisRPC
 from .statsd import StatsdConnection
 from .analytics_log_handler import AnalyticsLogHandler
 from .interactions.components import MessageComponents
 from .models import ComponentMessage, ComponentWebhookMessage
 from .shard_manager import ShardManagerClient
+from .gateway import get_gateway_bot
+from .delete_reaction_tracker import DeleteReactionTracker
+from .vote_cache import TopggVoteCache
+from .upgrade_chat_cache import UpgradeChatEntitlementCache
+from .support_team_index import SupportTeamIndex
+from .embed_permission_cache import EmbedPermissionCache
+from .message_state_cache import MessageStateCache
+from .event_webhook_sender import EventWebhookSender
 from . import interactions
 from .. import all_packages as all_vfl_package_names
 
@@ -33,6 +47,14 @@ from .. import all_packages as all_vfl_package_names
 sys.path.append(".")
 
 
+def _orjson_to_json(obj) -> str:
+    """
+    A faster version of :func:`discord.utils.to_json`, used if orjson is installed.
+    """
+
+    return orjson.dumps(obj).decode()
+
+
 def get_prefix(bot, message: discord.Message):
     """
     Get the guild prefix for the bot given the message that should be invoking a command.
@@ -87,12 +109,63 @@ class RouteV8(discord.http.Route):
     BASE = 'https://discord.com/api/v8'
 
 
+class _NoLock(object):
+    """
+    An async context manager that does nothing, used in place of a lock where one isn't needed.
+
+    :meta private:
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+_NO_LOCK = _NoLock()
+
+
+class PresenceRatelimiter(object):
+    """
+    A per-shard limiter for presence updates, so that concurrent updates don't eat into the
+    gateway's send budget any faster than Discord allows.
+
+    :meta private:
+    """
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self.sent = collections.deque()
+        self.lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.lock.acquire()
+        try:
+            now = time.monotonic()
+            while self.sent and self.sent[0] <= now - self.per:
+                self.sent.popleft()
+            if len(self.sent) >= self.rate:
+                await asyncio.sleep(self.sent.popleft() + self.per - now)
+            self.sent.append(time.monotonic())
+        except BaseException:
+            self.lock.release()
+            raise
+        return self
+
+    async def __aexit__(self, *args):
+        self.lock.release()
+
+
 class MinimalBot(commands.AutoShardedBot):
     """
     A minimal version of the VoxelBotUtils bot that inherits from :class:`discord.ext.commands.AutoShardedBot`
     but gives new VBU features.
     """
 
+    MAX_SEND_CACHE_SIZE: int = 1_000  #: The max number of allowed mentions and interaction webhooks to keep around for sends.
+
     def __init__(self, *args, **kwargs):
 
         # Make sure we init the bot
@@ -101,6 +174,22 @@ class MinimalBot(commands.AutoShardedBot):
         # Add some attrs that appear in a lot of places
         self.application_id = None
 
+        # Waiters for component interactions, indexed by message
+        self.component_router = interactions.ComponentRouter(self.loop)
+
+        # Raw gateway event handlers, keyed by event type (or None for every event)
+        self._raw_event_handlers: typing.Dict[typing.Optional[str], typing.List[typing.Callable]] = collections.defaultdict(list)
+
+        # Messages with delete reactions, indexed by message
+        self.delete_reactions = DeleteReactionTracker(self)
+
+        # The last sent state of recent messages, so that edits can be diffed and coalesced
+        self.message_states = MessageStateCache(self)
+
+        # Things that are reused between message sends
+        self._allowed_mentions_cache: typing.Dict[tuple, tuple] = collections.OrderedDict()
+        self._interaction_webhook_states: typing.Dict[tuple, typing.Any] = collections.OrderedDict()
+
         # Mess with the default D.py message send and edit methods
         async def send_button_msg_prop(messagable, *args, **kwargs) -> discord.Message:
             return await self._send_button_message(messagable, *args, **kwargs)
@@ -127,6 +216,8 @@ class MinimalBot(commands.AutoShardedBot):
         # def create_message_prop(state, *args, **kwargs):
         #     return ComponentMessage(state=state, *args, **kwargs)
 
+        if orjson is not None:
+            discord.utils.to_json = _orjson_to_json
         Messageable.send = send_button_msg_prop
         discord.message.MessageFlags.ephemeral = discord.flags.flag_value(lambda _: 64)
         discord.message.MessageFlags.VALID_FLAGS.update({"ephemeral": 64})
@@ -154,6 +245,59 @@ class MinimalBot(commands.AutoShardedBot):
 
         # ConnectionState.create_message = create_message_prop
 
+    def add_raw_event_handler(self, event_type: typing.Optional[str], callback: typing.Callable) -> None:
+        """
+        Adds a handler for raw gateway events of a given type. Unlike listening to :code:`on_socket_response`,
+        the handler is only called for the event types it's registered for. Coroutine functions are scheduled
+        as tasks, and regular functions are called inline (so keep them cheap).
+
+        Args:
+            event_type (typing.Optional[str]): The gateway event type to listen for (eg :code:`INTERACTION_CREATE`).
+                If :code:`None`, the handler is called for every event.
+            callback (typing.Callable): The function to be called with the raw payload.
+        """
+
+        self._raw_event_handlers[event_type].append(callback)
+
+    def remove_raw_event_handler(self, event_type: typing.Optional[str], callback: typing.Callable) -> None:
+        """
+        Removes a handler added via :func:`add_raw_event_handler`.
+
+        Args:
+            event_type (typing.Optional[str]): The gateway event type that the handler was added for.
+            callback (typing.Callable): The handler to remove.
+        """
+
+        try:
+            self._raw_event_handlers[event_type].remove(callback)
+        except ValueError:
+            pass
+        if not self._raw_event_handlers[event_type]:
+            del self._raw_event_handlers[event_type]
+
+    def dispatch(self, event_name, *args, **kwargs):
+        """:meta private:"""
+
+        if event_name == 'socket_response' and self._raw_event_handlers:
+            self._dispatch_raw_event(args[0])
+        super().dispatch(event_name, *args, **kwargs)
+
+    def _dispatch_raw_event(self, payload: dict) -> None:
+        """
+        Run the raw event handlers that are listening for a given payload's event type.
+        """
+
+        event_types = (payload['t'], None) if payload.get('t') else (None,)
+        for event_type in event_types:
+            for callback in self._raw_event_handlers.get(event_type, ()):
+                if asyncio.iscoroutinefunction(callback):
+                    self._schedule_event(callback, f"raw_{event_type or 'event'}", payload)
+                    continue
+                try:
+                    callback(payload)
+                except Exception:
+                    logging.getLogger("vbu.raw_events").exception(f"Error in raw event handler {callback!r}")
+
     async def get_application_id(self) -> int:
         """
         Get the bot's application client ID.
@@ -383,6 +527,63 @@ class MinimalBot(commands.AutoShardedBot):
 
         return content, embed
 
+    def _get_allowed_mentions_dict(
+            self, default: typing.Optional[discord.AllowedMentions],
+            given: typing.Optional[discord.AllowedMentions]) -> typing.Optional[dict]:
+        """
+        Get the payload dict for a message's allowed mentions, merged with the bot's defaults. These
+        are cached by object, as the same few are used for nearly every message. The returned dict
+        is shared, so should be copied before it's changed.
+
+        :meta private:
+        """
+
+        if default is None and given is None:
+            return None
+        key = (id(default), id(given),)
+        try:
+            cached = self._allowed_mentions_cache[key]
+        except KeyError:
+            pass
+        else:
+            if cached[0] is default and cached[1] is given:
+                self._allowed_mentions_cache.move_to_end(key)
+                return cached[2]
+        if given is None:
+            data = default.to_dict()
+        elif default is None:
+            data = given.to_dict()
+        else:
+            data = default.merge(given).to_dict()
+
+        # Keep references to the objects so that their IDs can't be reused while they're cached
+        self._allowed_mentions_cache[key] = (default, given, data,)
+        while len(self._allowed_mentions_cache) > self.MAX_SEND_CACHE_SIZE:
+            self._allowed_mentions_cache.popitem(last=False)
+        return data
+
+    def _get_interaction_webhook_state(self, application_id: int, token: str):
+        """
+        Get the partial webhook state used to build follow-up messages for an interaction,
+        so that it isn't rebuilt for every message sent in response to it.
+
+        :meta private:
+        """
+
+        key = (application_id, token,)
+        try:
+            self._interaction_webhook_states.move_to_end(key)
+            return self._interaction_webhook_states[key]
+        except KeyError:
+            pass
+        webhook = discord.Webhook.partial(application_id, token, adapter=discord.AsyncWebhookAdapter(session=self.session))
+        webhook._state = self._connection
+        partial_webhook_state = discord.webhook._PartialWebhookState(webhook._adapter, webhook, parent=webhook._state)
+        self._interaction_webhook_states[key] = partial_webhook_state
+        while len(self._interaction_webhook_states) > self.MAX_SEND_CACHE_SIZE:
+            self._interaction_webhook_states.popitem(last=False)
+        return partial_webhook_state
+
     async def _send_button_message(
             self, messageable, content: str = None, *, tts: bool = False,
             embed: discord.Embed = None, file: discord.File = None,
@@ -410,8 +611,6 @@ class MinimalBot(commands.AutoShardedBot):
             state = messageable._state
         except AttributeError:
             state = self._connection
-        lock = getattr(messageable, "_send_interaction_response_lock", asyncio.Lock())
-        await lock.acquire()
 
         # Work out the main content
         content = str(content) if content is not None else None
@@ -426,17 +625,11 @@ class MinimalBot(commands.AutoShardedBot):
             embeds = [e.to_dict() for e in embeds]
 
         # Work out our allowed mentions
-        if allowed_mentions is not None:
-            if state.allowed_mentions is not None:
-                allowed_mentions = state.allowed_mentions.merge(allowed_mentions).to_dict()
-            else:
-                allowed_mentions = allowed_mentions.to_dict()
-        else:
-            allowed_mentions = state.allowed_mentions and state.allowed_mentions.to_dict()
+        allowed_mentions = self._get_allowed_mentions_dict(state.allowed_mentions, allowed_mentions)
 
         # Work out our message references
         if mention_author is not None:
-            allowed_mentions = allowed_mentions or discord.AllowedMentions().to_dict()
+            allowed_mentions = dict(allowed_mentions or discord.AllowedMentions().to_dict())
             allowed_mentions['replied_user'] = bool(mention_author)
         if reference is not None:
             try:
@@ -460,110 +653,114 @@ class MinimalBot(commands.AutoShardedBot):
                 raise TypeError(f"Components kwarg must be of type {MessageComponents}")
             components = components.to_dict()
 
-        # Send a response if it's an interaction
-        if isinstance(channel, (list, tuple)):
+        # Only one response can be sent for an interaction at a time
+        lock = getattr(messageable, "_send_interaction_response_lock", None) or _NO_LOCK
+        async with lock:
 
-            # Sent no responses but we want a message back - send a defer
-            if not messageable._sent_ack_response and wait:
-                await messageable.defer(ephemeral=ephemeral)
+            # Send a response if it's an interaction
+            if isinstance(channel, (list, tuple)):
 
-            # Sent no responses but we don't want a message object back from Discord
-            elif not messageable._sent_ack_response:
-                r = discord.http.Route('POST', '/interactions/{interaction_id}/{token}/callback', interaction_id=channel[0], token=channel[2])
+                # Sent no responses but we want a message back - send a defer
+                if not messageable._sent_ack_response and wait:
+                    await messageable.defer(ephemeral=ephemeral)
 
-            # A fallback for if someone says no wait but they HAVE sent an ack
-            else:
-                r = discord.http.Route('POST', '/webhooks/{app_id}/{token}', app_id=channel[1], token=channel[2])
+                # Sent no responses but we don't want a message object back from Discord
+                elif not messageable._sent_ack_response:
+                    r = discord.http.Route('POST', '/interactions/{interaction_id}/{token}/callback', interaction_id=channel[0], token=channel[2])
+
+                # A fallback for if someone says no wait but they HAVE sent an ack
+                else:
+                    r = discord.http.Route('POST', '/webhooks/{app_id}/{token}', app_id=channel[1], token=channel[2])
 
-            # Sent a defer that we should edit
-            if wait and messageable.ACK_IS_EDITABLE and messageable._sent_ack_response and not messageable._sent_message_response:
-                r = discord.http.Route('PATCH', '/webhooks/{app_id}/{token}/messages/@original', app_id=channel[1], token=channel[2])
+                # Sent a defer that we should edit
+                if wait and messageable.ACK_IS_EDITABLE and messageable._sent_ack_response and not messageable._sent_message_response:
+                    r = discord.http.Route('PATCH', '/webhooks/{app_id}/{token}/messages/@original', app_id=channel[1], token=channel[2])
 
-            # Sent a defer and a response, or sent a defer with no editable original message
-            elif wait:
-                r = discord.http.Route('POST', '/webhooks/{app_id}/{token}', app_id=channel[1], token=channel[2])
+                # Sent a defer and a response, or sent a defer with no editable original message
+                elif wait:
+                    r = discord.http.Route('POST', '/webhooks/{app_id}/{token}', app_id=channel[1], token=channel[2])
 
-        # Send a response if it's a channel
-        else:
-            r = discord.http.Route('POST', '/channels/{channel_id}/messages', channel_id=channel.id)
-
-        # Build a payload to send
-        payload = {}
-        if content:
-            payload['content'] = content
-        if tts:
-            payload['tts'] = True
-        if embeds:
-            payload['embeds'] = embeds
-        if nonce:
-            payload['nonce'] = nonce
-        if allowed_mentions:
-            payload['allowed_mentions'] = allowed_mentions
-        if reference:
-            payload['message_reference'] = reference
-        if components:
-            payload['components'] = components
-        if ephemeral:
-            if not getattr(messageable, "CAN_SEND_EPHEMERAL", False):
-                raise ValueError("Cannot send ephemeral messages with type {0.__class__}".format(messageable))
-            payload['flags'] = discord.message.MessageFlags(ephemeral=True).value
-
-        # Send the HTTP requests, including files
-        if files is not None:
-            form = []
-            form.append({'name': 'payload_json', 'value': discord.utils.to_json(payload)})
-            try:
-                if len(files) == 1:
-                    file = files[0]
-                    form.append(
-                        {
-                            'name': 'file', 'value': file.fp,
-                            'filename': file.filename, 'content_type': 'application/octet-stream',
-                        }
-                    )
-                else:
-                    for index, file in enumerate(files):
+            # Send a response if it's a channel
+            else:
+                r = discord.http.Route('POST', '/channels/{channel_id}/messages', channel_id=channel.id)
+
+            # Build a payload to send
+            payload = {}
+            if content:
+                payload['content'] = content
+            if tts:
+                payload['tts'] = True
+            if embeds:
+                payload['embeds'] = embeds
+            if nonce:
+                payload['nonce'] = nonce
+            if allowed_mentions:
+                payload['allowed_mentions'] = allowed_mentions
+            if reference:
+                payload['message_reference'] = reference
+            if components:
+                payload['components'] = components
+            if ephemeral:
+                if not getattr(messageable, "CAN_SEND_EPHEMERAL", False):
+                    raise ValueError("Cannot send ephemeral messages with type {0.__class__}".format(messageable))
+                payload['flags'] = discord.message.MessageFlags(ephemeral=True).value
+
+            # Send the HTTP requests, including files
+            if files is not None:
+                form = []
+                form.append({'name': 'payload_json', 'value': discord.utils.to_json(payload)})
+                try:
+                    if len(files) == 1:
+                        file = files[0]
                         form.append(
                             {
-                                'name': f'file{index}', 'value': file.fp,
+                                'name': 'file', 'value': file.fp,
                                 'filename': file.filename, 'content_type': 'application/octet-stream',
                             }
                         )
-                response_data = await messageable._state.http.request(r, form=form, files=files)
-            finally:
-                for f in files:
-                    f.close()
-        else:
-            if wait is False and messageable._sent_ack_response is False:
-                payload = {"type": _no_wait_response_type, "data": payload.copy()}
-            response_data = await messageable._state.http.request(r, json=payload)
+                    else:
+                        for index, file in enumerate(files):
+                            form.append(
+                                {
+                                    'name': f'file{index}', 'value': file.fp,
+                                    'filename': file.filename, 'content_type': 'application/octet-stream',
+                                }
+                            )
+                    response_data = await messageable._state.http.request(r, form=form, files=files)
+                finally:
+                    for f in files:
+                        f.close()
+            else:
+                if wait is False and messageable._sent_ack_response is False:
+                    payload = {"type": _no_wait_response_type, "data": payload.copy()}
+                response_data = await messageable._state.http.request(r, json=payload)
 
-        # Set the attributes for the interactions
-        try:
-            messageable._sent_ack_response = True
-        except AttributeError:
-            pass
-        try:
-            messageable._sent_message_response = True
-        except AttributeError:
-            pass
+            # Set the attributes for the interactions
+            try:
+                messageable._sent_ack_response = True
+            except AttributeError:
+                pass
+            try:
+                messageable._sent_message_response = True
+            except AttributeError:
+                pass
 
-        # See if we want to respond with anything
-        if wait is False:
-            return
+            # See if we want to respond with anything
+            if wait is False:
+                if _no_wait_response_type == 7 and getattr(messageable, "message", None) is not None:
+                    self.message_states.invalidate(messageable.message.id)
+                return
 
-        # Make the message object
-        if isinstance(channel, (list, tuple)):
-            webhook = discord.Webhook.partial(channel[1], channel[2], adapter=discord.AsyncWebhookAdapter(session=self.session))
-            webhook._state = self._connection
-            partial_webhook_state = discord.webhook._PartialWebhookState(webhook._adapter, webhook, parent=webhook._state)
-            ret = ComponentWebhookMessage(data=response_data, state=partial_webhook_state, channel=messageable.channel)
-        else:
-            # ret = state.create_message(channel=channel, data=response_data)
-            ret = ComponentMessage(state=state, channel=channel, data=response_data)
+            # Make the message object
+            if isinstance(channel, (list, tuple)):
+                partial_webhook_state = self._get_interaction_webhook_state(channel[1], channel[2])
+                ret = ComponentWebhookMessage(data=response_data, state=partial_webhook_state, channel=messageable.channel)
+            else:
+                # ret = state.create_message(channel=channel, data=response_data)
+                ret = ComponentMessage(state=state, channel=channel, data=response_data)
+            self.message_states.set(ret.id, payload, replace=True)
 
         # See if we want to delete the message
-        lock.release()
         if delete_after is not None:
             await ret.delete(delay=delete_after)
 
@@ -655,6 +852,12 @@ class MinimalBot(commands.AutoShardedBot):
         else:
             fields['attachments'] = [a.to_dict() for a in attachments]
 
+        # Only send the fields that have changed since we last sent the message, and skip
+        # the edit entirely if nothing has (allowed mentions don't matter without content)
+        fields = self.message_states.diff(message.id, fields)
+        if not fields.keys() - {'allowed_mentions'}:
+            fields = {}
+
         # Edit the message
         if fields:
             if isinstance(message, discord.WebhookMessage):
@@ -666,12 +869,38 @@ class MinimalBot(commands.AutoShardedBot):
                 response_data = await message._state.http.request(r, json=fields)
             else:
                 response_data = await message._state.http.edit_message(message.channel.id, message.id, **fields)
+            self.message_states.set(message.id, fields)
             message._update(response_data)
 
         # See if we should delete the message
         if delete_after is not None:
             await message.delete(delay=delete_after)
 
+    async def wait_for_component_interaction(
+            self, message: typing.Union[discord.Message, int], *, custom_id: str = None,
+            check: typing.Callable = None, timeout: float = None):
+        """
+        Wait for a component interaction on a given message. This goes through the bot's
+        :attr:`component_router`, so only the checks for waiters on the clicked message are run.
+
+        Args:
+            message (typing.Union[discord.Message, int]): The message (or message ID) to wait for
+                an interaction on.
+            custom_id (str, optional): The custom ID of the component to wait for. If not given,
+                any component on the message will do.
+            check (typing.Callable, optional): An additional check that the payload needs to pass.
+            timeout (float, optional): How long to wait for.
+
+        Returns:
+            ComponentInteractionPayload: The interaction payload.
+
+        Raises:
+            asyncio.TimeoutError: Nothing passed the check within the timeout.
+        """
+
+        message_id = message if isinstance(message, int) else message.id
+        return await self.component_router.wait_for(message_id, custom_id=custom_id, check=check, timeout=timeout)
+
     async def _wait_for_button_message(self, message, *, check=None, timeout=None):
         """
         Wait for an interaction on a button.
@@ -679,13 +908,7 @@ class MinimalBot(commands.AutoShardedBot):
         :meta private:
         """
 
-        message_check = lambda payload: payload.message.id == message.id
-        if check:
-            original_check = check
-            check = lambda payload: original_check(payload) and message_check(payload)
-        else:
-            check = message_check
-        return await self.wait_for("component_interaction", check=check, timeout=timeout)
+        return await self.wait_for_component_interaction(message, check=check, timeout=timeout)
 
 
 class Bot(MinimalBot):
@@ -702,6 +925,11 @@ class Bot(MinimalBot):
             from your :class:`config file<BotConfig.database>`.
         redis (RedisConnection): The redis connector, as connected using the data from your
             :class:`config file<BotConfig.redis>`.
+        rpc (RedisRPC): The cross-cluster RPC layer, running over the Redis connection. Only started
+            if Redis is enabled in your :class:`config file<BotConfig.redis>`.
+        vote_cache (TopggVoteCache): A cache of users' Top.gg vote statuses.
+        component_state (ComponentStateStore): A store for persistent component state, kept in Redis or
+            the database (whichever is enabled).
         stats (StatsdConnection): The stats connector, as connected using the data from your
             :class:`config file<BotConfig.statsd>`. May not be authenticated, but will fail silently
             if not.
@@ -713,12 +941,20 @@ class Bot(MinimalBot):
             so it just here as a provided convenience.
         upgrade_chat (upgradechat.UpgradeChat): An UpgradeChat connector instance using the oauth information
             provided in your :class:`config file<BotConfig.upgrade_chat>`.
+        upgrade_chat_cache (UpgradeChatEntitlementCache): A cache of the products that users have bought
+            via Upgrade.Chat.
+        support_team (SupportTeamIndex): An index of the members of the bot's support team.
+        event_webhooks (EventWebhookSender): A batched, rate limited sender for the
+            :class:`event webhooks<BotConfig.event_webhook>`.
         clean_prefix (str): The default prefix for the bot.
         owner_ids (typing.List[int]): A list of the owners from the :attr:`config file<BotConfig.owners>`.
         embeddify (bool): Whether or not messages should be embedded by default, as set in the
             :attr:`config file<BotConfig.embed.enabled>`.
     """
 
+    PRESENCE_UPDATE_RATE = 5  #: The number of presence updates each shard can send in a period.
+    PRESENCE_UPDATE_PER = 60.0  #: The period that presence updates are limited over, in seconds.
+
     def __init__(
             self, config_file: str = 'config/config.toml', logger: logging.Logger = None,
             activity: discord.Activity = discord.Game(name="Reconnecting..."),
@@ -778,6 +1014,15 @@ class Bot(MinimalBot):
         # Allow redis connections like this
         self.redis: RedisConnection = RedisConnection
 
+        # Allow cross-cluster calls over redis like this
+        self.rpc: RedisRPC = RedisRPC(self)
+
+        # A cache for Top.gg votes
+        self.vote_cache: TopggVoteCache = TopggVoteCache(self)
+
+        # Somewhere to store state for persistent components
+        self.component_state: interactions.ComponentStateStore = interactions.ComponentStateStore(self)
+
         # Allow Statsd connections like this
         self.stats: StatsdConnection = StatsdConnection
         self.stats.config = self.config.get('statsd', {})
@@ -785,6 +1030,17 @@ class Bot(MinimalBot):
         # Gently add an UpgradeChat wrapper here - added as a property method so we can create a new instance if
         # the config is reloaded
         self._upgrade_chat = None
+        self.upgrade_chat_cache: UpgradeChatEntitlementCache = UpgradeChatEntitlementCache(self)
+
+        # An index of the members of the support team
+        self.support_team: SupportTeamIndex = SupportTeamIndex(self)
+
+        # Whether or not the bot can embed in each channel, and the weighted footer pool
+        self.embed_permissions: EmbedPermissionCache = EmbedPermissionCache(self)
+        self._footer_pool: typing.Optional[tuple] = None
+
+        # A batched sender for the event webhooks
+        self.event_webhooks: EventWebhookSender = EventWebhookSender(self)
 
         # Store the startup method so I can see if it completed successfully
         self.startup_method = None
@@ -799,6 +1055,13 @@ class Bot(MinimalBot):
         self.guild_settings = collections.defaultdict(lambda: copy.deepcopy(self.DEFAULT_GUILD_SETTINGS))
         self.user_settings = collections.defaultdict(lambda: copy.deepcopy(self.DEFAULT_USER_SETTINGS))
 
+        # The last presence set for each shard, so we don't send duplicates
+        self._shard_presences = {}
+        self._presence_ratelimiters = collections.defaultdict(
+            lambda: PresenceRatelimiter(self.PRESENCE_UPDATE_RATE, self.PRESENCE_UPDATE_PER)
+        )
+        self.add_listener(self._clear_shard_presence, 'on_shard_connect')
+
     async def startup(self):
         """
         Clears the custom caches for the bot (:attr:`guild_settings` and :attr:`user_settings`),
@@ -984,8 +1247,10 @@ class Bot(MinimalBot):
         """
         Returns whether or not the user has voted on Top.gg. If there's no Top.gg token
         provided in your :attr:`config file<BotConfig.bot_listing_api_keys.topgg_token>`
-        then this will always return `False`. This method doesn't handle timeouts or
-        errors in their API (such as outages); you are expected to handle them yourself.
+        and the :attr:`vote webhook<BotConfig.bot_listing_api_keys.topgg_webhook_enabled>`
+        isn't enabled then this will always return `False`. Results are cached in the bot's
+        :attr:`vote cache<vote_cache>`. This method doesn't handle timeouts in their API
+        (such as outages); you are expected to handle them yourself.
 
         Args:
             user_id (int): The ID of the user you want to check.
@@ -994,23 +1259,36 @@ class Bot(MinimalBot):
             bool: Whether or not that user has registered a vote on Top.gg.
         """
 
-        # Make sure there's a token provided
+        # Make sure there's a token provided or that votes are being pushed to us
         topgg_token = self.config.get('bot_listing_api_keys', {}).get('topgg_token')
-        if not topgg_token:
+        if not topgg_token and not self.vote_cache.webhook_enabled:
             return False
+        return await self.vote_cache.get(user_id)
+
+    async def _fetch_user_topgg_vote(self, user_id: int) -> typing.Optional[bool]:
+        """
+        Asks Top.gg whether or not a user has voted.
+
+        Returns:
+            typing.Optional[bool]: Whether or not that user has registered a vote on Top.gg, or
+            :code:`None` if Top.gg didn't give us a valid response.
+
+        :meta private:
+        """
 
         # Try and see whether the user has voted
+        topgg_token = self.config.get('bot_listing_api_keys', {}).get('topgg_token')
         url = "https://top.gg/api/bots/{bot.user.id}/check".format(bot=self)
         async with self.session.get(url, params={"userId": user_id}, headers={"Authorization": topgg_token}) as r:
             try:
                 data = await r.json()
             except Exception:
-                return False
+                return None
             if r.status != 200:
-                return False
+                return None
 
         # Return
-        return data.get("voted", False)
+        return bool(data.get("voted", False))
 
     def get_event_webhook(self, event_name: str) -> typing.Optional[discord.Webhook]:
         """
@@ -1064,7 +1342,8 @@ class Bot(MinimalBot):
             self, message: discord.Message, valid_users: typing.List[discord.User] = None, *,
             delete: typing.List[discord.Message] = None, timeout: float = 60.0, wait: bool = False) -> None:
         """
-        Adds a delete reaction to the given message.
+        Adds a delete reaction to the given message. Reactions are tracked by the bot's
+        :attr:`delete reaction tracker<delete_reactions>`, so this works for uncached messages.
 
         Args:
             message (discord.Message): The message you want to add a delete reaction to.
@@ -1077,12 +1356,30 @@ class Bot(MinimalBot):
             discord.HTTPException: The bot was unable to add a delete reaction to the message.
         """
 
-        # See if we want to make this as a task or not
+        # See if we want to wait for the reaction to be used - if not, we only need a task while we
+        # add the reaction, as the tracker handles the rest
         if wait is False:
-            return self.loop.create_task(self.add_delete_reaction(
-                message=message, valid_users=valid_users, delete=delete, timeout=timeout, wait=True,
+            return self.loop.create_task(self._add_delete_reaction(
+                message=message, valid_users=valid_users, delete=delete, timeout=timeout,
             ))
 
+        # Wait for the tracker to delete the messages or time out
+        future = await self._add_delete_reaction(
+            message=message, valid_users=valid_users, delete=delete, timeout=timeout,
+        )
+        if future is not None:
+            await future
+
+    async def _add_delete_reaction(
+            self, message: discord.Message, valid_users: typing.List[discord.User] = None, *,
+            delete: typing.List[discord.Message] = None, timeout: float = 60.0) -> typing.Optional[asyncio.Future]:
+        """
+        Add a delete reaction to the given message and start tracking it, returning the tracker's
+        future (or :code:`None` if no reaction was added).
+
+        :meta private:
+        """
+
         # See if we were given a list of authors
         # This is an explicit check for None rather than just a falsy value;
         # this way users can still provide an empty list for only manage_messages users to be
@@ -1092,54 +1389,27 @@ class Bot(MinimalBot):
 
         # Let's not add delete buttons to DMs
         if isinstance(message.channel, discord.DMChannel):
-            return
+            return None
 
         # Add reaction
         try:
-            await message.add_reaction("\N{WASTEBASKET}")
+            await message.add_reaction(self.delete_reactions.EMOJI)
         except discord.HTTPException as e:
             raise e  # Maybe return none here - I'm not sure yet.
 
         # Fix up arguments
         if not isinstance(valid_users, (list, tuple, set)):
             valid_users = (valid_users,)
-
-        # Wait for response
-        def check(r, u) -> bool:
-            if r.message.id != message.id:
-                return False
-            if u.bot is True:
-                return False
-            if isinstance(u, discord.Member) is False:
-                return False
-            if getattr(u, 'roles', None) is None:
-                return False
-            if str(r.emoji) != "\N{WASTEBASKET}":
-                return False
-            if u.id in [user.id for user in valid_users] or u.permissions_in(message.channel).manage_messages:
-                return True
-            return False
-        try:
-            await self.wait_for("reaction_add", check=check, timeout=timeout)
-        except asyncio.TimeoutError:
-            try:
-                return await message.remove_reaction("\N{WASTEBASKET}", self.user)
-            except Exception:
-                return
-
-        # We got a response
         if delete is None:
             delete = (message,)
 
-        # Try and bulk delete
-        bulk = False
-        if message.guild:
-            permissions: discord.Permissions = message.channel.permissions_for(message.guild.me)
-            bulk = permissions.manage_messages and permissions.read_message_history
-        try:
-            await message.channel.purge(check=lambda m: m.id in [i.id for i in delete], bulk=bulk)
-        except Exception:
-            return  # Ah well
+        # And start tracking it
+        return self.delete_reactions.track(
+            message,
+            valid_user_ids=(i.id for i in valid_users),
+            delete_ids=(i.id for i in delete),
+            timeout=timeout,
+        )
 
     def set_footer_from_config(self, embed: discord.Embed) -> None:
         """
@@ -1150,24 +1420,30 @@ class Bot(MinimalBot):
             embed (discord.Embed): The embed that you want to set a footer on.
         """
 
-        pool = []
-        for data in self.config.get('embed', dict()).get('footer', list()):
-            safe_data = data.copy()
-            amount = safe_data.pop('amount')
-            if amount <= 0:
-                continue
-            text = safe_data.pop('text')
-            text = text.format(ctx=self)
-            safe_data['text'] = text
-            for _ in range(amount):
-                pool.append(safe_data.copy())
-        if not pool:
+        # Build the weighted pool, reusing it until the config is changed
+        footers = self.config.get('embed', dict()).get('footer', list())
+        if self._footer_pool is None or self._footer_pool[0] is not footers:
+            choices, weights = [], []
+            for data in footers:
+                safe_data = data.copy()
+                amount = safe_data.pop('amount')
+                if amount <= 0:
+                    continue
+                choices.append(safe_data)
+                weights.append(amount)
+            self._footer_pool = (footers, choices, weights,)
+        _, choices, weights = self._footer_pool
+        if not choices:
             return
+
+        # Pick one and format it
+        footer = random.choices(choices, weights=weights)[0].copy()
+        footer['text'] = footer['text'].format(ctx=self)
         try:
             avatar_url = self.user.avatar_url
         except AttributeError:
             avatar_url = embed.Empty
-        embed.set_footer(**random.choice(pool), icon_url=avatar_url)
+        embed.set_footer(**footer, icon_url=avatar_url)
 
     @property
     def clean_prefix(self):
@@ -1249,8 +1525,9 @@ class Bot(MinimalBot):
         include_shard_id = presence.get("include_shard_id", False)  # Whether or not to include shard IDs
         activity_type = getattr(discord.ActivityType, activity_type_str, discord.ActivityType.playing)  # The activity type to use
 
-        # Update per shard
-        for i in self.shard_ids or [0]:
+        # Work out what each shard's activity should be
+        presence_updates = []
+        for i in ([shard_id] if shard_id is not None else self.shard_ids or [0]):
 
             # Update the config text
             config_text = presence.get("text", "").format(bot=self).strip()
@@ -1264,9 +1541,64 @@ class Bot(MinimalBot):
                 activity = discord.Activity(name=config_text, type=activity_type)
             else:
                 activity = None
+            presence_updates.append(self._change_shard_presence(i, activity=activity, status=status))
+
+        # Update the presence on every shard at once
+        await asyncio.gather(*presence_updates)
+
+    async def change_presence(
+            self, *, activity: discord.BaseActivity = None, status: discord.Status = None,
+            afk: bool = False, shard_id: int = None) -> None:
+        """
+        Changes the bot's presence. Unlike the original method, this updates every shard concurrently
+        (each within its own presence rate limit), and skips any shard whose presence is already
+        the one given.
+
+        Args:
+            activity (discord.BaseActivity, optional): The activity being done.
+            status (discord.Status, optional): The status of the bot.
+            afk (bool, optional): Whether or not the bot is AFK.
+            shard_id (int, optional): The shard to change the presence of. If not given, every shard
+                is changed.
+        """
+
+        if shard_id is not None:
+            return await self._change_shard_presence(shard_id, activity=activity, status=status, afk=afk)
+        await asyncio.gather(*[
+            self._change_shard_presence(i, activity=activity, status=status, afk=afk)
+            for i in self.shards
+        ])
+
+    async def _change_shard_presence(
+            self, shard_id: int, *, activity: discord.BaseActivity = None, status: discord.Status = None,
+            afk: bool = False) -> None:
+        """
+        Change the presence of a single shard, skipping it if nothing's changed.
+        """
+
+        # See if it's the same as what we've already got
+        presence_key = (activity.to_dict() if activity else None, str(status), afk)
+        if self._shard_presences.get(shard_id) == presence_key:
+            self.logger.debug(f"Skipping unchanged presence update for shard {shard_id}")
+            return
+        self._shard_presences[shard_id] = presence_key
 
-            # Update the presence
-            await self.change_presence(activity=activity, status=status, shard_id=i)
+        # Wait for our rate limit, and make sure we haven't been overridden by a newer update while we waited
+        try:
+            async with self._presence_ratelimiters[shard_id]:
+                if self._shard_presences.get(shard_id) != presence_key:
+                    return
+                await super().change_presence(activity=activity, status=status, afk=afk, shard_id=shard_id)
+        except Exception:
+            self._shard_presences.pop(shard_id, None)
+            raise
+
+    async def _clear_shard_presence(self, shard_id: int) -> None:
+        """
+        A new gateway connection resets the shard's presence, so we can't skip the next update.
+        """
+
+        self._shard_presences.pop(shard_id, None)
 
     def reload_config(self) -> None:
         """
@@ -1306,10 +1638,20 @@ class Bot(MinimalBot):
         else:
             self.logger.info("Not running bot startup method due to database being disabled")
 
+        # Start listening for cross-cluster calls
+        if self.config.get('redis', {}).get('enabled', False):
+            self.rpc.start()
+            self.vote_cache.start()
+
+        # Keep our Upgrade.Chat subscribers up to date
+        if self.config.get('upgrade_chat', {}).get('client_id'):
+            self.upgrade_chat_cache.start()
+
+        # Index our support team once we're ready
+        self.support_team.start()
+
         # Get the recommended shard count for this bot
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://discord.com/api/v9/gateway/bot", headers={"Authorization": f"Bot {self.config['token']}"}) as r:
-                data = await r.json()
+        data = await self.get_gateway_bot()
         recommended_shard_count = data['shards']
         self.logger.info(f"Recommended shard count for this bot: {recommended_shard_count}")
         if recommended_shard_count / 2 > self.shard_count:
@@ -1322,9 +1664,31 @@ class Bot(MinimalBot):
         self.logger.info("Running original D.py start method")
         await super().start(token or self.config['token'], *args, **kwargs)
 
+    async def get_gateway_bot(self, *, force_refresh: bool = False) -> dict:
+        """
+        Gets the bot's gateway information (recommended shard count, session start limits, etc).
+        This is cached in Redis if it's enabled, or on the local disk otherwise, so that multiple
+        processes starting at once all share the one request.
+
+        Args:
+            force_refresh (bool, optional): Whether or not to ignore any cached data.
+
+        Returns:
+            dict: The data from Discord's :code:`/gateway/bot` endpoint.
+        """
+
+        return await get_gateway_bot(self.config['token'], session=self.session, force_refresh=force_refresh)
+
     async def close(self, *args, **kwargs):
         """:meta private:"""
 
+        if self.config.get('redis', {}).get('enabled', False):
+            self.logger.debug("Stopping cross-cluster RPC")
+            await self.rpc.stop()
+            await self.vote_cache.stop()
+        self.upgrade_chat_cache.stop()
+        self.support_team.stop()
+        self.event_webhooks.stop()
         self.logger.debug("Closing aiohttp ClientSession")
         await asyncio.wait_for(self.session.close(), timeout=None)
         self.logger.debug("Running original D.py logout method")
@@ -1367,14 +1731,10 @@ class Bot(MinimalBot):
             should_not_embed = True
         else:
             try:
-                try:
-                    messageable_channel = messageable.channel
-                except AttributeError:
-                    messageable_channel = messageable
-                channel_permissions: discord.Permissions = messageable_channel.permissions_for(messageable.guild.me)
-                missing_embed_permission = not discord.Permissions(embed_links=True).is_subset(channel_permissions)
+                messageable_channel = messageable.channel
             except AttributeError:
-                missing_embed_permission = False
+                messageable_channel = messageable
+            missing_embed_permission = not self.embed_permissions.can_embed(messageable_channel)
             should_not_embed = any([
                 missing_embed_permission,
                 embeddify is False,
@@ -1452,16 +1812,17 @@ class Bot(MinimalBot):
         Launch all of the shards using the shard manager.
         """
 
+        # Get the shard count from our cached gateway info so D.py doesn't ask for it again
+        if self.shard_count is None:
+            self.shard_count = (await self.get_gateway_bot())['shards']
+
         # If we don't have redis, let's just ignore the shard manager
         shard_manager_enabled = self.config.get('shard_manager', {}).get('enabled', False)
         if not shard_manager_enabled:
             return await super().launch_shards()
 
         # Get the gateway
-        if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+        gateway = await self.http.get_gateway()
 
         # Set the shard count
         self._connection.shard_count = self.shard_count
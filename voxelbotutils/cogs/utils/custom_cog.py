@@ -46,7 +46,9 @@ class Cog(OriginalCog):
         else:
             self.logger = bot_logger.getChild(self.get_logger_name())
 
-        # Add the cog instance to redis channel handlers
+        # Add the cog instance to redis channel handlers, and grab our raw listeners
+        self.__raw_listeners__ = []
+        self.__component_handlers__ = []
         for attr in dir(self):
             try:
                 item = getattr(self, attr)
@@ -54,6 +56,78 @@ class Cog(OriginalCog):
                 continue
             if isinstance(item, RedisChannelHandler):
                 item.cog = self
+            for event_type in getattr(item, "__vbu_raw_listener_events__", ()):
+                self.__raw_listeners__.append((event_type, item))
+            prefix = getattr(item, "__vbu_component_handler_prefix__", None)
+            if prefix is not None and callable(item):
+                self.__component_handlers__.append((prefix, item))
+
+    @classmethod
+    def raw_listener(cls, *event_types: str):
+        """
+        A decorator that marks a method as a raw gateway event listener. Unlike a listener for
+        :code:`on_socket_response`, it's only called for the given event types.
+
+        Examples:
+
+            ::
+
+                @voxelbotutils.Cog.raw_listener("GUILD_MEMBER_UPDATE")
+                async def raw_member_update(self, payload: dict):
+                    self.logger.info(payload['d'])
+
+        Args:
+            *event_types (str): The gateway event types to listen for. If none are given,
+                the method is called for every event.
+        """
+
+        def decorator(func):
+            actual = func
+            if isinstance(actual, staticmethod):
+                actual = actual.__func__
+            actual.__vbu_raw_listener_events__ = event_types or (None,)
+            return func
+        return decorator
+
+    @classmethod
+    def component_handler(cls, prefix: str):
+        """
+        A decorator that marks a method as a persistent handler for components whose custom IDs
+        were made via :func:`voxelbotutils.make_custom_id` with the given prefix. As the handler
+        is looked up by custom ID, clicks can be handled by any process, even after a restart, and
+        nothing is held in memory while the component waits to be clicked.
+
+        Examples:
+
+            ::
+
+                @voxelbotutils.Cog.component_handler("LEADERBOARD")
+                async def leaderboard_page(self, payload, guild_id: str, page: str):
+                    await payload.update_message(**await self.get_leaderboard_page(int(guild_id), int(page)))
+
+        Args:
+            prefix (str): The prefix of the custom IDs that this handles.
+        """
+
+        def decorator(func):
+            func.__vbu_component_handler_prefix__ = prefix
+            return func
+        return decorator
+
+    def _inject(self, bot):
+        cog = super()._inject(bot)
+        for event_type, method in getattr(self, "__raw_listeners__", ()):
+            bot.add_raw_event_handler(event_type, method)
+        for prefix, method in getattr(self, "__component_handlers__", ()):
+            bot.component_router.add_handler(prefix, method)
+        return cog
+
+    def _eject(self, bot):
+        for event_type, method in getattr(self, "__raw_listeners__", ()):
+            bot.remove_raw_event_handler(event_type, method)
+        for prefix, method in getattr(self, "__component_handlers__", ()):
+            bot.component_router.remove_handler(prefix)
+        super()._eject(bot)
 
     def get_logger_name(self, *prefixes, sep: str = '.') -> str:
         """
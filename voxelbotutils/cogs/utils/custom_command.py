@@ -51,6 +51,20 @@ class Command(commands.Command):
             raise ValueError("No mapping found for cooldown")
         self._buckets = mapping(cooldown)  # Wrap the cooldown in the mapping
 
+    @property
+    def _buckets(self) -> commands.CooldownMapping:
+        """:meta private:"""
+
+        return self._cooldown_buckets
+
+    @_buckets.setter
+    def _buckets(self, value: commands.CooldownMapping):
+        # Give the mapping a namespace whenever it's set (including by the cooldown decorator)
+        # so that different commands don't share buckets in shared storage
+        if getattr(value, 'namespace', False) is None:
+            value.namespace = f"{self.callback.__module__}.{self.callback.__qualname__}"
+        self._cooldown_buckets = value
+
     def get_remaining_cooldown(self, ctx: commands.Context, current: float = None) -> typing.Optional[float]:
         """
         Gets the remaining cooldown for a given command.
@@ -81,7 +95,10 @@ class Command(commands.Command):
             except AttributeError:
                 ctx.bot.logger.critical(f"Invalid cooldown set on command {ctx.invoked_with}")
                 raise commands.CheckFailure("Invalid cooldown set for this command")
-            retry_after = bucket.update_rate_limit(current)
+            if hasattr(self._buckets, 'acquire'):
+                retry_after = await self._buckets.acquire(ctx.message, bucket, current)
+            else:
+                retry_after = bucket.update_rate_limit(current)
             if retry_after:
                 try:
                     error = bucket.error
@@ -185,6 +202,20 @@ class Group(commands.Group):
             raise ValueError("No mapping found for cooldown")
         self._buckets = mapping(cooldown)  # Wrap the cooldown in the mapping
 
+    @property
+    def _buckets(self) -> commands.CooldownMapping:
+        """:meta private:"""
+
+        return self._cooldown_buckets
+
+    @_buckets.setter
+    def _buckets(self, value: commands.CooldownMapping):
+        # Give the mapping a namespace whenever it's set (including by the cooldown decorator)
+        # so that different commands don't share buckets in shared storage
+        if getattr(value, 'namespace', False) is None:
+            value.namespace = f"{self.callback.__module__}.{self.callback.__qualname__}"
+        self._cooldown_buckets = value
+
     async def can_run(self, ctx: commands.Context) -> bool:
         """
         The normal :func:`discord.ext.Command.can_run` but it ignores cooldowns.
@@ -28,6 +28,8 @@ class Context(commands.Context):
             the bot's `sudo` command, if you want to check the original author.
         clean_prefix (str): A clean version of the prefix that the command was invoked with.
         is_interaction (bool): Whether or not the context was invoked via an interaction
+        resolved (typing.Optional[voxelbotutils.interactions.InteractionResolved]): The users, members, roles,
+            and channels that were sent with the interaction, if the context was invoked via a slash command.
     """
 
     CAN_SEND_EPHEMERAL = False
@@ -37,6 +39,7 @@ class Context(commands.Context):
         self.original_author_id = self.author.id
         self.is_slash_command = False
         self.is_interaction = False
+        self.resolved = None
         self._send_interaction_response_task = None
 
     async def okay(self) -> None:
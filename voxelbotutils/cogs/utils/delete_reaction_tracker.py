@@ -0,0 +1,232 @@
+import asyncio
+import heapq
+import typing
+
+import discord
+
+
+class TrackedDeleteReaction(typing.NamedTuple):
+    """
+    A message that has a delete reaction on it.
+
+    :meta private:
+    """
+
+    channel_id: int
+    valid_user_ids: typing.FrozenSet[int]
+    delete_ids: typing.Tuple[int]
+    expires_at: float
+    future: asyncio.Future
+
+
+class DeleteReactionTracker(object):
+    """
+    Tracks the messages that have had a delete reaction added via :func:`voxelbotutils.Bot.add_delete_reaction`.
+
+    Rather than each message waiting on its own :code:`wait_for("reaction_add")` (and so every reaction
+    running every message's check), tracked messages are kept in an index by message ID that's looked up
+    from a single raw reaction handler, so it works for uncached messages too. Expiry is handled by a single
+    timer over a heap of expiry times. Provided in your bot object at :attr:`voxelbotutils.MinimalBot.delete_reactions`.
+    """
+
+    EMOJI: str = "\N{WASTEBASKET}"
+
+    def __init__(self, bot):
+        """:meta private:"""
+
+        self.bot = bot
+        self._tracked: typing.Dict[int, TrackedDeleteReaction] = {}
+        self._expiry_heap: typing.List[typing.Tuple[float, int]] = []
+        self._expiry_timer: typing.Optional[asyncio.TimerHandle] = None
+        self._expiry_timer_when: typing.Optional[float] = None
+
+        # Listen for the raw events
+        bot.add_raw_event_handler("MESSAGE_REACTION_ADD", self._handle_reaction_add)
+        bot.add_raw_event_handler("MESSAGE_DELETE", self._handle_message_delete)
+        bot.add_raw_event_handler("MESSAGE_DELETE_BULK", self._handle_message_delete)
+
+    @property
+    def tracked_count(self) -> int:
+        """
+        The number of messages that are currently being tracked.
+        """
+
+        return len(self._tracked)
+
+    def track(
+            self, message: discord.Message, valid_user_ids: typing.Iterable[int],
+            delete_ids: typing.Iterable[int], timeout: float) -> asyncio.Future:
+        """
+        Start tracking a message for its delete reaction.
+
+        Args:
+            message (discord.Message): The message that the delete reaction was added to.
+            valid_user_ids (typing.Iterable[int]): The IDs of the users who can use the reaction.
+            delete_ids (typing.Iterable[int]): The IDs of the messages to delete when the reaction is used.
+            timeout (float): How long to track the message for.
+
+        Returns:
+            asyncio.Future: A future that's set to :code:`True` when the messages are deleted, or
+            :code:`False` when the tracking times out.
+        """
+
+        # Replace any existing tracking for the message
+        self._pop(message.id, False)
+
+        # Add to the index and to the heap
+        loop = self.bot.loop
+        expires_at = loop.time() + timeout
+        future = loop.create_future()
+        self._tracked[message.id] = TrackedDeleteReaction(
+            channel_id=message.channel.id,
+            valid_user_ids=frozenset(valid_user_ids),
+            delete_ids=tuple(delete_ids),
+            expires_at=expires_at,
+            future=future,
+        )
+        heapq.heappush(self._expiry_heap, (expires_at, message.id))
+        self._schedule_expiry()
+        return future
+
+    def _pop(self, message_id: int, result: bool = None) -> typing.Optional[TrackedDeleteReaction]:
+        """
+        Stop tracking a message, setting the result of its future if one is given.
+        """
+
+        tracked = self._tracked.pop(message_id, None)
+        if tracked is not None and result is not None and not tracked.future.done():
+            tracked.future.set_result(result)
+        return tracked
+
+    def _schedule_expiry(self) -> None:
+        """
+        Make sure that the expiry timer is set for the soonest expiry in the heap.
+        """
+
+        if not self._expiry_heap:
+            return
+        when = self._expiry_heap[0][0]
+        if self._expiry_timer is not None:
+            if self._expiry_timer_when <= when:
+                return
+            self._expiry_timer.cancel()
+        self._expiry_timer_when = when
+        self._expiry_timer = self.bot.loop.call_at(when, self._expire)
+
+    def _expire(self) -> None:
+        """
+        Stop tracking any messages that have expired and remove their delete reactions.
+        """
+
+        self._expiry_timer = None
+        self._expiry_timer_when = None
+        now = self.bot.loop.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, message_id = heapq.heappop(self._expiry_heap)
+
+            # Entries for messages that have been deleted or re-tracked are left in the heap, so
+            # make sure this one is still current
+            tracked = self._tracked.get(message_id)
+            if tracked is None or tracked.expires_at != expires_at:
+                continue
+            self._pop(message_id, False)
+            asyncio.ensure_future(self._remove_reaction(tracked.channel_id, message_id))
+        self._schedule_expiry()
+
+    async def _remove_reaction(self, channel_id: int, message_id: int) -> None:
+        """
+        Remove the bot's delete reaction from a message.
+        """
+
+        try:
+            await self.bot.http.remove_own_reaction(channel_id, message_id, self.EMOJI)
+        except discord.HTTPException:
+            pass
+
+    def _handle_message_delete(self, payload: dict) -> None:
+        """
+        Stop tracking messages that have been deleted.
+        """
+
+        data = payload['d']
+        for message_id in data.get('ids') or (data['id'],):
+            self._pop(int(message_id), False)
+
+    def _handle_reaction_add(self, payload: dict) -> None:
+        """
+        See if a reaction is a valid use of a tracked delete reaction, and delete its messages if so.
+        """
+
+        # See if it's a message we care about
+        data = payload['d']
+        message_id = int(data['message_id'])
+        tracked = self._tracked.get(message_id)
+        if tracked is None:
+            return
+        if data['emoji'].get('id') is not None or data['emoji'].get('name') != self.EMOJI:
+            return
+
+        # Delete reactions are only added in guilds, so we should have a member
+        member_data = data.get('member')
+        if member_data is None or member_data.get('user', {}).get('bot', False):
+            return
+
+        # See if they're allowed to use it
+        user_id = int(data['user_id'])
+        if user_id not in tracked.valid_user_ids and not self._can_manage_messages(data):
+            return
+
+        # Delete the messages
+        self._pop(message_id, True)
+        asyncio.ensure_future(self._delete_messages(tracked.channel_id, tracked.delete_ids))
+
+    def _can_manage_messages(self, data: dict) -> bool:
+        """
+        Work out if the member who added a reaction has the manage messages permission in its channel.
+        """
+
+        guild = self.bot.get_guild(int(data.get('guild_id') or 0))
+        if guild is None:
+            return False
+        channel = guild.get_channel(int(data['channel_id']))
+        if channel is None:
+            return False
+        member = guild.get_member(int(data['user_id']))
+        if member is None:
+            try:
+                member = discord.Member(data=data['member'], guild=guild, state=self.bot._connection)
+            except Exception:
+                return False
+        return channel.permissions_for(member).manage_messages
+
+    async def _delete_messages(self, channel_id: int, message_ids: typing.Tuple[int]) -> None:
+        """
+        Delete a set of messages by ID, in bulk if we can.
+        """
+
+        # Try and bulk delete
+        if len(message_ids) > 1:
+            channel = self.bot.get_channel(channel_id)
+            guild = getattr(channel, "guild", None)
+            bulk = True
+            if guild is not None:
+                permissions: discord.Permissions = channel.permissions_for(guild.me)
+                bulk = permissions.manage_messages
+            if bulk:
+                try:
+                    for index in range(0, len(message_ids), 100):
+                        chunk = message_ids[index:index + 100]
+                        if len(chunk) == 1:
+                            await self.bot.http.delete_message(channel_id, chunk[0])
+                        else:
+                            await self.bot.http.delete_messages(channel_id, chunk)
+                    return
+                except discord.HTTPException:
+                    message_ids = message_ids[index:]
+
+        # Delete them one by one
+        for message_id in message_ids:
+            try:
+                await self.bot.http.delete_message(channel_id, message_id)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,63 @@
+import typing
+
+
+class EmbedPermissionCache(object):
+    """
+    A cache of whether or not the bot can embed links in each channel, so that embeddifying a message
+    doesn't need to work out the bot's full channel permissions on every send. Entries are dropped
+    from raw events when a channel, the guild's roles, or the bot's own roles change.
+
+    :meta private:
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+        # guild_id: {channel_id: can embed}
+        self._cache: typing.Dict[int, typing.Dict[int, bool]] = {}
+
+        # Listen for the raw events
+        bot.add_raw_event_handler("CHANNEL_UPDATE", self._handle_channel_event)
+        bot.add_raw_event_handler("CHANNEL_DELETE", self._handle_channel_event)
+        bot.add_raw_event_handler("GUILD_CREATE", self._handle_guild_event)
+        bot.add_raw_event_handler("GUILD_UPDATE", self._handle_guild_event)
+        bot.add_raw_event_handler("GUILD_DELETE", self._handle_guild_event)
+        bot.add_raw_event_handler("GUILD_ROLE_UPDATE", self._handle_role_event)
+        bot.add_raw_event_handler("GUILD_ROLE_DELETE", self._handle_role_event)
+        bot.add_raw_event_handler("GUILD_MEMBER_UPDATE", self._handle_member_update)
+
+    def can_embed(self, channel) -> bool:
+        """
+        Whether or not the bot can embed links in a given channel. Channels outside of guilds
+        (or that we don't have the bot's member for) are assumed to be fine.
+        """
+
+        try:
+            guild = channel.guild
+            guild_cache = self._cache.get(guild.id)
+            if guild_cache is not None:
+                cached = guild_cache.get(channel.id)
+                if cached is not None:
+                    return cached
+            can_embed = channel.permissions_for(guild.me).embed_links
+        except AttributeError:
+            return True
+        self._cache.setdefault(guild.id, {})[channel.id] = can_embed
+        return can_embed
+
+    def _handle_channel_event(self, payload: dict) -> None:
+        data = payload['d']
+        guild_cache = self._cache.get(int(data.get('guild_id') or 0))
+        if guild_cache is not None:
+            guild_cache.pop(int(data['id']), None)
+
+    def _handle_guild_event(self, payload: dict) -> None:
+        self._cache.pop(int(payload['d']['id']), None)
+
+    def _handle_role_event(self, payload: dict) -> None:
+        self._cache.pop(int(payload['d']['guild_id']), None)
+
+    def _handle_member_update(self, payload: dict) -> None:
+        data = payload['d']
+        if self.bot.user is not None and int(data['user']['id']) == self.bot.user.id:
+            self._cache.pop(int(data['guild_id']), None)
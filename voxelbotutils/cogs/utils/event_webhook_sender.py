@@ -0,0 +1,257 @@
+import asyncio
+import collections
+import io
+import logging
+import time
+import typing
+from datetime import datetime as dt
+
+import aiohttp
+import discord
+
+
+class QueuedWebhookEvent(typing.NamedTuple):
+    """
+    An event waiting to be sent to an event webhook.
+
+    :meta private:
+    """
+
+    event_name: str
+    embed: dict
+    file: typing.Optional[typing.Tuple[str, bytes]]  # (filename, data)
+
+
+class WebhookQueue(object):
+    """
+    The events waiting to be sent to a single event webhook, and its rate limit.
+
+    :meta private:
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.events: typing.Deque[QueuedWebhookEvent] = collections.deque()
+        self.dropped: typing.Counter[str] = collections.Counter()
+        self.reset_at: float = 0.0
+        self.task: typing.Optional[asyncio.Task] = None
+
+
+class EventWebhookSender(object):
+    """
+    Sends events to the webhooks in your :class:`bot's config<BotConfig.event_webhook>`. Each webhook
+    has its own queue that's sent from in the background, with events merged into messages of up to 10
+    embeds, and the webhook's rate limit headers are used to wait out its limit rather than running into
+    429s. If a webhook's queue fills up (eg during a mass reconnect or a wave of guild joins) then new
+    events are dropped, and a summary of how many of each event were dropped is added to the next message.
+    Provided in your bot object at :attr:`voxelbotutils.Bot.event_webhooks`.
+    """
+
+    MAX_QUEUE_SIZE: int = 100  #: The max number of events waiting for each webhook before new ones are dropped.
+    MAX_EMBEDS: int = 10  #: The max number of embeds (and files) sent in each message.
+    MAX_CHARACTERS: int = 6_000  #: The max number of characters across the embeds in each message.
+    MAX_DESCRIPTION_LENGTH: int = 2_048  #: The length that event text is truncated to.
+    logger: logging.Logger = logging.getLogger("vbu.event_webhooks")
+
+    def __init__(self, bot):
+        """:meta private:"""
+
+        self.bot = bot
+
+        # webhook url: queue
+        self._queues: typing.Dict[str, WebhookQueue] = {}
+
+    def queue(
+            self, event_name: str, text: str, *, username: str = None,
+            file: discord.File = None) -> bool:
+        """
+        Queue an event to be sent to its webhook.
+
+        Args:
+            event_name (str): The name of the event, as used in the
+                :class:`bot's config<BotConfig.event_webhook.events>`.
+            text (str): The text to send for the event.
+            username (str, optional): The title of the event's embed.
+            file (discord.File, optional): A file to send with the event.
+
+        Returns:
+            bool: Whether or not the event was queued - events without a webhook, or that were
+            dropped as the webhook's queue was full, aren't.
+        """
+
+        # See if there's a webhook
+        webhook: discord.Webhook = self.bot.get_event_webhook(event_name)
+        if not webhook:
+            return False
+        try:
+            queue = self._queues[webhook.url]
+        except KeyError:
+            queue = self._queues[webhook.url] = WebhookQueue(webhook.url)
+
+        # See if there's space for it
+        if len(queue.events) >= self.MAX_QUEUE_SIZE:
+            queue.dropped[event_name] += 1
+            self.logger.debug(f"Dropped webhook for event {event_name} as the queue is full")
+            return False
+
+        # Queue the event
+        embed = {
+            "description": text[:self.MAX_DESCRIPTION_LENGTH],
+            "timestamp": dt.utcnow().isoformat(),
+        }
+        if username:
+            embed["title"] = username
+        file_data = None
+        if file is not None:
+            data = file.fp.read()
+            if isinstance(data, str):
+                data = data.encode()
+            file_data = (file.filename, data,)
+        queue.events.append(QueuedWebhookEvent(event_name, embed, file_data))
+
+        # And make sure it's being sent
+        if queue.task is None:
+            queue.task = self.bot.loop.create_task(self._send_queue(queue))
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop sending the queued events.
+        """
+
+        for queue in self._queues.values():
+            if queue.task is not None:
+                queue.task.cancel()
+                queue.task = None
+        self._queues.clear()
+
+    @staticmethod
+    def _get_embed_length(embed: dict) -> int:
+        return len(embed.get("title", "")) + len(embed.get("description", ""))
+
+    def _take_batch(
+            self, queue: WebhookQueue) -> typing.Tuple[
+                typing.List[QueuedWebhookEvent], typing.List[dict], typing.List[tuple], typing.Counter[str]]:
+        """
+        Take as many events from the front of the queue as will fit into one message, with a summary
+        of the dropped events at the end if there are any. Returns the events, the embeds and files
+        to send, and the dropped event counts that were summarised.
+        """
+
+        dropped = queue.dropped.copy()
+        summary = self._get_summary_embed(dropped) if dropped else None
+        max_embeds = self.MAX_EMBEDS - bool(dropped)
+        characters = self._get_embed_length(summary) if summary else 0
+        batch = []
+        file_count = 0
+        while queue.events and len(batch) < max_embeds:
+            event = queue.events[0]
+            length = self._get_embed_length(event.embed)
+            if batch and characters + length > self.MAX_CHARACTERS:
+                break
+            if event.file is not None:
+                if file_count >= self.MAX_EMBEDS:
+                    break
+                file_count += 1
+            batch.append(queue.events.popleft())
+            characters += length
+        embeds = [i.embed for i in batch]
+        if summary:
+            embeds.append(summary)
+        files = [i.file for i in batch if i.file is not None]
+        return batch, embeds, files, dropped
+
+    def _get_summary_embed(self, dropped: typing.Counter[str]) -> dict:
+        """
+        Make an embed summarising the events that were dropped.
+        """
+
+        counts = ", ".join(f"`{name}` x{count}" for name, count in dropped.most_common())
+        return {
+            "title": "Dropped Events",
+            "description": f"{sum(dropped.values())} events were dropped as the webhook's queue was full - {counts}"[:self.MAX_DESCRIPTION_LENGTH],
+            "timestamp": dt.utcnow().isoformat(),
+        }
+
+    async def _send_queue(self, queue: WebhookQueue) -> None:
+        """
+        Send the events in a webhook's queue until it's empty.
+        """
+
+        try:
+            while queue.events or queue.dropped:
+
+                # Wait out the rate limit
+                delay = queue.reset_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                # Send a batch
+                batch, embeds, files, dropped = self._take_batch(queue)
+                try:
+                    sent = await self._send(queue, embeds, files)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Failed to send webhook for events {', '.join(i.event_name for i in batch)} - {e}")
+                    sent = True  # Don't retry it
+
+                # Put the batch back if we were rate limited
+                if not sent:
+                    queue.events.extendleft(reversed(batch))
+                    continue
+                queue.dropped.subtract(dropped)
+                queue.dropped = +queue.dropped
+                self.logger.debug(f"Sent webhook for {len(batch)} events ({sum(dropped.values())} dropped)")
+        finally:
+            queue.task = None
+
+    async def _send(
+            self, queue: WebhookQueue, embeds: typing.List[dict],
+            files: typing.List[typing.Tuple[str, bytes]]) -> bool:
+        """
+        Send a message to a webhook, updating its rate limit from the response headers.
+
+        Returns:
+            bool: Whether or not the message was sent. This is false if we were rate limited.
+
+        Raises:
+            discord.HTTPException: The webhook gave an error other than a 429.
+        """
+
+        try:
+            avatar_url = str(self.bot.user.avatar_url)
+        except Exception:
+            avatar_url = None
+        payload = {
+            "username": getattr(self.bot.user, "name", None) or str(self.bot.application_id),
+            "avatar_url": avatar_url,
+            "embeds": embeds,
+            "allowed_mentions": {"parse": []},
+        }
+
+        # Build the request
+        if files:
+            data = aiohttp.FormData()
+            data.add_field("payload_json", discord.utils.to_json(payload), content_type="application/json")
+            for index, (filename, file_data) in enumerate(files):
+                data.add_field(f"file{index}", io.BytesIO(file_data), filename=filename, content_type="application/octet-stream")
+            headers = {}
+        else:
+            data = discord.utils.to_json(payload)
+            headers = {"Content-Type": "application/json"}
+
+        # Send it
+        async with self.bot.session.post(queue.url, data=data, headers=headers) as r:
+
+            # Store the rate limit
+            if r.headers.get("X-RateLimit-Remaining") == "0":
+                queue.reset_at = time.monotonic() + float(r.headers.get("X-RateLimit-Reset-After", 1))
+            if r.status == 429:
+                retry_after = float(r.headers.get("X-RateLimit-Reset-After") or r.headers.get("Retry-After") or 1)
+                queue.reset_at = max(queue.reset_at, time.monotonic() + retry_after)
+                self.logger.warning(f"Rate limited on event webhook, retrying in {retry_after:.2f}s")
+                return False
+            if r.status >= 400:
+                raise discord.HTTPException(r, await r.text())
+        return True
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import typing
+
+import aiohttp
+
+from .redis import RedisConnection
+
+
+logger = logging.getLogger("vbu.gateway")
+GATEWAY_BOT_URL = "https://discord.com/api/v9/gateway/bot"
+
+
+def _get_cache_key(token: str) -> str:
+    """
+    Gets a cache key for a given token - we really don't want to be writing the token itself anywhere.
+    """
+
+    return f"VBUGatewayBot:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
+
+
+def _get_cache_path(cache_key: str) -> str:
+    """
+    Gets the path of the local file that gateway info is cached to.
+    """
+
+    return os.path.join(tempfile.gettempdir(), f"{cache_key.replace(':', '-').lower()}.json")
+
+
+async def _get_cached_gateway_bot(cache_key: str) -> typing.Optional[dict]:
+    """
+    Get the cached gateway info, from Redis if it's connected and from the local disk otherwise.
+    The returned dict contains the gateway data under "data" and an "expires" timestamp.
+    """
+
+    try:
+        if RedisConnection.pool is not None:
+            async with RedisConnection() as re:
+                cached = await re.get(cache_key)
+        else:
+            with open(_get_cache_path(cache_key)) as a:
+                cached = a.read()
+        if not cached:
+            return None
+        return json.loads(cached)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read cached gateway info - {e}")
+        return None
+
+
+async def _set_cached_gateway_bot(cache_key: str, data: dict, ttl: float) -> None:
+    """
+    Cache some gateway info, to Redis if it's connected and to the local disk otherwise.
+    """
+
+    # The cached value is kept around for a while after it expires so that we can fall back
+    # to it if Discord is being unhelpful
+    dumped = json.dumps({"data": data, "expires": time.time() + ttl})
+    try:
+        if RedisConnection.pool is not None:
+            async with RedisConnection() as re:
+                await re.set(cache_key, dumped, expire=int(ttl * 10))
+        else:
+            path = _get_cache_path(cache_key)
+            with open(f"{path}.{os.getpid()}.tmp", "w") as a:
+                a.write(dumped)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+    except Exception as e:
+        logger.warning(f"Failed to cache gateway info - {e}")
+
+
+async def get_gateway_bot(
+        token: str, *, session: aiohttp.ClientSession = None, ttl: float = 600.0,
+        force_refresh: bool = False) -> dict:
+    """
+    Gets the data from Discord's :code:`/gateway/bot` endpoint for a given token, caching it
+    in Redis (if connected) or on the local disk (otherwise) so that multiple processes starting
+    at once don't all hit the endpoint. If Discord fails to give us the data then an expired
+    cached value is used if one is available.
+
+    Args:
+        token (str): The token of the bot that you want to get the gateway data for.
+        session (aiohttp.ClientSession, optional): The session to make the request with. If not
+            given, a new one will be made.
+        ttl (float, optional): How long the cached data should be used for, in seconds.
+        force_refresh (bool, optional): Whether or not to ignore the cached data.
+
+    Returns:
+        dict: The gateway data, containing :code:`url`, :code:`shards`, and :code:`session_start_limit`.
+            The data in :code:`session_start_limit` may be as old as the given TTL.
+
+    Raises:
+        aiohttp.ClientResponseError: Discord gave us an error and there was no cached data to use.
+    """
+
+    # See if we have it cached
+    cache_key = _get_cache_key(token)
+    cached = None
+    if not force_refresh:
+        cached = await _get_cached_gateway_bot(cache_key)
+        if cached and cached['expires'] > time.time():
+            logger.debug("Using cached gateway info")
+            return cached['data']
+
+    # Ask Discord for it
+    headers = {"Authorization": f"Bot {token}"}
+    try:
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(GATEWAY_BOT_URL, headers=headers) as r:
+                    r.raise_for_status()
+                    data = await r.json()
+        else:
+            async with session.get(GATEWAY_BOT_URL, headers=headers) as r:
+                r.raise_for_status()
+                data = await r.json()
+    except aiohttp.ClientError as e:
+        if cached:
+            logger.warning(f"Failed to get gateway info, using expired cached data - {e}")
+            return cached['data']
+        raise
+    logger.debug(f"Got gateway info from Discord - {data}")
+
+    # Cache and return
+    await _set_cached_gateway_bot(cache_key, data, ttl)
+    return data
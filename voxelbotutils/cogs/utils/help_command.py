@@ -1,4 +1,7 @@
+import asyncio
+import copy
 import random
+import time
 import typing
 import collections
 
@@ -16,23 +19,114 @@ class HelpCommand(commands.MinimalHelpCommand):
     )
     HELP_COMMAND_NAMES = ["help", "commands", "channelhelp"]
 
+    FILTER_TIME_BUDGET: float = 3.0  #: How long to wait for commands' checks before showing them anyway.
+    FILTER_CACHE_SIZE: int = 10_000  #: The max number of cached check results.
+    FILTER_CACHE_TTL: float = 60.0  #: How long cached check results are used for, in seconds.
+
+    # The Discord.py checks that only depend on the guild, permissions, and roles
+    STATIC_CHECK_NAMES = frozenset({
+        "has_permissions", "bot_has_permissions", "has_guild_permissions", "bot_has_guild_permissions",
+        "has_role", "has_any_role", "bot_has_role", "bot_has_any_role", "guild_only", "dm_only", "is_nsfw",
+    })
+
+    # (command name, guild ID, author permissions, bot permissions, author roles): (expiry, visible)
+    _filter_cache: typing.Dict[tuple, typing.Tuple[float, bool]] = collections.OrderedDict()
+
+    @classmethod
+    def _is_static_check(cls, predicate: typing.Callable) -> bool:
+        """
+        Whether or not a check predicate's result can be cached by the guild, permissions, and roles.
+        """
+
+        if getattr(predicate, '__vbu_static_check__', False):
+            return True
+        qualname = getattr(predicate, '__qualname__', '')
+        return (
+            getattr(predicate, '__module__', None) == commands.core.__name__
+            and qualname.split('.')[0] in cls.STATIC_CHECK_NAMES
+        )
+
+    @classmethod
+    def _get_filter_cache_key(cls, ctx, command: commands.Command) -> typing.Optional[tuple]:
+        """
+        Get the cache key for a command's checks, or :code:`None` if they can't be cached.
+        """
+
+        # See if there's anything that's not static
+        if getattr(command, 'ignore_checks_in_help', False):
+            return None
+        if ctx.bot._checks or not all(cls._is_static_check(i) for i in command.checks):
+            return None
+        cog = command.cog
+        if cog is not None and commands.Cog._get_overridden_method(cog.cog_check) is not None:
+            return None
+
+        # Work out the key
+        try:
+            author_permissions = ctx.channel.permissions_for(ctx.author).value
+            bot_permissions = ctx.channel.permissions_for(ctx.me).value
+        except Exception:
+            return None
+        return (
+            command.qualified_name,
+            getattr(ctx.guild, "id", None),
+            author_permissions,
+            bot_permissions,
+            frozenset(getattr(ctx.author, "_roles", ())),
+        )
+
+    @classmethod
+    async def _can_show_command(cls, ctx, command: commands.Command) -> bool:
+        """
+        Whether or not a command should be shown to a user, using the cache for static checks.
+        """
+
+        # See if we have it cached
+        key = cls._get_filter_cache_key(ctx, command)
+        if key is not None:
+            cached = cls._filter_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+        # Run the checks on a copy of the context, as they set the context's command while they run
+        try:
+            await command.can_run(copy.copy(ctx))
+            visible = True
+        except commands.CommandError as e:
+            visible = not isinstance(e, cls.HELP_COMMAND_HIDDEN_ERRORS)
+
+        # Cache it
+        if key is not None:
+            cls._filter_cache[key] = (time.monotonic() + cls.FILTER_CACHE_TTL, visible)
+            cls._filter_cache.move_to_end(key)
+            while len(cls._filter_cache) > cls.FILTER_CACHE_SIZE:
+                cls._filter_cache.popitem(last=False)
+        return visible
+
     @classmethod
     async def filter_commands_classmethod(cls, ctx, commands_to_filter: typing.List[commands.Command]) -> typing.List[commands.Command]:
         """
-        Filter the command list down into a list of runnable commands.
+        Filter the command list down into a list of runnable commands. Commands' checks are run
+        concurrently, and any that haven't finished within :attr:`FILTER_TIME_BUDGET` are shown anyway.
         """
 
         if ctx.author.id in ctx.bot.owner_ids:
             return [i for i in commands_to_filter if i.name not in cls.HELP_COMMAND_NAMES]
         valid_commands = [i for i in commands_to_filter if i.hidden is False and i.enabled is True and i.name not in cls.HELP_COMMAND_NAMES]
+        if not valid_commands:
+            return []
+
+        # Run all of the checks at once
+        tasks = [asyncio.ensure_future(cls._can_show_command(ctx, i)) for i in valid_commands]
+        _, pending = await asyncio.wait(tasks, timeout=cls.FILTER_TIME_BUDGET)
+        for task in pending:
+            task.cancel()
+
+        # Filter them out
         returned_commands = []
-        for comm in valid_commands:
-            try:
-                await comm.can_run(ctx)
-            except commands.CommandError as e:
-                if isinstance(e, cls.HELP_COMMAND_HIDDEN_ERRORS):
-                    continue
-            returned_commands.append(comm)
+        for comm, task in zip(valid_commands, tasks):
+            if task in pending or task.exception() is not None or task.result():
+                returned_commands.append(comm)
         return returned_commands
 
     async def filter_commands(self, commands_to_filter: typing.List[commands.Command]) -> typing.List[commands.Command]:
@@ -79,8 +173,8 @@ class HelpCommand(commands.MinimalHelpCommand):
 
         # Get the visible commands for each of the cogs
         runnable_commands = {}
-        for cog, cog_commands in mapping.items():
-            available_commands = await self.filter_commands(cog_commands)
+        filtered = await asyncio.gather(*[self.filter_commands(i) for i in mapping.values()])
+        for (cog, cog_commands), available_commands in zip(mapping.items(), filtered):
             if len(available_commands) > 0 or isinstance(cog, (commands.Command, commands.Group,)):
                 runnable_commands[cog] = available_commands
 
@@ -2,3 +2,6 @@ from .application_commands import (
     ApplicationCommandOptionType, ApplicationCommandOptionChoice, ApplicationCommandOption,
     ApplicationCommand, InteractionMessage,
 )
+from .resolved import InteractionResolved
+from .component_router import ComponentRouter
+from .component_handlers import ComponentStateStore, make_custom_id, parse_custom_id
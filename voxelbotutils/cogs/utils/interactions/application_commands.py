@@ -1,4 +1,6 @@
 import enum
+import hashlib
+import json
 import typing
 
 import discord
@@ -98,7 +100,7 @@ class ApplicationCommandOption(object):
 
     @classmethod
     def from_data(cls, data: dict):
-        base_option = cls(data['name'], ApplicationCommandOptionType(data['type']), data['description'], data.get('required', False))
+        base_option = cls(data['name'], ApplicationCommandOptionType(data['type']), data['description'], required=data.get('required', False))
         for choice in data.get('choices', list()):
             base_option.add_choice(ApplicationCommandOptionChoice.from_data(choice))
         for option in data.get('options', list()):
@@ -121,6 +123,19 @@ class ApplicationCommandOption(object):
             payload.pop("choices")
         return payload
 
+    def to_hashable_json(self) -> dict:
+        """
+        The option's JSON without anything that Discord doesn't store, so that it can be compared
+        against the options Discord gives back.
+
+        :meta private:
+        """
+
+        payload = self.to_json()
+        payload.pop("default", None)
+        payload["options"] = [i.to_hashable_json() for i in self.options]
+        return payload
+
 
 class ApplicationCommand(object):
     """
@@ -164,7 +179,7 @@ class ApplicationCommand(object):
         return command
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.to_json() == other.to_json()
+        return isinstance(other, self.__class__) and self.get_hash() == other.get_hash()
 
     def to_json(self):
         return {
@@ -173,6 +188,23 @@ class ApplicationCommand(object):
             "options": [i.to_json() for i in self.options],
         }
 
+    def get_hash(self) -> str:
+        """
+        Get a stable hash of the command's content - the same for a local command and the copy of it
+        that's returned by Discord, and the same between processes.
+
+        Returns:
+            str: The hash of the command.
+        """
+
+        payload = {
+            "name": self.name,
+            "description": self.description,
+            "options": [i.to_hashable_json() for i in self.options],
+        }
+        dumped = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(dumped.encode()).hexdigest()
+
 
 class InteractionMessage(discord.Message):
 
@@ -211,7 +243,7 @@ class InteractionMessage(discord.Message):
     def _handle_resolved(self, data):
         mentions = []
         try:
-            for uid, payload in data['users']:
+            for uid, payload in data['users'].items():
                 user_payload = payload.copy()
                 try:
                     user_payload.update({'member': data['members'][uid]})
@@ -0,0 +1,172 @@
+import json
+import logging
+import time
+import typing
+import uuid
+from datetime import datetime as dt, timedelta
+
+from ..database import DatabaseConnection
+from ..redis import RedisConnection
+
+
+CUSTOM_ID_SEPARATOR = ":"
+CUSTOM_ID_MAX_LENGTH = 100
+
+
+def make_custom_id(prefix: str, *args) -> str:
+    """
+    Make a custom ID for a component that's handled by a
+    :func:`persistent component handler<voxelbotutils.Cog.component_handler>`, encoding any
+    given state into it.
+
+    Examples:
+
+        ::
+
+            Button("Next", custom_id=voxelbotutils.make_custom_id("LEADERBOARD", guild_id, page + 1))
+
+    Args:
+        prefix (str): The prefix that the handler was registered with.
+        *args: The state to be encoded. These are cast to strings, and will be given back
+            to your handler as strings.
+
+    Returns:
+        str: The custom ID.
+
+    Raises:
+        ValueError: The prefix or one of the arguments contains the separator, or the custom ID is too long.
+    """
+
+    args = [str(i) for i in args]
+    if CUSTOM_ID_SEPARATOR in prefix or any(CUSTOM_ID_SEPARATOR in i for i in args):
+        raise ValueError(f"Custom ID parts can't contain {CUSTOM_ID_SEPARATOR!r}")
+    custom_id = CUSTOM_ID_SEPARATOR.join([prefix, *args])
+    if len(custom_id) > CUSTOM_ID_MAX_LENGTH:
+        raise ValueError(f"Custom IDs can only be up to {CUSTOM_ID_MAX_LENGTH} characters long")
+    return custom_id
+
+
+def parse_custom_id(custom_id: str) -> typing.Tuple[str, typing.List[str]]:
+    """
+    Split a custom ID made with :func:`make_custom_id` into its prefix and arguments.
+
+    Args:
+        custom_id (str): The custom ID.
+
+    Returns:
+        typing.Tuple[str, typing.List[str]]: The prefix and the arguments.
+    """
+
+    prefix, *args = custom_id.split(CUSTOM_ID_SEPARATOR)
+    return prefix, args
+
+
+class ComponentStateStore(object):
+    """
+    A small store for component state that's too big to fit in a custom ID. State is kept in Redis
+    if it's enabled, or in the :code:`component_state` database table otherwise, under a short key that
+    you can put into your custom IDs via :func:`make_custom_id`. Provided in your bot object at
+    :attr:`Bot.component_state` for your convenience.
+
+    Examples:
+
+        ::
+
+            # Store some state
+            key = await bot.component_state.set({"query": query, "page": 0}, ttl=86_400)
+            button = Button("Next", custom_id=voxelbotutils.make_custom_id("SEARCH", key))
+
+            # And later, in your handler
+            state = await bot.component_state.get(key)
+    """
+
+    DEFAULT_TTL = 7 * 86_400  #: How long state is kept for by default, in seconds.
+    CLEANUP_INTERVAL = 3_600  #: How often expired rows are removed from the database, in seconds.
+    logger: logging.Logger = logging.getLogger("vbu.component_state")
+
+    def __init__(self, bot):
+        """:meta private:"""
+
+        self.bot = bot
+        self._last_cleanup = 0
+
+    @property
+    def use_redis(self) -> bool:
+        """:meta private:"""
+
+        if self.bot.config.get('redis', {}).get('enabled', False):
+            return True
+        if self.bot.config.get('database', {}).get('enabled', False):
+            return False
+        raise NotImplementedError("Component state needs either Redis or the database to be enabled.")
+
+    async def set(self, data: typing.Any, *, key: str = None, ttl: float = None) -> str:
+        """
+        Store some state.
+
+        Args:
+            data (typing.Any): The data to store. Must be JSON serializable.
+            key (str, optional): The key to store the data under. If not given, a new one is made.
+            ttl (float, optional): How long the data should be kept for, in seconds.
+
+        Returns:
+            str: The key that the data was stored under.
+        """
+
+        key = key or uuid.uuid4().hex[:16]
+        ttl = ttl or self.DEFAULT_TTL
+        dumped = json.dumps(data)
+        if self.use_redis:
+            async with RedisConnection() as re:
+                await re.set(f"VBUComponentState:{key}", dumped, expire=int(ttl))
+        else:
+            async with DatabaseConnection() as db:
+                await db(
+                    """INSERT INTO component_state (key, data, expires_at) VALUES ($1, $2, $3)
+                    ON CONFLICT (key) DO UPDATE SET data=excluded.data, expires_at=excluded.expires_at""",
+                    key, dumped, dt.utcnow() + timedelta(seconds=ttl),
+                )
+                if self._last_cleanup < time.monotonic() - self.CLEANUP_INTERVAL:
+                    self._last_cleanup = time.monotonic()
+                    await db("DELETE FROM component_state WHERE expires_at < $1", dt.utcnow())
+        return key
+
+    async def get(self, key: str) -> typing.Any:
+        """
+        Get some stored state.
+
+        Args:
+            key (str): The key that the data was stored under.
+
+        Returns:
+            typing.Any: The stored data, or :code:`None` if it doesn't exist or has expired.
+        """
+
+        if self.use_redis:
+            async with RedisConnection() as re:
+                dumped = await re.get(f"VBUComponentState:{key}")
+        else:
+            async with DatabaseConnection() as db:
+                rows = await db(
+                    "SELECT data FROM component_state WHERE key=$1 AND expires_at > $2",
+                    key, dt.utcnow(),
+                )
+            dumped = rows[0]['data'] if rows else None
+        if dumped is None:
+            return None
+        return json.loads(dumped)
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete some stored state.
+
+        Args:
+            key (str): The key that the data was stored under.
+        """
+
+        if self.use_redis:
+            async with RedisConnection() as re:
+                await re.conn.delete(f"VBUComponentState:{key}")
+        else:
+            async with DatabaseConnection() as db:
+                await db("DELETE FROM component_state WHERE key=$1", key)
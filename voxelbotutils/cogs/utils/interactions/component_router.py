@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import typing
+
+from .component_handlers import parse_custom_id
+
+
+class ComponentRouter(object):
+    """
+    Routes component interactions to the coroutines that are waiting on them, indexed by
+    message ID and custom ID. Unlike :code:`bot.wait_for("component_interaction")`, a click only
+    runs the checks of the waiters on the message that was clicked, rather than every check
+    for every open menu. Provided in your bot object at :attr:`MinimalBot.component_router`.
+
+    Clicks that nothing is waiting on are given to the persistent handler registered for the
+    custom ID's prefix (see :func:`voxelbotutils.Cog.component_handler` and :func:`voxelbotutils.make_custom_id`),
+    so they can be handled by any process, even after a restart.
+
+    Examples:
+
+        ::
+
+            # Wait for any component on a message
+            payload = await bot.component_router.wait_for(message.id, timeout=60)
+
+            # Wait for a specific component by custom ID
+            payload = await bot.component_router.wait_for(message.id, custom_id="CONFIRM", timeout=60)
+    """
+
+    logger: logging.Logger = logging.getLogger("vbu.component_router")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        """:meta private:"""
+
+        self.loop = loop
+        self.handlers: typing.Dict[str, typing.Callable] = {}
+        self._waiters: typing.Dict[int, typing.Dict[typing.Optional[str], list]] = {}
+        self._pending_count = 0
+
+    @property
+    def pending_count(self) -> int:
+        """
+        The number of waiters that are currently pending.
+        """
+
+        return self._pending_count
+
+    @property
+    def pending_message_count(self) -> int:
+        """
+        The number of messages that currently have pending waiters.
+        """
+
+        return len(self._waiters)
+
+    def add_handler(self, prefix: str, callback: typing.Callable) -> None:
+        """
+        Add a persistent handler for components whose custom IDs start with a given prefix.
+
+        Args:
+            prefix (str): The custom ID prefix, as given to :func:`voxelbotutils.make_custom_id`.
+            callback (typing.Callable): A coroutine function taking the interaction payload and then
+                each of the arguments encoded in the custom ID.
+        """
+
+        self.handlers[prefix] = callback
+
+    def remove_handler(self, prefix: str) -> None:
+        """
+        Remove a persistent handler added via :func:`add_handler`.
+
+        Args:
+            prefix (str): The custom ID prefix.
+        """
+
+        self.handlers.pop(prefix, None)
+
+    async def wait_for(
+            self, message_id: int, *, custom_id: str = None, check: typing.Callable = None,
+            timeout: float = None):
+        """
+        Wait for a component interaction on a given message.
+
+        Args:
+            message_id (int): The ID of the message to wait for interactions on.
+            custom_id (str, optional): The custom ID of the component to wait for. If not given,
+                any component on the message will do.
+            check (typing.Callable, optional): An additional check that the payload needs to pass.
+            timeout (float, optional): How long to wait for.
+
+        Returns:
+            ComponentInteractionPayload: The interaction payload.
+
+        Raises:
+            asyncio.TimeoutError: Nothing passed the check within the timeout.
+        """
+
+        future = (self.loop or asyncio.get_event_loop()).create_future()
+        waiter = (future, check)
+        self._waiters.setdefault(message_id, {}).setdefault(custom_id, []).append(waiter)
+        self._pending_count += 1
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._remove_waiter(message_id, custom_id, waiter)
+
+    def _remove_waiter(self, message_id: int, custom_id: typing.Optional[str], waiter: tuple) -> None:
+        """
+        Remove a waiter from the index, cleaning up anything left empty.
+        """
+
+        custom_ids = self._waiters.get(message_id)
+        if custom_ids is None:
+            return
+        waiters = custom_ids.get(custom_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+            self._pending_count -= 1
+        except ValueError:
+            pass
+        if not waiters:
+            del custom_ids[custom_id]
+        if not custom_ids:
+            del self._waiters[message_id]
+
+    def dispatch(self, payload) -> int:
+        """
+        Pass a component interaction payload to any waiters on its message.
+
+        Args:
+            payload (ComponentInteractionPayload): The interaction payload.
+
+        Returns:
+            int: The number of waiters that the payload was given to.
+
+        :meta private:
+        """
+
+        # Give it to anything waiting on the message
+        resolved = 0
+        clicked_custom_id = payload.data['data'].get('custom_id')
+        custom_ids = self._waiters.get(payload.message.id)
+        if custom_ids:
+            for custom_id in ((clicked_custom_id, None) if clicked_custom_id is not None else (None,)):
+                for future, check in list(custom_ids.get(custom_id, ())):
+                    if future.done():
+                        continue
+                    try:
+                        result = check(payload) if check else True
+                    except Exception as e:
+                        future.set_exception(e)
+                        continue
+                    if result:
+                        future.set_result(payload)
+                        resolved += 1
+        if resolved or not clicked_custom_id:
+            return resolved
+
+        # Nothing was waiting, so see if there's a persistent handler for it
+        prefix, args = parse_custom_id(clicked_custom_id)
+        callback = self.handlers.get(prefix)
+        if callback is None:
+            return 0
+        asyncio.ensure_future(self._run_handler(callback, payload, args), loop=self.loop)
+        return 1
+
+    async def _run_handler(self, callback: typing.Callable, payload, args: typing.List[str]) -> None:
+        """
+        Run a persistent handler, logging any errors.
+        """
+
+        try:
+            await callback(payload, *args)
+        except Exception as e:
+            self.logger.error(f"Error in component handler for custom ID {payload.data['data'].get('custom_id')!r}", exc_info=e)
@@ -19,10 +19,10 @@ class ActionRow(ComponentHolder):
     TYPE = 1
     WIDTH = 5
 
-    def to_dict(self):
+    def _build_dict(self, child_dicts):
         return {
             "type": self.TYPE,
-            "components": [i.to_dict() for i in self.components],
+            "components": child_dicts,
         }
 
     @classmethod
@@ -45,8 +45,8 @@ class MessageComponents(ComponentHolder):
     A set of components that can be added to a message.
     """
 
-    def to_dict(self):
-        return [i.to_dict() for i in self.components]
+    def _build_dict(self, child_dicts):
+        return child_dicts
 
     @classmethod
     def from_dict(cls, data: dict):
@@ -91,11 +91,7 @@ class MessageComponents(ComponentHolder):
             *buttons (Button): The buttons that you want to have added.
         """
 
-        v = cls()
-        while buttons:
-            v.add_component(ActionRow(*buttons[:5]))
-            buttons = buttons[5:]
-        return v
+        return cls(*[ActionRow(*buttons[i:i + 5]) for i in range(0, len(buttons), 5)])
 
 
 component_types = {
@@ -73,7 +73,7 @@ class Button(DisableableComponent):
         if not label and not emoji:
             raise ValueError("Both label and emoji cannot be empty")
 
-    def to_dict(self) -> dict:
+    def _to_dict(self) -> dict:
         v = {
             "type": self.TYPE,
             "label": self.label,
@@ -129,5 +129,6 @@ class Button(DisableableComponent):
             style=ButtonStyle(data.get("style", ButtonStyle.PRIMARY.value)),
             custom_id=data.get("custom_id"),
             emoji=emoji,
+            url=data.get("url"),
             disabled=data.get("disabled", False),
         )
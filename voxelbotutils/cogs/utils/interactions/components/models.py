@@ -22,16 +22,61 @@ def get_partial_emoji(emoji: typing.Union[str, discord.PartialEmoji]) -> discord
 class BaseComponent(object):
     """
     The base message component for Discord UI interactions.
+
+    Components cache their payload, which is only rebuilt when one of their attributes (or one
+    of the components that they hold) is changed. A component can be frozen with :func:`freeze`,
+    after which it can't be changed at all, so that one instance can be shared between messages.
     """
 
+    _cached_dict = None
+    _frozen: bool = False
+
+    def __setattr__(self, name, value):
+        """:meta private:"""
+
+        if self._frozen:
+            raise AttributeError(f"Can't set {name} on a frozen {self.__class__.__name__}")
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_cached_dict", None)
+
     def to_dict(self) -> dict:
         """
         Convert the current component object into a dictionary that we can
-        send to Discord as a payload.
+        send to Discord as a payload. The dictionary is cached, so shouldn't
+        be changed.
+        """
+
+        if self._cached_dict is None:
+            object.__setattr__(self, "_cached_dict", self._to_dict())
+        return self._cached_dict
+
+    def _to_dict(self) -> dict:
+        """
+        Build the payload that's cached by :func:`to_dict`.
+
+        :meta private:
         """
 
         raise NotImplementedError()
 
+    def _to_dict_with_children(
+            self, children: typing.Iterable['BaseComponent'],
+            build: typing.Callable[[typing.List[dict]], typing.Any]):
+        """
+        Build a payload from the payloads of the components that this one holds, reusing
+        the cached payload if none of them have changed since it was built.
+
+        :meta private:
+        """
+
+        child_dicts = [i.to_dict() for i in children]
+        cached = self._cached_dict
+        if cached is not None and len(cached[0]) == len(child_dicts) and all(i is o for i, o in zip(cached[0], child_dicts)):
+            return cached[1]
+        data = build(child_dicts)
+        object.__setattr__(self, "_cached_dict", (child_dicts, data,))
+        return data
+
     @classmethod
     def from_dict(cls, data):
         """
@@ -54,6 +99,40 @@ class BaseComponent(object):
 
         return hash(json.dumps(self.to_dict(), sort_keys=True))
 
+    def freeze(self):
+        """
+        Freeze the component, and any components that it holds, so that it can't be changed.
+        Disabling or enabling the components of a frozen component holder gives back a frozen
+        copy rather than changing it in place.
+
+        Returns:
+            The component, now frozen.
+        """
+
+        object.__setattr__(self, "_toggled_copies", {})
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    def _get_toggled_copy(self, disabled: bool):
+        """
+        Get a frozen copy of this frozen component with everything disabled or enabled. The
+        copies are kept, so a shared component only ever makes two of them.
+
+        :meta private:
+        """
+
+        try:
+            return self._toggled_copies[disabled]
+        except KeyError:
+            pass
+        v = self.from_dict(self.to_dict())
+        if isinstance(v, ComponentHolder):
+            v.disable_components() if disabled else v.enable_components()
+        elif isinstance(v, DisableableComponent):
+            v.disable() if disabled else v.enable()
+        self._toggled_copies[disabled] = v.freeze()
+        return v
+
 
 class DisableableComponent(BaseComponent):
     """
@@ -88,6 +167,28 @@ class ComponentHolder(BaseComponent):
 
         self.components = list(components)
 
+    def to_dict(self):
+        return self._to_dict_with_children(self.components, self._build_dict)
+
+    def _build_dict(self, child_dicts: typing.List[dict]):
+        """
+        Build the payload for this holder from the payloads of the components that it holds.
+
+        :meta private:
+        """
+
+        raise NotImplementedError()
+
+    def freeze(self):
+        for i in self.components:
+            i.freeze()
+        object.__setattr__(self, "components", tuple(self.components))
+        return super().freeze()
+
+    def _check_not_frozen(self) -> None:
+        if self._frozen:
+            raise AttributeError(f"Can't change the components of a frozen {self.__class__.__name__}")
+
     def add_component(self, component: BaseComponent):
         """
         Adds a component to this holder.
@@ -96,6 +197,7 @@ class ComponentHolder(BaseComponent):
             component (BaseComponent): The component that you want to add.
         """
 
+        self._check_not_frozen()
         self.components.append(component)
         return self
 
@@ -107,30 +209,57 @@ class ComponentHolder(BaseComponent):
             component (BaseComponent): The component that you want to remove.
         """
 
+        self._check_not_frozen()
         self.components.remove(component)
         return self
 
-    def disable_components(self) -> None:
+    def disable_components(self) -> 'ComponentHolder':
         """
         Disables all of the components inside this component holder that
-        inherit from :class:`DisableableComponent`.
+        inherit from :class:`DisableableComponent`. Frozen components are
+        swapped for disabled copies, and a frozen holder returns a disabled
+        copy of itself.
+
+        Frozen holders are never changed in place, so always use the return value
+        (eg :code:`components = components.disable_components()`).
+
+        Returns:
+            ComponentHolder: The holder with its components disabled - either this one,
+            or a disabled copy if this one is frozen.
         """
 
-        for i in self.components:
-            if isinstance(i, ComponentHolder):
+        if self._frozen:
+            return self._get_toggled_copy(True)
+        for index, i in enumerate(self.components):
+            if i._frozen:
+                self.components[index] = i._get_toggled_copy(True)
+            elif isinstance(i, ComponentHolder):
                 i.disable_components()
             elif isinstance(i, DisableableComponent):
                 i.disable()
         return self
 
-    def enable_components(self) -> None:
+    def enable_components(self) -> 'ComponentHolder':
         """
         Enables all of the components inside this component holder that
-        inherit from :class:`DisableableComponent`.
+        inherit from :class:`DisableableComponent`. Frozen components are
+        swapped for enabled copies, and a frozen holder returns an enabled
+        copy of itself.
+
+        Frozen holders are never changed in place, so always use the return value
+        (eg :code:`components = components.enable_components()`).
+
+        Returns:
+            ComponentHolder: The holder with its components enabled - either this one,
+            or an enabled copy if this one is frozen.
         """
 
-        for i in self.components:
-            if isinstance(i, ComponentHolder):
+        if self._frozen:
+            return self._get_toggled_copy(False)
+        for index, i in enumerate(self.components):
+            if i._frozen:
+                self.components[index] = i._get_toggled_copy(False)
+            elif isinstance(i, ComponentHolder):
                 i.enable_components()
             elif isinstance(i, DisableableComponent):
                 i.enable()
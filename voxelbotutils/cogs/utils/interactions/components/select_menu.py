@@ -28,7 +28,7 @@ class SelectOption(BaseComponent):
         self.emoji = get_partial_emoji(emoji)
         self.default = default or False
 
-    def to_dict(self) -> dict:
+    def _to_dict(self) -> dict:
         v = {
             "label": self.label,
             "value": self.value,
@@ -40,7 +40,7 @@ class SelectOption(BaseComponent):
                 v.update({
                     "emoji": {
                         "name": self.emoji.name,
-                        "id": str(self.emoji.id),
+                        "id": str(self.emoji.id) if self.emoji.id else None,
                         "animated": self.emoji.animated,
                     },
                 })
@@ -101,16 +101,25 @@ class SelectMenu(DisableableComponent):
         self.disabled = disabled
 
     def to_dict(self):
+        return self._to_dict_with_children(self.options, self._build_dict)
+
+    def _build_dict(self, option_dicts):
         return {
             "type": self.TYPE,
             "custom_id": self.custom_id,
             "placeholder": self.placeholder,
             "min_values": self.min_values,
             "max_values": self.max_values,
-            "options": [i.to_dict() for i in self.options],
+            "options": option_dicts,
             "disabled": self.disabled
         }
 
+    def freeze(self):
+        for i in self.options:
+            i.freeze()
+        object.__setattr__(self, "options", tuple(self.options))
+        return super().freeze()
+
     @classmethod
     def from_dict(cls, data: dict):
         v = data.get("options")
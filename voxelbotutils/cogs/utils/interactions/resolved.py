@@ -0,0 +1,164 @@
+import typing
+
+import discord
+from discord.ext import commands
+
+
+class InteractionResolved(object):
+    """
+    The users, members, roles, and channels that Discord sends along with an interaction
+    in its :code:`resolved` data. These are built into Discord.py objects when they're first
+    asked for, so that converters can use them rather than going out to the API.
+
+    This is available as :attr:`voxelbotutils.Context.resolved` for slash commands.
+    """
+
+    def __init__(self, *, state, guild: typing.Optional[discord.Guild], data: dict):
+        """:meta private:"""
+
+        self._state = state
+        self.guild = guild
+        self._data = data
+        self._cache = {}
+
+    @staticmethod
+    def _get_id(value: typing.Union[str, int]) -> typing.Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def get_user(self, user_id: typing.Union[str, int]) -> typing.Optional[discord.User]:
+        """
+        Get a user from the resolved data.
+
+        Args:
+            user_id (typing.Union[str, int]): The ID of the user.
+
+        Returns:
+            typing.Optional[discord.User]: The user, if they were in the resolved data.
+        """
+
+        user_id = self._get_id(user_id)
+        key = ("user", user_id)
+        if key not in self._cache:
+            payload = self._data.get('users', {}).get(str(user_id))
+            self._cache[key] = None if payload is None else discord.User(state=self._state, data=payload)
+        return self._cache[key]
+
+    def get_member(self, user_id: typing.Union[str, int]) -> typing.Optional[discord.Member]:
+        """
+        Get a member from the resolved data.
+
+        Args:
+            user_id (typing.Union[str, int]): The ID of the member.
+
+        Returns:
+            typing.Optional[discord.Member]: The member, if they were in the resolved data and the
+            interaction was run in a guild.
+        """
+
+        user_id = self._get_id(user_id)
+        key = ("member", user_id)
+        if key not in self._cache:
+            member_payload = self._data.get('members', {}).get(str(user_id))
+            user_payload = self._data.get('users', {}).get(str(user_id))
+            if self.guild is None or member_payload is None or user_payload is None:
+                self._cache[key] = None
+            else:
+                payload = dict(member_payload, user=user_payload)
+                self._cache[key] = discord.Member(data=payload, guild=self.guild, state=self._state)
+        return self._cache[key]
+
+    def get_role(self, role_id: typing.Union[str, int]) -> typing.Optional[discord.Role]:
+        """
+        Get a role from the resolved data.
+
+        Args:
+            role_id (typing.Union[str, int]): The ID of the role.
+
+        Returns:
+            typing.Optional[discord.Role]: The role, if it was in the resolved data.
+        """
+
+        role_id = self._get_id(role_id)
+        key = ("role", role_id)
+        if key not in self._cache:
+            payload = self._data.get('roles', {}).get(str(role_id))
+            if self.guild is None or payload is None:
+                self._cache[key] = None
+            else:
+                payload = dict(payload, permissions_new=payload.get("permissions", 0))
+                self._cache[key] = discord.Role(guild=self.guild, state=self._state, data=payload)
+        return self._cache[key]
+
+    def get_channel(self, channel_id: typing.Union[str, int]) -> typing.Optional[discord.abc.GuildChannel]:
+        """
+        Get a channel given in the resolved data. Discord only gives us partial channel data,
+        so this will only return channels that are cached.
+
+        Args:
+            channel_id (typing.Union[str, int]): The ID of the channel.
+
+        Returns:
+            typing.Optional[discord.abc.GuildChannel]: The channel, if it's cached.
+        """
+
+        channel_id = self._get_id(channel_id)
+        if str(channel_id) not in self._data.get('channels', {}):
+            return None
+        if self.guild is not None:
+            return self.guild.get_channel(channel_id)
+        return self._state.get_channel(channel_id)
+
+    def convert(self, converter: typing.Any, argument: typing.Union[str, int]) -> typing.Any:
+        """
+        Try to convert an argument using the resolved data, given the converter that the
+        command would otherwise use. Only the exact default Discord.py types and converters are
+        handled here, as subclasses may be doing their own thing.
+
+        Args:
+            converter (typing.Any): The converter that the parameter uses.
+            argument (typing.Union[str, int]): The ID given in the interaction.
+
+        Returns:
+            typing.Any: The converted object, or :code:`None` if it couldn't be resolved.
+        """
+
+        # Go through unions
+        if getattr(converter, '__origin__', None) is typing.Union:
+            for i in converter.__args__:
+                if i is type(None):  # noqa
+                    continue
+                v = self.convert(i, argument)
+                if v is not None:
+                    return v
+            return None
+
+        # Get the class for converter instances
+        if not isinstance(converter, type):
+            converter = type(converter)
+
+        # See what we want
+        if converter in (discord.User, commands.UserConverter):
+            return self.get_user(argument)
+        if converter in (discord.abc.User,):
+            return self.get_member(argument) or self.get_user(argument)
+        if converter in (discord.Member, commands.MemberConverter):
+            return self.get_member(argument)
+        if converter in (discord.Role, commands.RoleConverter):
+            return self.get_role(argument)
+        channel_types = {
+            discord.TextChannel: discord.TextChannel,
+            commands.TextChannelConverter: discord.TextChannel,
+            discord.VoiceChannel: discord.VoiceChannel,
+            commands.VoiceChannelConverter: discord.VoiceChannel,
+            discord.CategoryChannel: discord.CategoryChannel,
+            commands.CategoryChannelConverter: discord.CategoryChannel,
+            discord.abc.GuildChannel: discord.abc.GuildChannel,
+        }
+        if converter in channel_types:
+            channel = self.get_channel(argument)
+            if isinstance(channel, channel_types[converter]):
+                return channel
+        return None
@@ -85,7 +85,7 @@ class Converter(object):
                     return False
                 return button_check
             try:
-                payload = await ctx.bot.wait_for("component_interaction", check=get_button_check(sent_message), timeout=60.0)
+                payload = await ctx.bot.wait_for_component_interaction(sent_message, check=get_button_check(sent_message), timeout=60.0)
                 await payload.defer_update()
             except asyncio.TimeoutError:
                 raise ConverterTimeout(self.timeout_message)
@@ -28,6 +28,7 @@ class Menu(MenuDisplayable):
     """
 
     callbacks = MenuCallbacks
+    _components_cache: typing.Optional[typing.Tuple[tuple, MessageComponents]] = None  # (buttons, components)
 
     def __init__(
             self, *options: typing.List[Option], display: str = None, component_display: str = None):
@@ -103,7 +104,7 @@ class Menu(MenuDisplayable):
 
             # Wait for the user to click on a button
             try:
-                payload = await ctx.bot.wait_for("component_interaction", check=get_button_check(menu_message), timeout=60.0)
+                payload = await ctx.bot.wait_for_component_interaction(menu_message, check=get_button_check(menu_message), timeout=60.0)
                 await payload.defer_update()
             except asyncio.TimeoutError:
                 break
@@ -146,6 +147,20 @@ class Menu(MenuDisplayable):
         except Exception:
             pass
 
+    def _get_components(self, buttons: typing.Tuple[typing.Tuple[str, ButtonStyle], ...]) -> MessageComponents:
+        """
+        Get the (frozen) components for the menu, reusing the last set if the buttons haven't changed.
+        """
+
+        if self._components_cache is not None and self._components_cache[0] == buttons:
+            return self._components_cache[1]
+        components = MessageComponents.add_buttons_with_rows(
+            *[Button(display, custom_id=display, style=style) for display, style in buttons],
+            Button("Done", custom_id="Done", style=ButtonStyle.SUCCESS),
+        ).freeze()
+        self._components_cache = (buttons, components,)
+        return components
+
     async def get_sendable_data(self, ctx: commands.Context) -> dict:
         """
         Gets a dictionary of sendable objects to unpack for the :method:`start` method.
@@ -164,18 +179,11 @@ class Menu(MenuDisplayable):
                 if output:
                     output_strings.append(f"\N{BULLET} {output}")
                 style = (ButtonStyle.SECONDARY if isinstance(i._callback, Menu) else None) or i._button_style or ButtonStyle.PRIMARY
-                buttons.append(Button(
-                    i.component_display,
-                    custom_id=i.component_display,
-                    style=style,
-                ))
+                buttons.append((i.component_display, style,))
         ctx.database = None
 
-        # Add a done button
-        buttons.append(Button("Done", custom_id="Done", style=ButtonStyle.SUCCESS))
-
         # Output
-        components = MessageComponents.add_buttons_with_rows(*buttons)
+        components = self._get_components(tuple(buttons))
         embed = discord.Embed(colour=0xffffff)
         embed.description = "\n".join(output_strings) or "No options added."
         return {
@@ -0,0 +1,221 @@
+import asyncio
+import collections
+import logging
+import typing
+
+
+class QueuedEdit(object):
+    """
+    An edit that's been queued via :func:`MessageStateCache.queue_edit`. Awaiting this waits for
+    the edit to be sent, raising anything that the edit raised - cancelling the wait doesn't
+    cancel the edit.
+
+    Attributes:
+        future (asyncio.Future): The future for the edit that this was merged into, which is
+            shared with the other edits merged into it.
+        awaited (bool): Whether or not anything has awaited the edit.
+    """
+
+    __slots__ = ('future', 'awaited',)
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.awaited = False
+
+    def __await__(self):
+        self.awaited = True
+        return asyncio.shield(self.future).__await__()
+
+
+class MessageStateCache(object):
+    """
+    Keeps the last payload that the bot sent for each of its recent messages, so that edits can
+    skip the fields (or whole requests) that wouldn't change anything, and coalesces bursts of edits
+    to the same message into a single trailing edit. Provided in your bot object at
+    :attr:`voxelbotutils.MinimalBot.message_states`.
+
+    Only the fields that have gone through :code:`send` or :code:`edit` are known, so an edit made
+    elsewhere (eg by another process) isn't seen - pass :code:`force=True` to
+    :func:`queue_edit` or clear the message with :func:`invalidate` if that's a concern.
+    """
+
+    DIFFED_FIELDS: typing.Tuple[str, ...] = ("content", "embeds", "components", "flags",)  #: The edit fields that are compared.
+    MAX_SIZE: int = 1_000  #: The max number of messages to keep the state of.
+    logger: logging.Logger = logging.getLogger("vbu.message_states")
+
+    def __init__(self, bot):
+        """:meta private:"""
+
+        self.bot = bot
+
+        # message_id: {field: payload value}
+        self._states: typing.Dict[int, typing.Dict[str, typing.Any]] = collections.OrderedDict()
+
+        # message_id: (merged fields, future, queued edits), and the tasks sending them
+        self._queued_edits: typing.Dict[int, typing.Tuple[dict, asyncio.Future, typing.List[QueuedEdit]]] = {}
+        self._edit_tasks: typing.Dict[int, asyncio.Task] = {}
+
+        # Listen for the raw events
+        bot.add_raw_event_handler("MESSAGE_DELETE", self._handle_message_delete)
+        bot.add_raw_event_handler("MESSAGE_DELETE_BULK", self._handle_message_delete)
+
+    @staticmethod
+    def _normalise(field: str, value: typing.Any) -> typing.Any:
+        """
+        Make empty values for a field compare equal, as they all mean the same thing to Discord.
+        """
+
+        if field in ("embeds", "components"):
+            return value or []
+        if field == "content":
+            return value or None
+        return value
+
+    def set(self, message_id: int, fields: dict, *, replace: bool = False) -> None:
+        """
+        Store the fields that have been sent for a message.
+
+        Args:
+            message_id (int): The ID of the message.
+            fields (dict): The payload fields that were sent. Anything not in :attr:`DIFFED_FIELDS`
+                is ignored.
+            replace (bool, optional): Whether the fields are the message's entire state (ie it's a
+                new message), in which case the missing fields are stored as empty.
+
+        :meta private:
+        """
+
+        if replace:
+            state = {i: self._normalise(i, fields.get(i)) for i in self.DIFFED_FIELDS if i != "flags"}
+        else:
+            state = self._states.get(message_id, {})
+            for field in self.DIFFED_FIELDS:
+                if field in fields:
+                    state[field] = self._normalise(field, fields[field])
+        self._states[message_id] = state
+        self._states.move_to_end(message_id)
+        while len(self._states) > self.MAX_SIZE:
+            self._states.popitem(last=False)
+
+    def invalidate(self, message_id: int) -> None:
+        """
+        Forget the stored state of a message, so that its next edit is sent in full.
+
+        Args:
+            message_id (int): The ID of the message.
+        """
+
+        self._states.pop(message_id, None)
+
+    def diff(self, message_id: int, fields: dict) -> dict:
+        """
+        Remove the fields from an edit payload that are the same as what was last sent for the message.
+
+        Args:
+            message_id (int): The ID of the message.
+            fields (dict): The edit payload.
+
+        Returns:
+            dict: The payload with the unchanged fields removed.
+
+        :meta private:
+        """
+
+        state = self._states.get(message_id)
+        if not state:
+            return fields
+        changed = {}
+        for field, value in fields.items():
+            try:
+                last = state[field]
+            except KeyError:
+                changed[field] = value
+                continue
+            normalised = self._normalise(field, value)
+            if normalised is not last and normalised != last:
+                changed[field] = value
+        return changed
+
+    def queue_edit(self, message, *, force: bool = False, **fields) -> 'QueuedEdit':
+        """
+        Edit a message, merging the edit into any that's already waiting to be sent for it. The first
+        edit is sent straight away, and any made while it's being sent are merged (with the later
+        fields taking priority) into a single trailing edit, so a burst of clicks on a view only ever
+        makes two requests.
+
+        Args:
+            message (discord.Message): The message to edit.
+            force (bool, optional): Whether to send the edit in full, even if the fields haven't changed.
+            **fields: The fields to pass to :func:`discord.Message.edit`.
+
+        Returns:
+            QueuedEdit: An awaitable that completes once the edit (or the trailing edit it was merged
+            into) has been sent. This doesn't need to be awaited - if an edit fails and none of the
+            edits merged into it were awaited then the error is logged instead.
+        """
+
+        if force:
+            self.invalidate(message.id)
+        try:
+            queued_fields, future, edits = self._queued_edits[message.id]
+        except KeyError:
+            future = self.bot.loop.create_future()
+            future.add_done_callback(self._retrieve_exception)
+            queued_fields = {}
+            edits = []
+            self._queued_edits[message.id] = (queued_fields, future, edits,)
+
+        # Merge in the new fields, making sure that an embed and a list of embeds don't clash
+        if "embed" in fields:
+            queued_fields.pop("embeds", None)
+        if "embeds" in fields:
+            queued_fields.pop("embed", None)
+        queued_fields.update(fields)
+
+        # Start sending them if we aren't already
+        if message.id not in self._edit_tasks:
+            self._edit_tasks[message.id] = self.bot.loop.create_task(self._send_queued_edits(message))
+        edit = QueuedEdit(future)
+        edits.append(edit)
+        return edit
+
+    @staticmethod
+    def _retrieve_exception(future: asyncio.Future) -> None:
+        """
+        Mark a future's exception as retrieved - failed edits that nobody awaited are logged
+        by :func:`_send_queued_edits` instead.
+        """
+
+        if not future.cancelled():
+            future.exception()
+
+    async def _send_queued_edits(self, message) -> None:
+        """
+        Send the queued edits for a message one at a time until there are none left.
+        """
+
+        try:
+            while True:
+                try:
+                    fields, future, edits = self._queued_edits.pop(message.id)
+                except KeyError:
+                    return
+                try:
+                    await message.edit(**fields)
+                except Exception as e:
+                    if not any(i.awaited for i in edits):
+                        self.logger.warning(f"Failed to edit message {message.id}", exc_info=e)
+                    future.set_exception(e)
+                else:
+                    future.set_result(None)
+        finally:
+            self._edit_tasks.pop(message.id, None)
+
+    def _handle_message_delete(self, payload: dict) -> None:
+        """
+        Forget messages that have been deleted.
+        """
+
+        data = payload['d']
+        for message_id in data.get('ids') or (data['id'],):
+            self._states.pop(int(message_id), None)
@@ -1,12 +1,18 @@
 import typing
 import asyncio
+import collections
 import inspect
+import logging
+import time
+import uuid
 
 import discord
 from discord.ext import commands
 
 from .context_embed import Embed
 from .interactions.components import MessageComponents, Button, ButtonStyle, ActionRow
+from .interactions.component_handlers import make_custom_id
+from .sql_page_source import SQLPageSource
 
 
 class Paginator(object):
@@ -33,15 +39,47 @@ class Paginator(object):
 
         p = voxelbotutils.Paginator(my_list, formatter=my_formatter)
         await p.start(ctx)
+
+        # Stateless paginators return straight away, rather than waiting on clicks - the
+        # page number is kept in the buttons' custom IDs
+        await p.start(ctx, stateless=True)
+
+    Stateless paginators still need the paginator object (and so its data and formatter) to build
+    a page, and that's kept in memory by the process that started it. A click that's handled by another
+    cluster, or that comes in after a restart, disables the paginator's buttons rather than changing the page.
+
+    Pages from functions are kept in an LRU cache that's shared between every paginator, keyed by
+    the data source (or the given :code:`cache_key`), so paginators over the same source reuse
+    each other's pages. The next page of a generator or function is fetched in the background while
+    the current page is being sent. For paginating through database tables, see
+    :class:`voxelbotutils.SQLPageSource`.
     """
 
+    PAGE_CACHE_SIZE: int = 256  #: The max number of pages kept in the shared page cache.
+    PAGE_CACHE_TTL: float = 60.0  #: How long pages are kept in the shared page cache, in seconds.
+    MAX_STATELESS_PAGINATORS: int = 1_000  #: The max number of stateless paginators that can be active at once.
+    CUSTOM_ID_PREFIX: str = "VBUPaginator"
+    logger: logging.Logger = logging.getLogger("vbu.paginator")
+
+    # (cache_key, page_number): (expiry time, page)
+    _shared_page_cache: typing.Dict[typing.Tuple[typing.Hashable, int], typing.Tuple[float, typing.Any]] = collections.OrderedDict()
+
+    # paginator_id: (expiry time, paginator) - this is per process, so clicks that another process
+    # gets (or that come in after a restart) can't find their paginator
+    _stateless_paginators: typing.Dict[str, typing.Tuple[float, 'Paginator']] = collections.OrderedDict()
+
+    # (start disabled, next disabled, end disabled): frozen navigation components
+    _shared_nav_components: typing.Dict[typing.Tuple[bool, bool, bool], MessageComponents] = {}
+
     def __init__(
             self, data: typing.Union[typing.Sequence, typing.Generator, typing.Callable[[int], typing.Any]], *,
             per_page: int = 10,
             formatter: typing.Callable[
                 ['Paginator', typing.Sequence[typing.Any]], typing.Union[str, discord.Embed, dict]
             ] = None,
-            remove_reaction: bool = False):
+            remove_reaction: bool = False,
+            cache_key: typing.Hashable = None,
+            prefetch: bool = True):
         """
         Args:
             data (typing.Union[typing.Sequence, typing.Generator, typing.Callable[[int], typing.Any]]): The
@@ -55,14 +93,34 @@ class Paginator(object):
             formatter (typing.Callable[['Paginator', typing.Sequence[typing.Any]], typing.Union[str, discord.Embed, dict]], optional): A
                 function taking the paginator instance and a list of things to display, returning a dictionary of kwargs that get passed
                 directly into a :func:`discord.Message.edit`.
+            cache_key (typing.Hashable, optional): A key for the data source that's used in the shared page cache.
+                Defaults to the given function itself - if your function is made fresh for each paginator (eg a lambda
+                or closure) then give a key here to share pages between paginators.
+            prefetch (bool, optional): Whether or not to fetch the next page of a generator in the background
+                while the current page is being shown.
         """
+
+        # Generator functions need to be called before we can iterate over them
+        if inspect.isgeneratorfunction(data) or inspect.isasyncgenfunction(data):
+            data = data()
+
         self.data = data
         self.per_page = per_page
         self.formatter = formatter
         if self.formatter is None:
             self.formatter = self.default_list_formatter
         self.current_page = None
-        self._page_cache = {}
+        self.cache_key = cache_key if cache_key is not None else data
+        self.prefetch = prefetch
+        self.id = uuid.uuid4().hex[:12]
+
+        # Pages taken from a generator can't be made again, so they're kept per paginator
+        self._generated_pages = []
+        self._generator_exhausted = False
+        self._generator_lock = asyncio.Lock()
+        self._prefetch_task = None
+        self._prefetch_page_number = None
+        self._stateless_timeout = None
 
         self.max_pages = '?'
         self._data_is_generator = any((
@@ -74,6 +132,7 @@ class Paginator(object):
         self._data_is_function = any((
             inspect.isfunction(self.data),
             inspect.iscoroutine(self.data),
+            isinstance(self.data, SQLPageSource),
         ))
         self._data_is_iterable = not (self._data_is_generator or self._data_is_function)
         if self._data_is_iterable:
@@ -84,13 +143,124 @@ class Paginator(object):
 
         self._message = None
 
-    async def _edit_message(self, ctx, *args, **kwargs):
+    async def _edit_message(self, ctx, *args, wait: bool = True, **kwargs):
+        """
+        Send the paginator's message, or edit it if it's already been sent. Edits are queued so that
+        a burst of clicks is coalesced into a single trailing edit, and if :code:`wait` is false then
+        this returns the queued edit as soon as it's queued.
+        """
+
         if self._message is None:
             self._message = await ctx.send(*args, **kwargs)
-        else:
-            await self._message.edit(*args, **kwargs)
+            return None
+        edit = ctx.bot.message_states.queue_edit(self._message, **kwargs)
+        if wait:
+            await edit
+            return None
+        return edit
+
+    def _format_page(self, items: typing.Any) -> dict:
+        """
+        Run the formatter on some page items, giving back message kwargs.
+        """
+
+        payload = self.formatter(self, items)
+        if isinstance(payload, discord.Embed):
+            payload = {"embed": payload}
+        elif isinstance(payload, str):
+            payload = {"content": payload}
+
+        # Set a default for these things
+        payload.setdefault("content", None)
+        payload.setdefault("embed", None)
+        return payload
+
+    def _get_components(self, author_id: int = None) -> MessageComponents:
+        """
+        Get the navigation components for the current page. If an author ID is given then the
+        components are made for a stateless paginator, with the page in the custom IDs.
+        """
 
-    async def start(self, ctx: commands.Context, *, timeout: float = 120):
+        # Work out which buttons are disabled
+        at_start = self.current_page == 0
+        next_disabled = self.max_pages != "?" and self.current_page >= self.max_pages - 1
+        end_disabled = self.max_pages == "?" or self.current_page >= self.max_pages - 1
+
+        # Stateful paginators all have the same custom IDs, so their components are shared
+        if author_id is None:
+            key = (at_start, next_disabled, end_disabled,)
+            try:
+                return self._shared_nav_components[key]
+            except KeyError:
+                components = self._make_components(lambda action: action, *key).freeze()
+                self._shared_nav_components[key] = components
+                return components
+
+        def custom_id(action):
+            return make_custom_id(self.CUSTOM_ID_PREFIX, self.id, action, self.current_page, author_id)
+        return self._make_components(custom_id, at_start, next_disabled, end_disabled)
+
+    @staticmethod
+    def _make_components(
+            custom_id: typing.Callable[[str], str], at_start: bool,
+            next_disabled: bool, end_disabled: bool) -> MessageComponents:
+        """
+        Make a set of navigation components.
+        """
+
+        return MessageComponents(
+            ActionRow(
+                Button(
+                    label="Start",
+                    custom_id=custom_id("START"),
+                    disabled=at_start,
+                ),
+                Button(
+                    label="Previous",
+                    custom_id=custom_id("PREVIOUS"),
+                    style=ButtonStyle.SECONDARY,
+                    disabled=at_start,
+                ),
+                Button(
+                    label="Stop",
+                    custom_id=custom_id("STOP"),
+                    style=ButtonStyle.DANGER,
+                ),
+                Button(
+                    label="Next",
+                    custom_id=custom_id("NEXT"),
+                    style=ButtonStyle.SECONDARY,
+                    disabled=next_disabled,
+                ),
+                Button(
+                    label="End",
+                    custom_id=custom_id("END"),
+                    disabled=end_disabled,
+                ),
+            )
+        )
+
+    def _get_new_page_number(self, action: str, page_number: int) -> typing.Union[int, str]:
+        """
+        Work out the page number that a button takes you to, clamped to the valid pages.
+        """
+
+        page_number = {
+            "START": lambda i: 0,
+            "PREVIOUS": lambda i: i - 1,
+            "STOP": lambda i: "STOP",
+            "NEXT": lambda i: i + 1,
+            "END": lambda i: self.max_pages,
+        }[action](page_number)
+        if page_number == "STOP":
+            return page_number
+        if self.max_pages != "?" and page_number >= self.max_pages:
+            page_number = self.max_pages - 1
+        elif page_number < 0:
+            page_number = 0
+        return page_number
+
+    async def start(self, ctx: commands.Context, *, timeout: float = 120, stateless: bool = False):
         """
         Start and handle a paginator instance.
 
@@ -98,13 +268,22 @@ class Paginator(object):
             ctx (commands.Context): The context instance for the called command.
             timeout (float, optional): How long you should wait between getting a reaction
                 and timing out.
+            stateless (bool, optional): Whether or not to run the paginator without waiting on clicks.
+                The page number is kept in the buttons' custom IDs and clicks are handled by the bot's
+                :class:`component router<voxelbotutils.interactions.ComponentRouter>`, so no coroutine is
+                kept alive between clicks. Stateless paginators expire after the given timeout, and only
+                work in the process that started them.
         """
 
         # Set our initial values
         self.current_page = 0
+        if isinstance(self.data, SQLPageSource):
+            self.max_pages = await self.data.get_max_pages() or "?"
         if self.max_pages == 0:
             await ctx.send("There's no data to be shown.")
             return
+        if stateless:
+            return await self._start_stateless(ctx, timeout=timeout)
 
         # Loop the reaction handler
         last_payload = None
@@ -117,64 +296,33 @@ class Paginator(object):
                 await self._edit_message(ctx, content="There's no data to be shown.")
                 break
 
-            # Format the page data
-            payload = self.formatter(self, items)
-            if isinstance(payload, discord.Embed):
-                payload = {"embed": payload}
-            elif isinstance(payload, str):
-                payload = {"content": payload}
-
-            # Set a default for these things
-            payload.setdefault("content", None)
-            payload.setdefault("embed", None)
-
-            # Work out what components to show
-            components = MessageComponents(
-                ActionRow(
-                    Button(
-                        label="Start",
-                        custom_id="START",
-                        disabled=self.current_page == 0,
-                    ),
-                    Button(
-                        label="Previous",
-                        custom_id="PREVIOUS",
-                        style=ButtonStyle.SECONDARY,
-                        disabled=self.current_page == 0,
-                    ),
-                    Button(
-                        label="Stop",
-                        custom_id="STOP",
-                        style=ButtonStyle.DANGER,
-                    ),
-                    Button(
-                        label="Next",
-                        custom_id="NEXT",
-                        style=ButtonStyle.SECONDARY,
-                        disabled=self.max_pages != "?" and self.current_page >= self.max_pages - 1,
-                    ),
-                    Button(
-                        label="End",
-                        custom_id="END",
-                        disabled=self.max_pages == "?" or self.current_page >= self.max_pages - 1,
-                    ),
-                )
-            )
+            # Format the page data and work out what components to show
+            payload = self._format_page(items)
+            components = self._get_components()
 
-            # See if the content is unchanged
+            # See if the content is unchanged, fetching the next page while we edit - we
+            # don't wait for edits so that we're listening for the next click straight away
+            self._prefetch_next_page()
+            edit = None
             if payload != last_payload:
-                await self._edit_message(ctx, **payload, components=components)
+                edit = await self._edit_message(ctx, **payload, components=components, wait=False)
 
             # See if we want to bother paginating
             last_payload = payload
             if self.max_pages == 1:
                 return
 
-            # Wait for reactions to be added by the user
+            # Wait for reactions to be added by the user, stopping if the message has been deleted
             component_payload = None
+            check = lambda p: p.user.id == ctx.author.id
+            waiter = asyncio.ensure_future(ctx.bot.wait_for_component_interaction(self._message, check=check, timeout=timeout))
+            if edit is not None:
+                await asyncio.wait([waiter, edit.future], return_when=asyncio.FIRST_COMPLETED)
+                if edit.future.done() and not edit.future.cancelled() and isinstance(edit.future.exception(), discord.NotFound):
+                    waiter.cancel()
+                    return
             try:
-                check = lambda p: p.user.id == ctx.author.id and p.message.id == self._message.id
-                component_payload = await ctx.bot.wait_for("component_interaction", check=check, timeout=timeout)
+                component_payload = await waiter
                 await component_payload.defer_update()
             except asyncio.TimeoutError:
                 break
@@ -183,25 +331,85 @@ class Paginator(object):
             if component_payload is None:
                 self.current_page = "STOP"
             else:
-                self.current_page = {
-                    "START": lambda i: 0,
-                    "PREVIOUS": lambda i: i - 1,
-                    "STOP": lambda i: "STOP",
-                    "NEXT": lambda i: i + 1,
-                    "END": lambda i: self.max_pages,
-                }[str(component_payload.component.custom_id)](self.current_page)
+                self.current_page = self._get_new_page_number(
+                    str(component_payload.component.custom_id),
+                    self.current_page,
+                )
             if self.current_page == "STOP":
                 break
 
-            # Make sure the page number is still valid
-            if self.max_pages != "?" and self.current_page >= self.max_pages:
-                self.current_page = self.max_pages - 1
-            elif self.current_page < 0:
-                self.current_page = 0
-
         # Let us break from the loop
         ctx.bot.loop.create_task(self._edit_message(ctx, components=components.disable_components()))
 
+    async def _start_stateless(self, ctx: commands.Context, *, timeout: float):
+        """
+        Send the first page of a stateless paginator and register it with the component router.
+        """
+
+        # Send the first page
+        try:
+            items = await self.get_page(self.current_page)
+        except (KeyError, IndexError):
+            await ctx.send("There's no data to be shown.")
+            return
+        payload = self._format_page(items)
+        if self.max_pages == 1:
+            await self._edit_message(ctx, **payload, components=self._get_components().disable_components())
+            return
+        self._prefetch_next_page()
+        await self._edit_message(ctx, **payload, components=self._get_components(ctx.author.id))
+
+        # Store the paginator so that its clicks can be found, dropping the oldest ones
+        # if we've got too many
+        ctx.bot.component_router.add_handler(self.CUSTOM_ID_PREFIX, self._handle_stateless_component)
+        self._stateless_timeout = timeout
+        self._stateless_paginators[self.id] = (time.monotonic() + timeout, self)
+        while len(self._stateless_paginators) > self.MAX_STATELESS_PAGINATORS:
+            self._stateless_paginators.popitem(last=False)
+
+    @classmethod
+    async def _handle_stateless_component(
+            cls, payload, paginator_id: str, action: str, page_number: str, author_id: str):
+        """
+        Handle a click on a stateless paginator's components.
+
+        :meta private:
+        """
+
+        # Make sure it's the right person
+        if payload.user.id != int(author_id):
+            return await payload.defer_update()
+
+        # Get the paginator
+        expiry, paginator = cls._stateless_paginators.get(paginator_id, (0, None))
+        if paginator is None or expiry < time.monotonic():
+            cls._stateless_paginators.pop(paginator_id, None)
+            components = getattr(payload.message, "components", None)
+            if components:
+                return await payload.update_message(components=components.disable_components())
+            return await payload.defer_update()
+
+        # See if they want to stop
+        new_page = paginator._get_new_page_number(action, int(page_number))
+        if new_page == "STOP":
+            cls._stateless_paginators.pop(paginator_id, None)
+            paginator.current_page = int(page_number)
+            return await payload.update_message(components=paginator._get_components().disable_components())
+
+        # Get the new page, pushing back the paginator's expiry
+        cls._stateless_paginators[paginator_id] = (time.monotonic() + paginator._stateless_timeout, paginator)
+        cls._stateless_paginators.move_to_end(paginator_id)
+        paginator.current_page = new_page
+        try:
+            items = await paginator.get_page(new_page)
+        except (KeyError, IndexError):
+            return await payload.update_message(content="There's no data to be shown.", embed=None, components=None)
+        paginator._prefetch_next_page()
+        await payload.update_message(
+            **paginator._format_page(items),
+            components=paginator._get_components(author_id),
+        )
+
     async def get_page(self, page_number: int) -> typing.List[typing.Any]:
         """
         Get a list of items that appear for a given page.
@@ -213,27 +421,137 @@ class Paginator(object):
             typing.List[typing.Any]: The list of items that would be on the page.
         """
 
+        # Generators
+        if self._data_is_generator:
+            await self._generate_pages(page_number + 1)
+            if page_number < len(self._generated_pages):
+                return self._generated_pages[page_number]
+            self.current_page = self.max_pages - 1
+            return self._generated_pages[self.current_page]
+
+        # Sequences
+        if not self._data_is_function:
+            return self.data[page_number * self.per_page: (page_number + 1) * self.per_page]
+
+        # Functions, going via the shared cache (and waiting for the page if it's being prefetched)
+        prefetch_task = self._prefetch_task
+        if self._prefetch_page_number == page_number and prefetch_task is not None and not prefetch_task.done():
+            await asyncio.wait([prefetch_task])
+        while True:
+            cached = self._get_cached_page(page_number)
+            if cached is not None:
+                return cached[0]
+            try:
+                return await self._fetch_function_page(page_number)
+            except (StopIteration, StopAsyncIteration):
+                pass
+
+            # We've gone past the end, so fall back to the last page - an SQL page source will have
+            # counted its rows, so we can go straight there rather than stepping back a page at a time
+            last_page = page_number
+            if isinstance(self.data, SQLPageSource) and self.data.max_pages is not None:
+                last_page = min(self.data.max_pages, page_number)
+            self.max_pages = last_page
+            if last_page == 0:
+                raise IndexError("The function gave no pages.")
+            page_number = self.current_page = last_page - 1
+
+    async def _fetch_function_page(self, page_number: int) -> typing.Any:
+        """
+        Get a page from the data function and add it to the shared cache.
+        """
+
+        v = self.data(page_number)
+        if inspect.isawaitable(v):
+            v = await v
+        self._set_cached_page(page_number, v)
+        if isinstance(self.data, SQLPageSource):
+            self.max_pages = self.data.max_pages or "?"
+        return v
+
+    def _get_cached_page(self, page_number: int) -> typing.Optional[typing.Tuple[typing.Any]]:
+        """
+        Get a page from the shared cache, wrapped in a tuple so that falsy pages can be cached.
+        """
+
+        key = (self.cache_key, page_number)
         try:
-            return self._page_cache[page_number]
-        except KeyError:
-            pass
+            expiry, page = self._shared_page_cache[key]
+        except (KeyError, TypeError):
+            return None
+        if expiry < time.monotonic():
+            del self._shared_page_cache[key]
+            return None
+        self._shared_page_cache.move_to_end(key)
+        return (page,)
+
+    def _set_cached_page(self, page_number: int, page: typing.Any) -> None:
+        """
+        Add a page to the shared cache, dropping the least recently used pages if it's full.
+        """
+
+        key = (self.cache_key, page_number)
         try:
-            if inspect.isasyncgenfunction(self.data) or inspect.isasyncgen(self.data):
-                v = await self.data.__anext__()
-            elif inspect.isgeneratorfunction(self.data) or inspect.isgenerator(self.data):
-                v = next(self.data)
-            elif inspect.iscoroutinefunction(self.data):
-                v = await self.data(page_number)
-            elif inspect.isfunction(self.data):
-                v = self.data(page_number)
-            else:
-                v = self.data[page_number * self.per_page: (page_number + 1) * self.per_page]
-            self._page_cache[page_number] = v
-        except (StopIteration, StopAsyncIteration):
-            self.max_pages = page_number
-            page_number -= 1
-            self.current_page -= 1
-        return self._page_cache[page_number]
+            self._shared_page_cache[key] = (time.monotonic() + self.PAGE_CACHE_TTL, page)
+        except TypeError:
+            return  # Unhashable cache key
+        self._shared_page_cache.move_to_end(key)
+        while len(self._shared_page_cache) > self.PAGE_CACHE_SIZE:
+            self._shared_page_cache.popitem(last=False)
+
+    async def _generate_pages(self, page_count: int) -> None:
+        """
+        Take pages from the generator until we have the given number of them or it runs out.
+        """
+
+        async with self._generator_lock:
+            while len(self._generated_pages) < page_count and not self._generator_exhausted:
+                try:
+                    if inspect.isasyncgen(self.data):
+                        v = await self.data.__anext__()
+                    else:
+                        v = next(self.data)
+                except (StopIteration, StopAsyncIteration):
+                    self._generator_exhausted = True
+                    self.max_pages = len(self._generated_pages)
+                    break
+                self._generated_pages.append(v)
+        if not self._generated_pages:
+            raise IndexError("The generator gave no pages.")
+
+    def _prefetch_next_page(self) -> None:
+        """
+        Start fetching the page after the current one in the background if the data is a generator
+        or a function, so that it's ready by the time someone clicks "Next".
+        """
+
+        # See if there's anything to fetch
+        next_page = self.current_page + 1
+        if not self.prefetch or self._data_is_iterable:
+            return
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            return
+        if self._data_is_generator:
+            if self._generator_exhausted or len(self._generated_pages) > next_page:
+                return
+        else:
+            if self.max_pages != "?" and next_page >= self.max_pages:
+                return
+            if self._get_cached_page(next_page) is not None:
+                return
+
+        async def prefetch():
+            try:
+                if self._data_is_generator:
+                    await self._generate_pages(next_page + 1)
+                else:
+                    await self._fetch_function_page(next_page)
+            except (StopIteration, StopAsyncIteration):
+                self.max_pages = next_page
+            except Exception as e:
+                self.logger.warning(f"Failed to prefetch paginator page - {e}")
+        self._prefetch_page_number = next_page
+        self._prefetch_task = asyncio.ensure_future(prefetch())
 
     @staticmethod
     def default_list_formatter(m, d):
@@ -113,17 +113,19 @@ class RedisConnection(object):
         self.logger.debug(f"Publishing message to channel {channel}: {message}")
         return await self.conn.publish(channel, message)
 
-    async def set(self, key: str, value: str) -> None:
+    async def set(self, key: str, value: str, *, expire: int = 0) -> None:
         """
         Sets a key/value pair in the redis DB.
 
         Args:
             key (str): The key you want to set the value of
             value (str): The data you want to set the key to
+            expire (int, optional): The number of seconds until the key expires. If not set,
+                the key won't expire.
         """
 
         self.logger.debug(f"Setting Redis key:value pair with {key}:{value}")
-        return await self.conn.set(key, value)
+        return await self.conn.set(key, value, expire=expire)
 
     async def get(self, key: str) -> str:
         """
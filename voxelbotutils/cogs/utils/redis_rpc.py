@@ -0,0 +1,376 @@
+import asyncio
+import logging
+import os
+import typing
+import uuid
+
+from .redis import RedisConnection, RedisChannelHandler
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class RedisRPCResponse(object):
+    """
+    A single cluster's reply to a call made via :func:`voxelbotutils.RedisRPC.call`.
+
+    Attributes:
+        cluster_id (str): The ID of the cluster that replied.
+        shard_ids (typing.List[int]): The shard IDs that the replying cluster is running.
+        data (typing.Any): The data returned by the handler.
+        error (typing.Optional[str]): The error raised by the handler, if there was one.
+    """
+
+    __slots__ = ('cluster_id', 'shard_ids', 'data', 'error',)
+
+    def __init__(self, cluster_id: str, shard_ids: typing.List[int], data: typing.Any = None, error: str = None):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.data = data
+        self.error = error
+
+    def __repr__(self):
+        return f"<RedisRPCResponse cluster_id={self.cluster_id!r} shard_ids={self.shard_ids!r} error={self.error!r}>"
+
+    @classmethod
+    def from_payload(cls, payload: dict):
+        """:meta private:"""
+
+        return cls(
+            cluster_id=payload['cluster_id'],
+            shard_ids=payload['shard_ids'],
+            data=payload.get('data'),
+            error=payload.get('error'),
+        )
+
+
+class RedisRPC(object):
+    """
+    A request/response layer built on top of :class:`voxelbotutils.RedisConnection` that lets you
+    call a named handler on every running cluster of your bot (or only the cluster running a given shard),
+    and gather up the replies. Provided in your bot object at :attr:`Bot.rpc` for your convenience,
+    and only started if Redis is :attr:`enabled<BotConfig.redis.enabled>`.
+
+    The built-in handlers are :code:`guild_count`, :code:`member_count`, :code:`latency`, :code:`memory`,
+    and :code:`stats` (which returns all of the others in one dictionary).
+
+    Examples:
+
+        ::
+
+            # Add a handler
+            @bot.rpc.handler("ping")
+            async def ping(**kwargs):
+                return "pong"
+
+            # Call it on every cluster
+            responses = await bot.rpc.call("ping", timeout=2.0)
+
+            # Call it only on the cluster running shard 5
+            responses = await bot.rpc.call("ping", shard_id=5)
+
+            # Get an exact guild count
+            guild_count = await bot.rpc.sum("guild_count")
+    """
+
+    connection = RedisConnection
+    logger: logging.Logger = logging.getLogger("vbu.redis.rpc")
+
+    def __init__(self, bot):
+        """:meta private:"""
+
+        self.bot = bot
+        self.cluster_id = uuid.uuid4().hex
+        self.handlers: typing.Dict[str, typing.Callable] = {}
+        self.request_handler: RedisChannelHandler = None
+        self.response_handler: RedisChannelHandler = None
+        self._ready = asyncio.Event()
+        self._start_task = None
+        self._pending: typing.Dict[str, typing.Tuple[asyncio.Future, typing.List[RedisRPCResponse], typing.Optional[int]]] = {}
+
+        # Add our built-in handlers
+        self.add_handler("guild_count", self._guild_count_handler)
+        self.add_handler("member_count", self._member_count_handler)
+        self.add_handler("latency", self._latency_handler)
+        self.add_handler("memory", self._memory_handler)
+        self.add_handler("stats", self._stats_handler)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether or not the RPC layer is usable (ie Redis is enabled in the config).
+        """
+
+        return bool(self.bot.config.get('redis', {}).get('enabled', False))
+
+    @property
+    def shard_ids(self) -> typing.List[int]:
+        """
+        The shard IDs that this cluster is running.
+        """
+
+        return list(self.bot.shard_ids or range(self.bot.shard_count or 1))
+
+    @property
+    def request_channel(self) -> str:
+        """:meta private:"""
+
+        return f"VBURPCRequest:{self.bot.user.id}"
+
+    @property
+    def response_channel(self) -> str:
+        """:meta private:"""
+
+        return f"VBURPCResponse:{self.bot.user.id}:{self.cluster_id}"
+
+    def add_handler(self, name: str, callback: typing.Callable) -> None:
+        """
+        Adds a handler that can be called via :func:`call`. The handler will be given any
+        kwargs that the caller passed, and its return value must be JSON serializable.
+
+        Args:
+            name (str): The name of the handler.
+            callback (typing.Callable): The function (or coroutine function) to run.
+        """
+
+        self.handlers[name] = callback
+
+    def remove_handler(self, name: str) -> None:
+        """
+        Removes a handler that was added via :func:`add_handler`.
+
+        Args:
+            name (str): The name of the handler.
+        """
+
+        self.handlers.pop(name, None)
+
+    def handler(self, name: str):
+        """
+        A decorator version of :func:`add_handler`.
+
+        Args:
+            name (str): The name of the handler.
+        """
+
+        def wrapper(func):
+            self.add_handler(name, func)
+            return func
+        return wrapper
+
+    def start(self) -> None:
+        """
+        Start listening for RPC requests and responses. This waits for the bot to be
+        ready before subscribing, as the channels are namespaced by the bot's user ID.
+        """
+
+        self._start_task = asyncio.get_event_loop().create_task(self._start())
+
+    async def _start(self):
+        """
+        Subscribe to our request and response channels.
+        """
+
+        await self.bot.wait_until_ready()
+        self.request_handler = RedisChannelHandler(self.request_channel, RedisRPC._handle_request)
+        self.request_handler.cog = self
+        self.response_handler = RedisChannelHandler(self.response_channel, RedisRPC._handle_response)
+        self.response_handler.cog = self
+        self.request_handler.start()
+        self.response_handler.start()
+        self._ready.set()
+        self.logger.info(f"Started cluster RPC with ID {self.cluster_id}")
+
+    async def stop(self) -> None:
+        """
+        Stop listening for RPC requests and responses.
+        """
+
+        if self._start_task:
+            self._start_task.cancel()
+        for channel_handler in (self.request_handler, self.response_handler):
+            if channel_handler is None:
+                continue
+            try:
+                await channel_handler.unsubscribe()
+            except Exception as e:
+                self.logger.error(e)
+            channel_handler.cancel()
+        self.request_handler = self.response_handler = None
+        self._ready.clear()
+
+        # Let anything waiting know that nothing else is coming in
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.set_result(None)
+
+    async def call(
+            self, name: str, *, shard_id: int = None, timeout: float = 5.0,
+            **kwargs) -> typing.List[RedisRPCResponse]:
+        """
+        Calls a handler on every cluster (or the cluster running a given shard) and
+        gathers the responses. This returns once either every shard is accounted for
+        or the timeout is reached, so a cluster that doesn't respond in time is just
+        missing from the returned list.
+
+        Args:
+            name (str): The name of the handler that you want to run.
+            shard_id (int, optional): The ID of the shard whose cluster should run the handler.
+                If not given, the handler is run on every cluster.
+            timeout (float, optional): How long to wait for responses for, including
+                any time spent waiting for the RPC layer to start up.
+            **kwargs: Arguments to be passed to the handler. Must be JSON serializable.
+
+        Returns:
+            typing.List[RedisRPCResponse]: The responses from each cluster, sorted by their shard IDs.
+
+        Raises:
+            NotImplementedError: Redis isn't enabled, so the RPC layer isn't running.
+            asyncio.TimeoutError: The RPC layer didn't finish starting up within the timeout.
+        """
+
+        if not self.enabled:
+            raise NotImplementedError("The Redis connection has been disabled.")
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+
+        # Store the future so our response handler can find it
+        request_id = uuid.uuid4().hex
+        future = loop.create_future()
+        responses = []
+        self._pending[request_id] = (future, responses, shard_id)
+
+        # Send the request and wait for our responses
+        try:
+            async with self.connection() as re:
+                await re.publish(self.request_channel, {
+                    "id": request_id,
+                    "name": name,
+                    "shard_id": shard_id,
+                    "kwargs": kwargs,
+                    "reply_to": self.response_channel,
+                })
+            await asyncio.wait([future], timeout=max(deadline - loop.time(), 0))
+        finally:
+            self._pending.pop(request_id, None)
+        return sorted(responses, key=lambda r: min(r.shard_ids or [0]))
+
+    async def sum(self, name: str, *, timeout: float = 5.0, **kwargs) -> typing.Optional[int]:
+        """
+        Calls a handler on every cluster and sums up the data returned, scaling the result up
+        by the total shard count if not every cluster replied in time.
+
+        Args:
+            name (str): The name of the handler that you want to run.
+            timeout (float, optional): How long to wait for responses for.
+            **kwargs: Arguments to be passed to the handler. Must be JSON serializable.
+
+        Returns:
+            typing.Optional[int]: The summed value, or :code:`None` if nobody responded.
+        """
+
+        responses = [i for i in await self.call(name, timeout=timeout, **kwargs) if i.error is None]
+        responding_shards = self.get_shard_ids(responses)
+        if not responding_shards:
+            return None
+        total = sum(i.data or 0 for i in responses)
+        shard_count = self.bot.shard_count or 1
+        if len(responding_shards) >= shard_count:
+            return total
+        return int((total / len(responding_shards)) * shard_count)
+
+    @staticmethod
+    def get_shard_ids(responses: typing.List[RedisRPCResponse]) -> typing.Set[int]:
+        """
+        Gets all of the shard IDs that are covered by a list of responses.
+
+        Args:
+            responses (typing.List[RedisRPCResponse]): The responses from :func:`call`.
+
+        Returns:
+            typing.Set[int]: The shard IDs that responded.
+        """
+
+        return {shard_id for response in responses for shard_id in response.shard_ids}
+
+    async def _handle_request(self, payload: dict):
+        """
+        Runs a requested handler and publishes the result back to the requesting cluster.
+        """
+
+        # See if the request is meant for us
+        shard_id = payload.get("shard_id")
+        if shard_id is not None and shard_id not in self.shard_ids:
+            return
+
+        # Run the handler
+        data, error = None, None
+        callback = self.handlers.get(payload['name'])
+        if callback is None:
+            error = f"No handler with name {payload['name']!r}"
+        else:
+            try:
+                data = callback(**payload.get("kwargs", {}))
+                if asyncio.iscoroutine(data):
+                    data = await data
+            except Exception as e:
+                self.logger.error(f"Error running RPC handler {payload['name']!r} - {e}")
+                error = f"{e.__class__.__name__}: {e}"
+
+        # And send it back
+        async with self.connection() as re:
+            await re.publish(payload['reply_to'], {
+                "id": payload['id'],
+                "cluster_id": self.cluster_id,
+                "shard_ids": self.shard_ids,
+                "data": data,
+                "error": error,
+            })
+
+    def _handle_response(self, payload: dict):
+        """
+        Stores a response for a pending call, resolving it if every shard has replied.
+        """
+
+        try:
+            future, responses, shard_id = self._pending[payload['id']]
+        except KeyError:
+            return  # We've already timed out
+        responses.append(RedisRPCResponse.from_payload(payload))
+        if future.done():
+            return
+        if shard_id is not None or len(self.get_shard_ids(responses)) >= (self.bot.shard_count or 1):
+            future.set_result(None)
+
+    def _guild_count_handler(self) -> int:
+        return len(self.bot.guilds)
+
+    def _member_count_handler(self) -> int:
+        return sum(i.member_count or 0 for i in self.bot.guilds)
+
+    def _latency_handler(self) -> typing.List[typing.Tuple[int, float]]:
+        try:
+            return [list(i) for i in self.bot.latencies]
+        except AttributeError:
+            return [[self.shard_ids[0], self.bot.latency]]
+
+    def _memory_handler(self) -> typing.Optional[int]:
+        try:
+            with open("/proc/self/statm") as a:
+                return int(a.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            pass
+        if resource is not None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1_024  # Peak rather than current, but close enough
+        return None
+
+    def _stats_handler(self) -> dict:
+        return {
+            "guild_count": self._guild_count_handler(),
+            "member_count": self._member_count_handler(),
+            "latency": self._latency_handler(),
+            "memory": self._memory_handler(),
+        }
@@ -140,11 +140,8 @@ class SettingsMenuOption(object):
         try:
             if reactions:
                 def check(payload):
-                    return all([
-                        payload.message.id == bot_message.id,
-                        payload.user.id == self.context.author.id,
-                    ])
-                payload = await self.context.bot.wait_for("component_interaction", timeout=120, check=check)
+                    return payload.user.id == self.context.author.id
+                payload = await self.context.bot.wait_for_component_interaction(bot_message, timeout=120, check=check)
                 await payload.defer_update()
                 content = str(payload.component.custom_id)
             else:
@@ -618,11 +615,8 @@ class SettingsMenu(object):
             # Get the reaction
             try:
                 def check(payload):
-                    return all([
-                        payload.message.id == message.id,
-                        payload.user.id == ctx.author.id,
-                    ])
-                payload = await ctx.bot.wait_for("component_interaction", check=check, timeout=timeout)
+                    return payload.user.id == ctx.author.id
+                payload = await ctx.bot.wait_for_component_interaction(message, check=check, timeout=timeout)
                 await payload.defer_update()
             except asyncio.TimeoutError:
                 break
@@ -1,11 +1,12 @@
 import typing
 import asyncio
-import aiohttp
 import enum
 import logging
 import time
 import json
 
+from .gateway import get_gateway_bot
+
 
 logger = logging.getLogger("vbu.sharder")
 
@@ -74,15 +75,8 @@ class ShardManagerServer(object):
             int: The maximum concurrency for the given bot.
         """
 
-        url = "https://discord.com/api/v9/gateway/bot"
-        headers = {
-            "Authorization": f"Bot {token}",
-        }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as r:
-                    data = await r.json()
-            logger.debug(data)
+            data = await get_gateway_bot(token)
             return data['session_start_limit']['max_concurrency']
         except Exception:
             logger.critical("Failed to get session start limit")
@@ -0,0 +1,159 @@
+import json
+import typing
+
+from .database import DatabaseConnection
+
+
+class SQLPageSource(object):
+    """
+    A page source for :class:`voxelbotutils.Paginator` that fetches pages from the database using
+    keyset pagination, so each page is a single indexed lookup from the end of the previous one,
+    rather than loading everything into a list or using an increasingly slow :code:`OFFSET`. Only
+    the ordering keys at the end of each seen page are kept between pages.
+
+    Examples:
+
+        ::
+
+            source = voxelbotutils.SQLPageSource(
+                "SELECT user_id, points FROM leaderboard WHERE guild_id=$1",
+                ctx.guild.id,
+                order_by=("points", "user_id"),
+                descending=True,
+                per_page=10,
+                count="approximate",
+            )
+            await voxelbotutils.Paginator(source, formatter=my_formatter).start(ctx)
+    """
+
+    COUNT_TYPES = (None, "exact", "approximate")
+
+    def __init__(
+            self, query: str, *args, order_by: typing.Union[str, typing.Sequence[str]],
+            descending: bool = False, per_page: int = 10, count: typing.Optional[str] = None):
+        """
+        Args:
+            query (str): The query to page through. This should be a :code:`SELECT` without an
+                :code:`ORDER BY` or :code:`LIMIT`, and must select the :code:`order_by` columns.
+            *args: The arguments for the query.
+            order_by (typing.Union[str, typing.Sequence[str]]): The column(s) to order the rows by. Together these
+                need to be unique for each row (eg add a primary key as the last column), or rows may be skipped.
+            descending (bool, optional): Whether or not to order the rows descending.
+            per_page (int, optional): The number of rows on each page.
+            count (typing.Optional[str], optional): How to work out the number of pages. :code:`None` leaves it
+                unknown until the last page is reached, :code:`"exact"` runs a :code:`COUNT`, and :code:`"approximate"`
+                uses the query planner's row estimate, which is much cheaper for big tables.
+
+        Raises:
+            ValueError: An invalid count type was given.
+        """
+
+        if count not in self.COUNT_TYPES:
+            raise ValueError(f"Count must be one of {self.COUNT_TYPES!r}")
+        self.query = query.strip().rstrip(";")
+        self.args = args
+        self.order_by = (order_by,) if isinstance(order_by, str) else tuple(order_by)
+        self.descending = descending
+        self.per_page = per_page
+        self.count = count
+        self.max_pages = None
+        self._max_pages_is_exact = False
+
+        # page_number: the order_by values of the last row on that page
+        self._page_ends: typing.Dict[int, tuple] = {}
+
+    @property
+    def _order_sql(self) -> str:
+        direction = "DESC" if self.descending else "ASC"
+        return ", ".join(f"{i} {direction}" for i in self.order_by)
+
+    def _build_page_query(self, page_number: int) -> typing.Tuple[str, list]:
+        """
+        Build the SQL for a given page, seeking from the end of the previous page if we know it,
+        and falling back to an offset if we don't (eg if someone's jumped to the last page).
+        """
+
+        args = list(self.args)
+        sql = f"SELECT * FROM ({self.query}) AS page_source"
+        previous_end = self._page_ends.get(page_number - 1)
+        if page_number > 0 and previous_end is not None:
+            placeholders = ", ".join(f"${i}" for i in range(len(args) + 1, len(args) + len(previous_end) + 1))
+            comparison = "<" if self.descending else ">"
+            sql += f" WHERE ({', '.join(self.order_by)}) {comparison} ({placeholders})"
+            args.extend(previous_end)
+            sql += f" ORDER BY {self._order_sql} LIMIT {self.per_page}"
+        else:
+            sql += f" ORDER BY {self._order_sql} LIMIT {self.per_page} OFFSET {page_number * self.per_page}"
+        return sql, args
+
+    async def get_max_pages(self) -> typing.Optional[int]:
+        """
+        Work out the number of pages, as set by the :code:`count` argument.
+
+        Returns:
+            typing.Optional[int]: The number of pages, or :code:`None` if it isn't being counted.
+        """
+
+        if self.count is None:
+            return self.max_pages
+        pages = await self._count_pages(exact=self.count == "exact")
+        if self.max_pages is None:
+            self.max_pages = pages
+            self._max_pages_is_exact = self.count == "exact"
+        return self.max_pages
+
+    async def _count_pages(self, *, exact: bool) -> int:
+        """
+        Count the number of pages, either exactly or from the query planner's row estimate.
+        """
+
+        async with DatabaseConnection() as db:
+            if exact:
+                rows = await db(f"SELECT COUNT(*) AS count FROM ({self.query}) AS page_source", *self.args)
+                row_count = rows[0]['count']
+            else:
+                rows = await db(f"EXPLAIN (FORMAT JSON) SELECT * FROM ({self.query}) AS page_source", *self.args)
+                plan = rows[0]['QUERY PLAN']
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                row_count = int(plan[0]['Plan']['Plan Rows'])
+        pages, left_over = divmod(row_count, self.per_page)
+        if left_over:
+            pages += 1
+        return pages
+
+    async def __call__(self, page_number: int) -> typing.List[dict]:
+        """
+        Get the rows for a given page.
+
+        Args:
+            page_number (int): The page number to get.
+
+        Returns:
+            typing.List[dict]: The rows on the page.
+
+        Raises:
+            StopAsyncIteration: There are no rows on the page. If this wasn't the first page then
+                the rows are counted exactly, so :attr:`max_pages` is the real number of pages.
+        """
+
+        sql, args = self._build_page_query(page_number)
+        async with DatabaseConnection() as db:
+            rows = await db(sql, *args)
+
+        # An empty page means we've gone past the end (eg the approximate count was too high), so
+        # count the rows properly rather than having the paginator step back one page at a time
+        if not rows:
+            self.max_pages = min(await self._count_pages(exact=True), page_number) if page_number else 0
+            self._max_pages_is_exact = True
+            raise StopAsyncIteration()
+
+        # Store where this page ends so the next page can seek from it, and fix up the page
+        # count if we've found the end (the approximate count can be wrong either way)
+        self._page_ends[page_number] = tuple(rows[-1][i] for i in self.order_by)
+        if len(rows) < self.per_page:
+            self.max_pages = page_number + 1
+            self._max_pages_is_exact = True
+        elif self.max_pages is not None and page_number >= self.max_pages - 1 and not self._max_pages_is_exact:
+            self.max_pages = None
+        return rows
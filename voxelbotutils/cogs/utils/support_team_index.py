@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import time
+import typing
+
+import discord
+
+
+class SupportTeamIndex(object):
+    """
+    An index of the members of the bot's support team (the members of the
+    :attr:`support guild<BotConfig.support_guild_id>` with the :attr:`support role<BotConfig.bot_support_role_id>`),
+    so that :func:`voxelbotutils.checks.is_bot_support` is a set lookup rather than fetching the author
+    from the support guild every time it's run.
+
+    If the bot has the members intent and the support guild is on one of its shards, the index is built
+    from a single chunk request when the bot is ready, and kept up to date from raw member add, update, and
+    remove events. Otherwise (as those events won't be sent) each user's support status is fetched the
+    first time that they're checked and cached for :attr:`fallback_ttl`. Provided in your bot object at
+    :attr:`voxelbotutils.Bot.support_team`.
+
+    Attributes:
+        fallback_ttl (float): How long a user's support status is cached for when the index can't be
+            kept up to date by events, in seconds.
+    """
+
+    MAX_FALLBACK_SIZE: int = 10_000  #: The number of cached users after which expired users are cleared out.
+    logger: logging.Logger = logging.getLogger("vbu.support_team")
+
+    def __init__(self, bot, *, fallback_ttl: float = 300.0):
+        """:meta private:"""
+
+        self.bot = bot
+        self.fallback_ttl = fallback_ttl
+        self.member_ids: typing.Set[int] = set()
+        self.indexed: bool = False
+        self._fallback: typing.Dict[int, typing.Tuple[float, bool]] = {}
+        self._build_task: typing.Optional[asyncio.Task] = None
+
+        # user_id: whether they're support - the member events seen while the index is being built,
+        # which are applied on top of the chunk's results
+        self._build_changes: typing.Optional[typing.Dict[int, bool]] = None
+
+        # Listen for the raw events
+        bot.add_raw_event_handler("GUILD_CREATE", self._handle_guild_create)
+        bot.add_raw_event_handler("GUILD_MEMBER_ADD", self._handle_member_update)
+        bot.add_raw_event_handler("GUILD_MEMBER_UPDATE", self._handle_member_update)
+        bot.add_raw_event_handler("GUILD_MEMBER_REMOVE", self._handle_member_remove)
+
+    @property
+    def guild_id(self) -> typing.Optional[int]:
+        """:meta private:"""
+
+        return self.bot.config.get('support_guild_id') or None
+
+    @property
+    def role_id(self) -> typing.Optional[int]:
+        """:meta private:"""
+
+        return self.bot.config.get('bot_support_role_id') or None
+
+    def start(self) -> None:
+        """
+        Build the index once the bot is ready.
+        """
+
+        if self._build_task is None or self._build_task.done():
+            self._build_task = asyncio.get_event_loop().create_task(self._build())
+
+    def stop(self) -> None:
+        """
+        Stop building the index, if it's still being built.
+        """
+
+        if self._build_task is not None:
+            self._build_task.cancel()
+            self._build_task = None
+        self._build_changes = None
+
+    async def _build(self) -> None:
+        """
+        Build the index from the support guild with a single chunk request, if we're able to.
+        """
+
+        await self.bot.wait_until_ready()
+        self.indexed = False
+        if self.guild_id is None or self.role_id is None or not self.bot.intents.members:
+            return
+        guild = self.bot.get_guild(self.guild_id)
+        if guild is None:
+            return
+        self._build_changes = {}
+        try:
+            members = await guild.chunk(cache=False)
+        except Exception as e:
+            self.logger.warning(f"Failed to chunk the support guild, falling back to fetching members - {e}")
+            self._build_changes = None
+            return
+
+        # Make the index, applying any member events that came in while we were chunking
+        member_ids = {i.id for i in members if i._roles.has(self.role_id)}
+        for user_id, is_support in self._build_changes.items():
+            if is_support:
+                member_ids.add(user_id)
+            else:
+                member_ids.discard(user_id)
+        self._build_changes = None
+        self.member_ids = member_ids
+        self._fallback.clear()
+        self.indexed = True
+        self.logger.info(f"Indexed {len(self.member_ids)} support team members")
+
+    def _handle_guild_create(self, payload: dict) -> None:
+        """
+        Rebuild the index when the support guild becomes available, as we may have missed member events.
+        """
+
+        if self.guild_id is not None and int(payload['d']['id']) == self.guild_id and self.bot.is_ready():
+            self.start()
+
+    def _handle_member_update(self, payload: dict) -> None:
+        """
+        Add or remove a member from the index based on their roles.
+        """
+
+        data = payload['d']
+        if self.guild_id is None or int(data['guild_id']) != self.guild_id:
+            return
+        user_id = int(data['user']['id'])
+        is_support = str(self.role_id) in data.get('roles', ())
+        if is_support:
+            self.member_ids.add(user_id)
+        else:
+            self.member_ids.discard(user_id)
+        if self._build_changes is not None:
+            self._build_changes[user_id] = is_support
+        self._fallback.pop(user_id, None)
+
+    def _handle_member_remove(self, payload: dict) -> None:
+        """
+        Remove a member who's left the support guild from the index.
+        """
+
+        data = payload['d']
+        if self.guild_id is None or int(data['guild_id']) != self.guild_id:
+            return
+        user_id = int(data['user']['id'])
+        self.member_ids.discard(user_id)
+        if self._build_changes is not None:
+            self._build_changes[user_id] = False
+        self._fallback.pop(user_id, None)
+
+    async def is_support(self, user_id: int) -> bool:
+        """
+        Get whether or not a user is a member of the support team.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: Whether or not they're a member of the support team.
+        """
+
+        if self.indexed:
+            return user_id in self.member_ids
+
+        # See if we have it cached
+        cached = self._fallback.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Fetch the member from the support guild - failed requests aren't cached
+        is_support = False
+        support_guild = await self.bot.fetch_support_guild()
+        if support_guild is not None and self.role_id is not None:
+            try:
+                member = support_guild.get_member(user_id) or await support_guild.fetch_member(user_id)
+                is_support = member is not None and member._roles.has(self.role_id)
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                return False
+
+        # Cache it, clearing out anything that's expired if the cache is getting big
+        now = time.monotonic()
+        if len(self._fallback) >= self.MAX_FALLBACK_SIZE:
+            self._fallback = {i: o for i, o in self._fallback.items() if o[0] > now}
+        self._fallback[user_id] = (now + self.fallback_ttl, is_support)
+        return is_support
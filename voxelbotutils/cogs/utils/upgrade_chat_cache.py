@@ -0,0 +1,272 @@
+import asyncio
+import collections
+import json
+import logging
+import time
+import typing
+from datetime import datetime as dt
+
+import upgradechat
+
+from .redis import RedisConnection
+
+
+class UpgradeChatEntitlements(typing.NamedTuple):
+    """
+    The products that a user has bought of a given type via Upgrade.Chat.
+
+    :meta private:
+    """
+
+    fetched_at: float
+    products: typing.Tuple[typing.Tuple[str, typing.Optional[float]], ...]  # (product_name, deleted timestamp)
+
+    def get_product_names(self) -> typing.List[str]:
+        """
+        Get the names of the products that the user currently has.
+        """
+
+        now = dt.utcnow().timestamp()
+        return [name for name, deleted in self.products if deleted is None or deleted <= now]
+
+    def to_json(self) -> str:
+        return json.dumps({"fetched_at": self.fetched_at, "products": self.products})
+
+    @classmethod
+    def from_json(cls, data: str) -> 'UpgradeChatEntitlements':
+        loaded = json.loads(data)
+        return cls(loaded['fetched_at'], tuple(tuple(i) for i in loaded['products']))
+
+
+class UpgradeChatEntitlementCache(object):
+    """
+    A cache of the products that users have bought via Upgrade.Chat, so that the
+    :func:`is_upgrade_chat_purchaser<voxelbotutils.checks.is_upgrade_chat_purchaser>` and
+    :func:`is_upgrade_chat_subscriber<voxelbotutils.checks.is_upgrade_chat_subscriber>` checks don't
+    make an API request every time they're run. Each user's products are kept locally and, if Redis is
+    enabled, in Redis so that they're shared between clusters. Concurrent lookups for the same user share
+    a single request, users with subscriptions who've been checked within the last :attr:`ttl` are refreshed
+    in the background before their entry expires, and if Upgrade.Chat is unavailable then entries up to
+    :attr:`stale_ttl` old are used instead. Provided in your bot object at :attr:`voxelbotutils.Bot.upgrade_chat_cache`.
+
+    Attributes:
+        ttl (float): How long a user's products are used for before they're fetched again, in seconds.
+        stale_ttl (float): How long a user's products are kept to fall back to when Upgrade.Chat is
+            unavailable, in seconds.
+        refresh_interval (float): How often recently checked subscribers whose entries are about to expire
+            are refreshed, in seconds.
+    """
+
+    MAX_LOCAL_SIZE: int = 10_000  #: The max number of entries to keep in the local cache.
+    REFRESH_CONCURRENCY: int = 5  #: The number of background refreshes to run at once.
+    logger: logging.Logger = logging.getLogger("vbu.upgrade_chat_cache")
+
+    def __init__(self, bot, *, ttl: float = 300.0, stale_ttl: float = 86_400.0, refresh_interval: float = 60.0):
+        """:meta private:"""
+
+        self.bot = bot
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_interval = refresh_interval
+
+        # (user_id, item type name): entitlements
+        self._local: typing.Dict[typing.Tuple[int, str], UpgradeChatEntitlements] = collections.OrderedDict()
+
+        # (user_id, item type name): when the entry was last checked
+        self._last_accessed: typing.Dict[typing.Tuple[int, str], float] = {}
+
+        # (user_id, item type name): request task
+        self._inflight: typing.Dict[typing.Tuple[int, str], asyncio.Task] = {}
+        self._refresh_task: typing.Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _redis_key(user_id: int, item_type: upgradechat.UpgradeChatItemType) -> str:
+        return f"VBUUpgradeChat:{item_type.name}:{user_id}"
+
+    def _set_local(self, key: typing.Tuple[int, str], entitlements: UpgradeChatEntitlements) -> None:
+        self._local[key] = entitlements
+        self._local.move_to_end(key)
+        while len(self._local) > self.MAX_LOCAL_SIZE:
+            evicted, _ = self._local.popitem(last=False)
+            self._last_accessed.pop(evicted, None)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Remove a user from the local cache, so that their products are fetched on their next check.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+
+        for item_type in upgradechat.UpgradeChatItemType:
+            self._local.pop((user_id, item_type.name), None)
+            self._last_accessed.pop((user_id, item_type.name), None)
+
+    async def get_product_names(
+            self, user_id: int, item_type: upgradechat.UpgradeChatItemType, *,
+            timeout: float = 3.0) -> typing.List[str]:
+        """
+        Get the names of the products of a given type that a user currently has.
+
+        Args:
+            user_id (int): The ID of the user.
+            item_type (upgradechat.UpgradeChatItemType): The type of product to look for.
+            timeout (float, optional): How long to wait for Upgrade.Chat before falling back to a
+                stale entry.
+
+        Returns:
+            typing.List[str]: The names of the products that the user has.
+
+        Raises:
+            asyncio.TimeoutError: Upgrade.Chat didn't respond in time, and there's no stale entry.
+            upgradechat.UpgradeChatError: Upgrade.Chat gave an error, and there's no stale entry.
+        """
+
+        key = (user_id, item_type.name)
+        self._last_accessed[key] = time.time()
+        cached = self._local.get(key)
+        if cached is not None and cached.fetched_at > time.time() - self.ttl:
+            self._local.move_to_end(key)
+            return cached.get_product_names()
+
+        # Go and get it, falling back to what we've got if Upgrade.Chat is having a bad time
+        try:
+            entitlements = await asyncio.wait_for(asyncio.shield(self._refresh(user_id, item_type)), timeout=timeout)
+        except (asyncio.TimeoutError, upgradechat.UpgradeChatError) as e:
+            cached = self._local.get(key)
+            if cached is not None and cached.fetched_at > time.time() - self.stale_ttl:
+                self.logger.warning(f"Using stale Upgrade.Chat products for {user_id} - {e!r}")
+                return cached.get_product_names()
+            raise
+        return entitlements.get_product_names()
+
+    def _refresh(self, user_id: int, item_type: upgradechat.UpgradeChatItemType) -> asyncio.Task:
+        """
+        Get the task refreshing a user's products, starting one if there isn't one already.
+        """
+
+        key = (user_id, item_type.name)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get_uncached(user_id, item_type))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+        return task
+
+    def _request_done(self, key: typing.Tuple[int, str], task: asyncio.Task) -> None:
+        """
+        Remove a finished request, making sure that its exception is retrieved if every caller gave up on it.
+        """
+
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug(f"Failed to get Upgrade.Chat products for {key} - {task.exception()!r}")
+
+    async def _get_uncached(
+            self, user_id: int, item_type: upgradechat.UpgradeChatItemType) -> UpgradeChatEntitlements:
+        """
+        Get a user's products from Redis if another cluster has fetched them recently, or from
+        Upgrade.Chat if not.
+        """
+
+        # See if it's in Redis
+        key = (user_id, item_type.name)
+        stale = None
+        if RedisConnection.pool is not None:
+            try:
+                async with RedisConnection() as re:
+                    cached = await re.get(self._redis_key(user_id, item_type))
+            except Exception as e:
+                self.logger.warning(f"Failed to get Upgrade.Chat products from Redis - {e}")
+                cached = None
+            if cached is not None:
+                stale = UpgradeChatEntitlements.from_json(cached)
+                if stale.fetched_at > time.time() - self.ttl:
+                    self._set_local(key, stale)
+                    return stale
+
+                # Keep the stale copy locally so that we can fall back to it
+                current = self._local.get(key)
+                if current is None or current.fetched_at < stale.fetched_at:
+                    self._set_local(key, stale)
+
+        # Ask Upgrade.Chat
+        orders = await self.bot.upgrade_chat.get_orders(discord_id=user_id, type=item_type)
+        products = []
+        for order in orders:
+            if order.type.name != item_type.name:
+                continue
+            deleted = None
+            if order.type.name == "UPGRADE" and order.deleted is not None:
+                deleted = order.deleted.timestamp()
+            for order_item in order.order_items:
+                products.append((order_item.product_name, deleted,))
+        entitlements = UpgradeChatEntitlements(time.time(), tuple(products))
+
+        # And cache it
+        self._set_local(key, entitlements)
+        if RedisConnection.pool is not None:
+            try:
+                async with RedisConnection() as re:
+                    await re.set(self._redis_key(user_id, item_type), entitlements.to_json(), expire=int(self.stale_ttl))
+            except Exception as e:
+                self.logger.warning(f"Failed to cache Upgrade.Chat products in Redis - {e}")
+        return entitlements
+
+    def start(self) -> None:
+        """
+        Start refreshing subscribers' products in the background.
+        """
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_event_loop().create_task(self._refresh_loop())
+
+    def stop(self) -> None:
+        """
+        Stop refreshing subscribers' products in the background.
+        """
+
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        """
+        Every :attr:`refresh_interval`, refresh the subscribers who've been checked within the last
+        :attr:`ttl` and whose entries will have expired before the next run, and drop any entries
+        that are too old to fall back to. Idle subscribers aren't refreshed, so their entries age
+        out and are dropped rather than being polled forever.
+        """
+
+        semaphore = asyncio.Semaphore(self.REFRESH_CONCURRENCY)
+
+        async def refresh(user_id):
+            async with semaphore:
+                try:
+                    await self._refresh(user_id, upgradechat.UpgradeChatItemType.UPGRADE)
+                except Exception:
+                    pass  # We'll keep serving the stale entry, and try again next time
+
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            now = time.time()
+            refresh_before = now - self.ttl + self.refresh_interval
+            active_after = now - self.ttl
+            to_refresh = []
+            for key, entitlements in list(self._local.items()):
+                user_id, item_type_name = key
+                if entitlements.fetched_at < now - self.stale_ttl:
+                    del self._local[key]
+                    self._last_accessed.pop(key, None)
+                elif (
+                        item_type_name == upgradechat.UpgradeChatItemType.UPGRADE.name
+                        and self._last_accessed.get(key, 0) > active_after
+                        and entitlements.get_product_names()
+                        and entitlements.fetched_at < refresh_before):
+                    to_refresh.append(user_id)
+            for key, last_accessed in list(self._last_accessed.items()):
+                if key not in self._local and last_accessed < active_after:
+                    del self._last_accessed[key]  # A lookup that failed and was never cached
+            if to_refresh:
+                self.logger.debug(f"Refreshing Upgrade.Chat products for {len(to_refresh)} subscribers")
+                await asyncio.gather(*[refresh(i) for i in to_refresh])
@@ -0,0 +1,247 @@
+import asyncio
+import collections
+import logging
+import time
+import typing
+from datetime import datetime as dt
+
+from .database import DatabaseConnection
+from .redis import RedisConnection, RedisChannelHandler
+
+
+class TopggVoteCache(object):
+    """
+    A cache for whether or not users have voted for the bot on Top.gg, so that vote-locked
+    commands don't make an API request every time they're run. Vote statuses are kept in a local
+    LRU cache and, if Redis is enabled, in Redis so that they're shared between clusters. Concurrent
+    lookups for the same user share a single request. Provided in your bot object at
+    :attr:`voxelbotutils.Bot.vote_cache`, and used by :func:`voxelbotutils.Bot.get_user_topgg_vote`.
+
+    If :attr:`BotConfig.bot_listing_api_keys.topgg_webhook_enabled` is set then votes are instead pushed
+    to your website's Top.gg webhook (see :func:`voxelbotutils.web.add_topgg_webhook_route`), which stores
+    them in Redis and the database and publishes them to every cluster. Lookups then only check the
+    local cache, Redis and the database, and never make a request to Top.gg.
+
+    Attributes:
+        positive_ttl (float): How long users who have voted are cached for, in seconds.
+        negative_ttl (float): How long users who haven't voted are cached for, in seconds. This
+            is kept short so that people who've just voted aren't kept waiting.
+    """
+
+    MAX_LOCAL_SIZE: int = 10_000  #: The max number of users to keep in the local cache.
+    logger: logging.Logger = logging.getLogger("vbu.vote_cache")
+
+    def __init__(self, bot, *, positive_ttl: float = 600.0, negative_ttl: float = 60.0):
+        """:meta private:"""
+
+        self.bot = bot
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+
+        # user_id: (expiry time, voted)
+        self._local: typing.Dict[int, typing.Tuple[float, bool]] = collections.OrderedDict()
+
+        # user_id: request task
+        self._inflight: typing.Dict[int, asyncio.Task] = {}
+        self._vote_handler: typing.Optional[RedisChannelHandler] = None
+        self._start_task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def webhook_enabled(self) -> bool:
+        """
+        Whether or not votes are being pushed to us via the Top.gg webhook.
+        """
+
+        return self.bot.config.get('bot_listing_api_keys', {}).get('topgg_webhook_enabled', False)
+
+    @staticmethod
+    def get_redis_key(bot_id: int, user_id: int) -> str:
+        """:meta private:"""
+
+        return f"VBUTopggVote:{bot_id}:{user_id}"
+
+    @staticmethod
+    def get_channel_name(bot_id: int) -> str:
+        """:meta private:"""
+
+        return f"VBUTopggVote:{bot_id}"
+
+    def _redis_key(self, user_id: int) -> str:
+        return self.get_redis_key(self.bot.user.id, user_id)
+
+    def start(self) -> None:
+        """
+        Start listening for votes published by the Top.gg webhook. This waits for the bot to be
+        ready before subscribing, as the channel is namespaced by the bot's user ID.
+        """
+
+        self._start_task = asyncio.get_event_loop().create_task(self._start())
+
+    async def _start(self):
+        await self.bot.wait_until_ready()
+        self._vote_handler = RedisChannelHandler(self.get_channel_name(self.bot.user.id), TopggVoteCache._handle_vote)
+        self._vote_handler.cog = self
+        self._vote_handler.start()
+
+    async def stop(self) -> None:
+        """
+        Stop listening for votes published by the Top.gg webhook.
+        """
+
+        if self._start_task:
+            self._start_task.cancel()
+        if self._vote_handler is None:
+            return
+        try:
+            await self._vote_handler.unsubscribe()
+        except Exception as e:
+            self.logger.error(e)
+        self._vote_handler.cancel()
+
+    def _handle_vote(self, data: dict) -> None:
+        """
+        Cache a vote that's been published by the Top.gg webhook.
+        """
+
+        ttl = data['expires_at'] - time.time()
+        if ttl > 0:
+            self._set_local(int(data['user_id']), True, ttl)
+
+    def _get_local(self, user_id: int) -> typing.Optional[bool]:
+        """
+        Get a user's vote status from the local cache.
+        """
+
+        try:
+            expiry, voted = self._local[user_id]
+        except KeyError:
+            return None
+        if expiry < time.monotonic():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return voted
+
+    def _set_local(self, user_id: int, voted: bool, ttl: float) -> None:
+        """
+        Set a user's vote status in the local cache.
+        """
+
+        self._local[user_id] = (time.monotonic() + ttl, voted)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.MAX_LOCAL_SIZE:
+            self._local.popitem(last=False)
+
+    async def set(self, user_id: int, voted: bool, *, ttl: float = None) -> None:
+        """
+        Set a user's vote status in the cache.
+
+        Args:
+            user_id (int): The ID of the user.
+            voted (bool): Whether or not they've voted.
+            ttl (float, optional): How long to cache the status for, in seconds. Defaults to
+                :attr:`positive_ttl` or :attr:`negative_ttl`.
+        """
+
+        if ttl is None:
+            ttl = self.positive_ttl if voted else self.negative_ttl
+        self._set_local(user_id, voted, ttl)
+        if RedisConnection.pool is not None:
+            try:
+                async with RedisConnection() as re:
+                    await re.set(self._redis_key(user_id), "1" if voted else "0", expire=max(int(ttl), 1))
+            except Exception as e:
+                self.logger.warning(f"Failed to cache vote status in Redis - {e}")
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Remove a user from the local cache.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+
+        self._local.pop(user_id, None)
+
+    async def get(self, user_id: int) -> bool:
+        """
+        Get whether or not a user has voted, going to Top.gg if they aren't cached.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: Whether or not the user has voted.
+        """
+
+        # See if we have it locally
+        voted = self._get_local(user_id)
+        if voted is not None:
+            return voted
+
+        # Share a request with anyone else who's asking; shielded so that one caller
+        # timing out doesn't cancel it for everyone else
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._get_uncached(user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda t: self._request_done(user_id, t))
+        return await asyncio.shield(task)
+
+    def _request_done(self, user_id: int, task: asyncio.Task) -> None:
+        """
+        Remove a finished request, making sure that its exception is retrieved if every caller gave up on it.
+        """
+
+        self._inflight.pop(user_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.debug(f"Failed to get vote status for {user_id} - {task.exception()}")
+
+    async def _get_uncached(self, user_id: int) -> bool:
+        """
+        Get a user's vote status from Redis or the database, or from Top.gg if it's not there.
+        """
+
+        # See if it's in Redis
+        if RedisConnection.pool is not None:
+            try:
+                async with RedisConnection() as re:
+                    key = self._redis_key(user_id)
+                    cached = await re.get(key)
+                    ttl = await re.conn.ttl(key) if cached is not None else None
+            except Exception as e:
+                self.logger.warning(f"Failed to get vote status from Redis - {e}")
+                cached = None
+            if cached is not None:
+                voted = cached in ("1", b"1")
+                local_ttl = self.positive_ttl if voted else self.negative_ttl
+                self._set_local(user_id, voted, min(ttl, local_ttl) if ttl and ttl > 0 else local_ttl)
+                return voted
+
+        # See if the webhook put it in the database
+        if self.webhook_enabled and DatabaseConnection.pool is not None:
+            try:
+                async with DatabaseConnection() as db:
+                    rows = await db(
+                        "SELECT expires_at FROM topgg_votes WHERE bot_id=$1 AND user_id=$2 AND expires_at > $3",
+                        self.bot.user.id, user_id, dt.utcnow(),
+                    )
+            except Exception as e:
+                self.logger.warning(f"Failed to get vote status from the database - {e}")
+                rows = []
+            if rows:
+                ttl = (rows[0]['expires_at'] - dt.utcnow()).total_seconds()
+                self._set_local(user_id, True, min(ttl, self.positive_ttl))
+                return True
+
+        # Votes are pushed to us by the webhook, so if we don't have one then they haven't voted
+        if self.webhook_enabled:
+            self._set_local(user_id, False, self.negative_ttl)
+            return False
+
+        # Ask Top.gg - failed requests aren't cached
+        voted = await self.bot._fetch_user_topgg_vote(user_id)
+        if voted is None:
+            return False
+        await self.set(user_id, voted)
+        return voted
@@ -10,6 +10,7 @@ guild_settings_prefix_column = "prefix"  # Used if multiple bots connect to the
 cached_messages = 1000  # The number of messages to cache within the bot
 ephemeral_error_messages = true  # Whether or not error messages [from slash commands] should be ephemeral
 owners_ignore_check_failures = true  # Whether or not owners ignore check failures on messages
+sync_slash_commands = false  # Whether or not to sync the bot's global slash commands with its commands on startup
 
 # Event webhook information - some of the events (noted) will be sent to the specified url
 [event_webhook]
@@ -49,6 +50,7 @@ owners_ignore_check_failures = true  # Whether or not owners ignore check failur
 # Data used to send API requests to whatever service
 [bot_listing_api_keys]
     topgg_token = ""  # The token used to post data to top.gg
+    topgg_webhook_enabled = false  # Whether votes are pushed to your website's Top.gg webhook, rather than being fetched from top.gg
     discordbotlist_token = ""  # The token used to post data to discordbotlist.com
 
 # Data that's copied directly over to a command
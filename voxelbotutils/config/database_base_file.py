@@ -26,4 +26,19 @@ CREATE TABLE IF NOT EXISTS channel_list(
     value TEXT,
     PRIMARY KEY (guild_id, channel_id, key)
 );
+
+
+CREATE TABLE IF NOT EXISTS component_state(
+    key TEXT PRIMARY KEY,
+    data TEXT,
+    expires_at TIMESTAMP
+);
+
+
+CREATE TABLE IF NOT EXISTS topgg_votes(
+    bot_id BIGINT,
+    user_id BIGINT,
+    expires_at TIMESTAMP,
+    PRIMARY KEY (bot_id, user_id)
+);
 """
@@ -15,6 +15,12 @@ oauth_scopes = [ "identify", "guilds", ]  # The scopes that should be added to t
     client_id = ""
     client_secret = ""
 
+# Used to receive votes from Top.gg, which are stored in the database/redis and sent to your bot's clusters
+[topgg_webhook]
+    enabled = false
+    path = "/webhooks/topgg"  # The path to set as your webhook URL on Top.gg
+    authorization = ""  # The authorization to set for your webhook on Top.gg
+
 # This data is passed directly over to asyncpg.connect()
 [database]
     enabled = false
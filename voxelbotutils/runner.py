@@ -424,6 +424,11 @@ def run_website(args: argparse.Namespace) -> None:
     # Add our config
     app['config'] = config
 
+    # Add the vote webhook now that it can read the config
+    if config.get('topgg_webhook', {}).get('enabled', False):
+        from .web.utils.topgg_webhook import add_topgg_webhook_route
+        add_topgg_webhook_route(app)
+
     loop = app.loop
 
     # Connect the database pool
@@ -485,6 +490,110 @@ def run_website(args: argparse.Namespace) -> None:
     loop.close()
 
 
+def compile_commands(args: argparse.Namespace) -> None:
+    """
+    Loads the bot's extensions without connecting to Discord, and outputs the JSON for its application commands
+
+    Args:
+        args (argparse.Namespace): The arguments namespace that wants to be run
+    """
+
+    import json
+
+    os.chdir(args.bot_directory)
+    set_event_loop()
+    set_default_log_levels(args)
+
+    # Load the bot without logging in
+    bot = Bot(config_file=args.config_file)
+    bot.logger = logger.getChild("bot")
+    logger.info('Loading extensions... ')
+    bot.load_all_extensions()
+
+    # Convert the commands
+    slash_command_handler = bot.get_cog("SlashCommandHandler")
+    loop = bot.loop
+    application_commands = loop.run_until_complete(slash_command_handler.convert_all_into_application_command(None))
+    logger.info(f"Compiled {len(application_commands)} application commands with hash {slash_command_handler.get_command_tree_hash(application_commands)}")
+
+    # And output them
+    dumped = json.dumps([i.to_json() for i in application_commands], indent=4)
+    if args.output:
+        with open(args.output, "w") as a:
+            a.write(dumped + "\n")
+    else:
+        print(dumped)
+    loop.run_until_complete(bot.session.close())
+
+
+def run_vote_webhook(args: argparse.Namespace) -> None:
+    """
+    Starts a webserver that only receives Top.gg votes, connects the database and redis, runs the async loop forever
+
+    Args:
+        args (argparse.Namespace): The arguments namespace that wants to be run
+    """
+
+    # Load our imports here so we don't need to require them all the time
+    from aiohttp.web import Application, AppRunner, TCPSite
+    from .web.utils.topgg_webhook import add_topgg_webhook_route
+
+    set_event_loop()
+    set_default_log_levels(args)
+
+    # Read config
+    with open(args.config_file) as a:
+        config = toml.load(a)
+
+    # Create the webserver with just our vote route
+    app = Application(loop=asyncio.get_event_loop())
+    app['database'] = DatabaseConnection
+    app['redis'] = RedisConnection
+    app['logger'] = logger.getChild("route")
+    app['config'] = config
+    add_topgg_webhook_route(app)
+    loop = app.loop
+
+    # Connect the database pool
+    if config.get('database', {}).get('enabled', False):
+        loop.run_until_complete(start_database_pool(config))
+
+    # Connect the redis pool
+    if config.get('redis', {}).get('enabled', False):
+        loop.run_until_complete(start_redis_pool(config))
+
+    # Start the webserver
+    logger.info("Creating webserver...")
+    application = AppRunner(app)
+    loop.run_until_complete(application.setup())
+    webserver = TCPSite(application, host=args.host, port=args.port)
+    loop.run_until_complete(webserver.start())
+    logger.info(f"Vote webhook started - http://{args.host}:{args.port}/")
+
+    # This is the forever loop
+    try:
+        logger.info("Running webserver")
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+    # We're now done, time to clean up and close
+    loop.run_until_complete(application.cleanup())
+    if config.get('database', {}).get('enabled', False):
+        logger.info("Closing database pool")
+        try:
+            loop.run_until_complete(asyncio.wait_for(DatabaseConnection.pool.close(), timeout=30.0))
+        except asyncio.TimeoutError:
+            logger.error("Couldn't gracefully close the database connection pool within 30 seconds")
+    if config.get('redis', {}).get('enabled', False):
+        logger.info("Closing redis pool")
+        RedisConnection.pool.close()
+
+    logger.info("Closing asyncio loop")
+    loop.stop()
+    loop.close()
+
+
 def run_sharder(args: argparse.Namespace) -> None:
     """
     Starts the sharder, connects the redis, runs the async loop forever
@@ -497,6 +606,22 @@ def run_sharder(args: argparse.Namespace) -> None:
     loop = asyncio.get_event_loop()
     set_default_log_levels(args)
 
+    # Work out our max concurrency if we weren't given one
+    config = {}
+    if args.concurrency is None:
+        try:
+            with open(args.config_file) as a:
+                config = toml.load(a)
+        except FileNotFoundError:
+            logger.warning(f"Couldn't find config file {args.config_file}, defaulting to a concurrency of 1")
+            args.concurrency = 1
+    if args.concurrency is None:
+
+        # Use redis to share cached gateway info with the bots if we can
+        if config.get('redis', {}).get('enabled', False):
+            loop.run_until_complete(start_redis_pool(config))
+        args.concurrency = loop.run_until_complete(ShardManagerServer.get_max_concurrency(config['token']))
+
     # Run the bot
     logger.info(f"Running sharder with {args.concurrency} shards")
     loop.create_task(ShardManagerServer(args.host, args.port, args.concurrency).run())
@@ -504,6 +629,9 @@ def run_sharder(args: argparse.Namespace) -> None:
         loop.run_forever()
     except KeyboardInterrupt:
         logger.info("Logging out sharder")
+    if config.get('redis', {}).get('enabled', False) and RedisConnection.pool is not None:
+        logger.info("Closing redis pool")
+        RedisConnection.pool.close()
 
     logger.info("Closing asyncio loop")
     loop.stop()
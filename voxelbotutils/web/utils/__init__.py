@@ -7,3 +7,4 @@ from .process_discord_login import (
 )
 from .web_context import WebContext
 from .oauth_models import OauthGuild, OauthUser, OauthMember
+from .topgg_webhook import store_topgg_vote, topgg_webhook_handler, add_topgg_webhook_route
@@ -0,0 +1,106 @@
+import hmac
+import json
+import time
+from datetime import datetime as dt, timedelta
+
+from aiohttp.web import Application, HTTPBadRequest, HTTPUnauthorized, Request, Response
+
+from ...cogs.utils.vote_cache import TopggVoteCache
+
+
+TOPGG_VOTE_DURATION: int = 60 * 60 * 12  # Votes on Top.gg last for 12 hours
+
+
+async def store_topgg_vote(app: Application, bot_id: int, user_id: int, *, duration: int = TOPGG_VOTE_DURATION) -> None:
+    """
+    Store a Top.gg vote in Redis and/or the database (whichever are enabled in the app's config),
+    and publish it to every cluster of the bot, so that their
+    :attr:`vote caches<voxelbotutils.Bot.vote_cache>` can see it without asking Top.gg.
+
+    Args:
+        app (Application): The web application, with its :code:`database`, :code:`redis`
+            and :code:`config` set.
+        bot_id (int): The ID of the bot that was voted for.
+        user_id (int): The ID of the user who voted.
+        duration (int, optional): How long the vote lasts for, in seconds.
+    """
+
+    config = app['config']
+    expires_at = time.time() + duration
+
+    # Store it in the database
+    if config.get('database', {}).get('enabled', False):
+        async with app['database']() as db:
+            await db(
+                """INSERT INTO topgg_votes (bot_id, user_id, expires_at) VALUES ($1, $2, $3)
+                ON CONFLICT (bot_id, user_id) DO UPDATE SET expires_at=excluded.expires_at""",
+                bot_id, user_id, dt.utcnow() + timedelta(seconds=duration),
+            )
+
+    # Store it in Redis and tell the clusters
+    if config.get('redis', {}).get('enabled', False):
+        async with app['redis']() as re:
+            await re.set(TopggVoteCache.get_redis_key(bot_id, user_id), "1", expire=duration)
+            await re.publish(TopggVoteCache.get_channel_name(bot_id), {
+                "user_id": user_id,
+                "expires_at": expires_at,
+            })
+
+
+async def topgg_webhook_handler(request: Request) -> Response:
+    """
+    A route handler for Top.gg's vote webhook. The request's :code:`Authorization` header is
+    checked against the one set in your :attr:`website config<WebsiteConfig.topgg_webhook.authorization>`,
+    and the vote is then stored with :func:`store_topgg_vote`.
+
+    Raises:
+        HTTPUnauthorized: The authorization header was missing or invalid.
+        HTTPBadRequest: The request body wasn't a valid vote.
+    """
+
+    # Check the auth
+    expected = request.app['config'].get('topgg_webhook', {}).get('authorization')
+    given = request.headers.get('Authorization', '')
+    if not expected or not hmac.compare_digest(given.encode(), expected.encode()):
+        raise HTTPUnauthorized()
+
+    # Get the vote
+    try:
+        data = await request.json()
+        bot_id = int(data['bot'])
+        user_id = int(data['user'])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPBadRequest()
+    vote_type = data.get('type', 'upvote')
+    if vote_type not in ('upvote', 'test'):
+        raise HTTPBadRequest()
+
+    # Test votes (from the button on Top.gg's webhook page) shouldn't count as real votes
+    if vote_type == 'test':
+        request.app['logger'].info(f"Received Top.gg test vote from {user_id} for bot {bot_id}")
+        return Response(status=204)
+
+    # Store it
+    await store_topgg_vote(request.app, bot_id, user_id)
+    request.app['logger'].info(f"Received Top.gg vote from {user_id} for bot {bot_id}")
+    return Response(status=204)
+
+
+def add_topgg_webhook_route(app: Application) -> None:
+    """
+    Add the Top.gg vote webhook route to a web application, at the path given in your
+    :attr:`website config<WebsiteConfig.topgg_webhook.path>`. This is done automatically by
+    :code:`vbu run-website` and :code:`vbu run-vote-webhook` if the webhook is enabled.
+
+    Args:
+        app (Application): The application to add the route to. Its :code:`config` needs to be set.
+    """
+
+    config = app['config']
+    if not config.get('database', {}).get('enabled', False) and not config.get('redis', {}).get('enabled', False):
+        app['logger'].warning(
+            "The Top.gg vote webhook is enabled but neither the database nor Redis are - "
+            "received votes won't be stored anywhere"
+        )
+    path = config.get('topgg_webhook', {}).get('path', '/webhooks/topgg')
+    app.router.add_post(path, topgg_webhook_handler)